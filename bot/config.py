@@ -1,12 +1,8 @@
 # config.py
 import os
-from dotenv import load_dotenv
-
-
-load_dotenv()
-
-CHROME_DRIVER_PATH = os.getenv("CHROME_DRIVER_PATH")
-VIC_URL = os.getenv("VIC_URL")
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional, Tuple
 
 
 def get_env_float(key: str) -> float:
@@ -30,27 +26,132 @@ FLAG_CLEAR_CONSOLE_ENABLE = False
 FLAG_REMOVE_EXCESS_ORDERS_ENABLE = True
 FLAG_VIC_ORDERS_DEBUGGING_PRINT = True
 FLAG_VIC_TRADE_DEBUGGING_PRINT = False
+FLAG_BINANCE_WS_ENABLE = True
+FLAG_VIC_SCRIPTED_INPUT_ENABLE = True  # False → fill order inputs with send_keys
+FLAG_VIC_BATCH_PLACE_ENABLE = True  # place ladder levels in one in-page script
+FLAG_VIC_BATCH_CANCEL_ENABLE = True  # cancel several orders by id in one in-page script
+FLAG_KILL_SWITCH_ENABLE = True  # cancel every open order when an engine stops
+FLAG_VIC_ORDERBOOK_MIRROR_ENABLE = True  # orderbook from an in-page MutationObserver
+FLAG_VIC_NETWORK_CAPTURE_ENABLE = False  # book/orders/balances from the page's WS/XHR traffic
 
 
-# SETTING
-ORDERBOOK_REFRESH_INTERVAL = get_env_float("ORDERBOOK_REFRESH_INTERVAL")
-
-ADJUSTMENT_MIN = get_env_float("ADJUSTMENT_MIN")
-ADJUSTMENT_MAX = get_env_float("ADJUSTMENT_MAX")
-FOLLOW_UPDATE_SEC = get_env_int("FOLLOW_UPDATE_SEC")
-
-MM_LEVELS = get_env_int("MM_LEVELS")
-MM_REBALANCE_INTERVAL_SEC = get_env_int("MM_REBALANCE_INTERVAL_SEC")
-MM_REFILL_INTERVAL_SEC = get_env_int("MM_REFILL_INTERVAL_SEC")
-MM_STEP_PERCENT = get_env_float("MM_STEP_PERCENT")
-MM_CANCEL_ROW_TIMEOUT_SEC = get_env_int("MM_CANCEL_ROW_TIMEOUT_SEC")
-MM_MAX_CANCEL_OPS_PER_CYCLE = get_env_int("MM_MAX_CANCEL_OPS_PER_CYCLE")
-MM_BUY_BUDGET_RATIO = get_env_float("MM_BUY_BUDGET_RATIO")
-MM_SELL_QTY_RATIO = get_env_float("MM_SELL_QTY_RATIO")
-MM_TOAST_WAIT_SEC = get_env_float("MM_TOAST_WAIT_SEC")
-
-ANCHOR_ORDER_BUDGET_RATIO = get_env_float("ANCHOR_ORDER_BUDGET_RATIO")
-
-MIN_ORDER_USDT = get_env_float("MIN_ORDER_USDT")
-
+# SETTING (fixed)
 MM_DISTRIBUTION_MODE = "EQUAL"  # "EQUAL" or "PYRAMID"
+
+MM_RECONCILE_TOLERANCE_PERCENT = 0.05  # keep orders within this % of a ladder price
+
+MM_ORDER_RECONCILE_INTERVAL_SEC = 30.0  # re-read the open-orders table at least this often
+
+BINANCE_WS_MAX_AGE_SEC = 5.0  # older stream prices fall back to REST
+VIC_NETWORK_MAX_AGE_SEC = 10.0  # older captured book/orders/balances fall back to the DOM
+PRICE_PREFETCH_INTERVAL_SEC = 1.0
+PRICE_MAX_AGE_SEC = 15.0  # engines refuse to quote on older reference prices
+
+CANCEL_BATCH_MAX_ROUNDS = 3  # batch cancel: table read + retry rounds for failed ids
+KILL_SWITCH_DEADLINE_SEC = 20.0  # hard limit for the emergency cancel-all
+BALANCE_CACHE_TTL_SEC = 5.0  # engines re-read free USDT/coin at most this often
+ORDERBOOK_MIRROR_DRAIN_SEC = 0.2  # orderbook mode: how often page changes are pulled
+
+DRIVER_LEAN_WINDOW_SIZE = "1280,900"
+# Requests dropped by the LEAN driver profile (DevTools Network.setBlockedURLs)
+_DRIVER_LEAN_BLOCKED_URLS = (
+    # images, fonts, media
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.wav",
+    "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+    # charts
+    "*charting_library*", "*tradingview*",
+    # analytics / trackers
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*connect.facebook.net*", "*hotjar*", "*clarity.ms*",
+)
+
+
+# SETTING (.env)
+@dataclass(frozen=True)
+class Settings:
+    """Everything read from the environment, parsed once on first use."""
+
+    APP_PASSWORD: Optional[str] = field(repr=False)
+
+    CHROME_DRIVER_PATH: Optional[str]
+    CHROME_DEBUGGER_ADDRESS: Optional[str]  # e.g. 127.0.0.1:9222
+    CHROME_USER_DATA_DIR: Optional[str]  # keeps the login across restarts
+    DRIVER_PROFILE: str  # "FULL" or "LEAN"
+    DRIVER_LEAN_BLOCKED_URLS: Tuple[str, ...]  # + DRIVER_EXTRA_BLOCKED_URLS
+
+    VIC_URL: Optional[str]
+    VIC_ORDER_API_PATH: Optional[str]
+    VIC_CANCEL_API_PATH: Optional[str]
+    ORDER_GATEWAY: str  # "UI" or "HTTP"
+    VIC_NETWORK_RECORD_PATH: Optional[str]  # JSONL dump of captured frames
+
+    ORDERBOOK_REFRESH_INTERVAL: float
+
+    ADJUSTMENT_MIN: float
+    ADJUSTMENT_MAX: float
+    FOLLOW_UPDATE_SEC: int
+
+    MM_LEVELS: int
+    MM_REBALANCE_INTERVAL_SEC: int
+    MM_REFILL_INTERVAL_SEC: int
+    MM_STEP_PERCENT: float
+    MM_CANCEL_ROW_TIMEOUT_SEC: int
+    MM_MAX_CANCEL_OPS_PER_CYCLE: int
+    MM_BUY_BUDGET_RATIO: float
+    MM_SELL_QTY_RATIO: float
+    MM_TOAST_WAIT_SEC: float
+
+    ANCHOR_ORDER_BUDGET_RATIO: float
+
+    MIN_ORDER_USDT: float
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    extra_blocked = os.getenv("DRIVER_EXTRA_BLOCKED_URLS", "")
+    return Settings(
+        APP_PASSWORD=os.getenv("APP_PASSWORD"),
+        CHROME_DRIVER_PATH=os.getenv("CHROME_DRIVER_PATH"),
+        CHROME_DEBUGGER_ADDRESS=os.getenv("CHROME_DEBUGGER_ADDRESS"),
+        CHROME_USER_DATA_DIR=os.getenv("CHROME_USER_DATA_DIR"),
+        DRIVER_PROFILE=os.getenv("DRIVER_PROFILE", "FULL").upper(),
+        DRIVER_LEAN_BLOCKED_URLS=_DRIVER_LEAN_BLOCKED_URLS
+        + tuple(u.strip() for u in extra_blocked.split(",") if u.strip()),
+        VIC_URL=os.getenv("VIC_URL"),
+        VIC_ORDER_API_PATH=os.getenv("VIC_ORDER_API_PATH"),
+        VIC_CANCEL_API_PATH=os.getenv("VIC_CANCEL_API_PATH"),
+        ORDER_GATEWAY=os.getenv("ORDER_GATEWAY", "UI").upper(),
+        VIC_NETWORK_RECORD_PATH=os.getenv("VIC_NETWORK_RECORD_PATH"),
+        ORDERBOOK_REFRESH_INTERVAL=get_env_float("ORDERBOOK_REFRESH_INTERVAL"),
+        ADJUSTMENT_MIN=get_env_float("ADJUSTMENT_MIN"),
+        ADJUSTMENT_MAX=get_env_float("ADJUSTMENT_MAX"),
+        FOLLOW_UPDATE_SEC=get_env_int("FOLLOW_UPDATE_SEC"),
+        MM_LEVELS=get_env_int("MM_LEVELS"),
+        MM_REBALANCE_INTERVAL_SEC=get_env_int("MM_REBALANCE_INTERVAL_SEC"),
+        MM_REFILL_INTERVAL_SEC=get_env_int("MM_REFILL_INTERVAL_SEC"),
+        MM_STEP_PERCENT=get_env_float("MM_STEP_PERCENT"),
+        MM_CANCEL_ROW_TIMEOUT_SEC=get_env_int("MM_CANCEL_ROW_TIMEOUT_SEC"),
+        MM_MAX_CANCEL_OPS_PER_CYCLE=get_env_int("MM_MAX_CANCEL_OPS_PER_CYCLE"),
+        MM_BUY_BUDGET_RATIO=get_env_float("MM_BUY_BUDGET_RATIO"),
+        MM_SELL_QTY_RATIO=get_env_float("MM_SELL_QTY_RATIO"),
+        MM_TOAST_WAIT_SEC=get_env_float("MM_TOAST_WAIT_SEC"),
+        ANCHOR_ORDER_BUDGET_RATIO=get_env_float("ANCHOR_ORDER_BUDGET_RATIO"),
+        MIN_ORDER_USDT=get_env_float("MIN_ORDER_USDT"),
+    )
+
+
+_SETTING_NAMES = frozenset(Settings.__dataclass_fields__)
+
+
+def __getattr__(name: str):
+    # `from config import MM_LEVELS` keeps working; .env is read the first
+    # time any of these is looked up, not when config is imported.
+    if name in _SETTING_NAMES:
+        return getattr(get_settings(), name)
+    raise AttributeError(f"module 'config' has no attribute {name!r}")
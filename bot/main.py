@@ -1,10 +1,36 @@
 # main.py
-from config import VIC_URL
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
 from modes.security import check_password
-from modes.mode_orderbook import run_vic_orderbook_mode
-from modes.mode_print_referenced_price import print_binance_referenced_price_mode
-from modes.mm.mode_binance_follow import run_follow_mm_bid, run_follow_mm_ask
-from modes.mm.mode_binance_dual import run_dual_side_mm
+
+# Mode modules pull in Selenium, requests and the MM engines, and VIC_URL
+# reads the whole .env; all are imported when a mode is picked so the menu
+# comes up immediately.
+if TYPE_CHECKING:
+    from modes.session import BrowserSession
+
+_session: Optional[BrowserSession] = None
+
+
+def _get_session() -> BrowserSession:
+    """One browser (and one login) for every mode picked from the menu."""
+    global _session
+    if _session is None:
+        from config import VIC_URL
+        from modes.session import BrowserSession
+
+        _session = BrowserSession(VIC_URL)
+    return _session
+
+
+def _acquire(session: BrowserSession, mode: int):
+    """Logged-in driver for `mode`, or None (after saying so) when login failed."""
+    driver = session.acquire(mode)
+    if driver is None:
+        print("❌ Not logged in → back to the menu.\n")
+    return driver
 
 
 def _prompt_mode() -> str:
@@ -148,35 +174,77 @@ def main():
     if not check_password():
         return
 
+    try:
+        _menu_loop()
+    finally:
+        if _session is not None:
+            _session.close()
+
+
+def _menu_loop():
     while True:
         try:
             mode = _prompt_mode()
+            if mode in ("1", "2", "3", "4", "5"):
+                from config import VIC_URL
+
+                session = _get_session()
+                # boot Chrome while the mode's prompts are answered
+                session.prelaunch()
+
             if mode == "1":
-                run_vic_orderbook_mode(VIC_URL)
+                from modes.mode_orderbook import run_vic_orderbook_mode
+
+                driver = _acquire(session, 1)
+                if driver is None:
+                    continue
+                run_vic_orderbook_mode(VIC_URL, driver=driver)
             elif mode == "2":
-                print_binance_referenced_price_mode(VIC_URL)
+                from modes.mode_print_referenced_price import (
+                    print_binance_referenced_price_mode,
+                )
+
+                driver = _acquire(session, 2)
+                if driver is None:
+                    continue
+                print_binance_referenced_price_mode(VIC_URL, driver=driver)
             elif mode == "3":
+                from modes.mm.mode_binance_follow import run_follow_mm_bid
+
                 ticker = _prompt_ticker()
                 use_fixed = _prompt_use_fixed_amount()
                 fixed_amount = None
                 if use_fixed:
                     fixed_amount = _prompt_fixed_amount()
-                run_follow_mm_bid(VIC_URL, ticker, fixed_amount=fixed_amount)
+                driver = _acquire(session, 3)
+                if driver is None:
+                    continue
+                run_follow_mm_bid(VIC_URL, ticker, fixed_amount=fixed_amount, driver=driver)
             elif mode == "4":
+                from modes.mm.mode_binance_follow import run_follow_mm_ask
+
                 ticker = _prompt_ticker()
                 use_fixed = _prompt_use_fixed_amount()
                 fixed_amount = None
                 if use_fixed:
                     fixed_amount = _prompt_fixed_amount()
-                run_follow_mm_ask(VIC_URL, ticker, fixed_amount=fixed_amount)
+                driver = _acquire(session, 4)
+                if driver is None:
+                    continue
+                run_follow_mm_ask(VIC_URL, ticker, fixed_amount=fixed_amount, driver=driver)
             elif mode == "5":
+                from modes.mm.mode_binance_dual import run_dual_side_mm
+
                 ticker = _prompt_ticker()
                 amounts = _prompt_dual_side_amounts()
                 if amounts is None:
                     continue
 
                 bid_amount, ask_amount = amounts
-                run_dual_side_mm(VIC_URL, ticker, bid_amount, ask_amount)
+                driver = _acquire(session, 5)
+                if driver is None:
+                    continue
+                run_dual_side_mm(VIC_URL, ticker, bid_amount, ask_amount, driver=driver)
 
             elif mode == "q":
                 print("Bye 👋...\n\n")
@@ -1,12 +1,203 @@
 # market_data.py
+import json
+import threading
 import time
 import requests
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from config import (
+    FLAG_BINANCE_WS_ENABLE,
+    BINANCE_WS_MAX_AGE_SEC,
+    PRICE_PREFETCH_INTERVAL_SEC,
+    PRICE_MAX_AGE_SEC,
+)
 
 BINANCE_PRICE_API_URL = "https://api.binance.com/api/v3/ticker/price"
+BINANCE_WS_URL = "wss://stream.binance.com:9443/ws"
 
 
-def get_binance_price(
+class BinancePriceStream:
+    """
+    Background WebSocket feed that keeps the last price per symbol in memory.
+
+    Subscribes to `<symbol>@aggTrade` only and stores the last trade price
+    with its receive time, the same definition as the REST ticker/price
+    fallback, so the reference price does not change meaning between the
+    two. `ws_url` can point at a local stand-in server for testing.
+    """
+
+    def __init__(self, ws_url: str = BINANCE_WS_URL, reconnect_delay: float = 1.0):
+        self.ws_url = ws_url
+        self.reconnect_delay = reconnect_delay
+
+        self._prices: Dict[str, Tuple[float, float]] = {}
+        self._symbols: Set[str] = set()
+        self._lock = threading.Lock()
+        self._ws = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._next_request_id = 1
+
+    def start(self) -> bool:
+        if self._thread is not None and self._thread.is_alive():
+            return True
+
+        try:
+            import websocket  # websocket-client
+        except ImportError:
+            print("[WARN] websocket-client is not installed → Binance stream disabled")
+            return False
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run_forever,
+            args=(websocket,),
+            name="binance-price-stream",
+            daemon=True,
+        )
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        ws = self._ws
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def subscribe(self, symbol: str):
+        symbol = symbol.upper()
+        with self._lock:
+            if symbol in self._symbols:
+                return
+            self._symbols.add(symbol)
+        self._send_subscribe([symbol])
+
+    def get_price(self, symbol: str, max_age: float) -> Optional[float]:
+        """Return the cached price, or None when missing or older than max_age."""
+        with self._lock:
+            entry = self._prices.get(symbol.upper())
+        if entry is None:
+            return None
+
+        price, received_ts = entry
+        if time.time() - received_ts > max_age:
+            return None
+        return price
+
+    def last_update(self, symbol: str) -> Optional[Tuple[float, float]]:
+        with self._lock:
+            return self._prices.get(symbol.upper())
+
+    # internal
+    def _streams_for(self, symbols):
+        streams = []
+        for s in symbols:
+            s = s.lower()
+            streams.append(f"{s}@aggTrade")
+        return streams
+
+    def _send_subscribe(self, symbols):
+        ws = self._ws
+        if ws is None or not symbols:
+            return
+
+        with self._lock:
+            request_id = self._next_request_id
+            self._next_request_id += 1
+
+        payload = {
+            "method": "SUBSCRIBE",
+            "params": self._streams_for(symbols),
+            "id": request_id,
+        }
+        try:
+            ws.send(json.dumps(payload))
+        except Exception as e:
+            print(f"[WARN] Binance stream subscribe failed: {e}")
+
+    def _on_open(self, ws):
+        self._ws = ws
+        with self._lock:
+            symbols = sorted(self._symbols)
+        self._send_subscribe(symbols)
+
+    def _on_message(self, ws, message):
+        try:
+            data = json.loads(message)
+        except ValueError:
+            return
+
+        # combined stream payloads wrap the event in {"stream": ..., "data": ...}
+        if isinstance(data, dict) and "data" in data:
+            data = data["data"]
+        if not isinstance(data, dict):
+            return
+
+        symbol = data.get("s")
+        if not symbol or data.get("e") != "aggTrade":
+            return
+
+        try:
+            price = float(data["p"])
+        except (KeyError, TypeError, ValueError):
+            return
+
+        if price <= 0:
+            return
+
+        with self._lock:
+            self._prices[symbol.upper()] = (price, time.time())
+
+    def _on_error(self, ws, error):
+        print(f"[WARN] Binance stream error: {error}")
+
+    def _on_close(self, ws, status_code, msg):
+        self._ws = None
+
+    def _run_forever(self, websocket):
+        while not self._stop.is_set():
+            app = websocket.WebSocketApp(
+                self.ws_url,
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_error=self._on_error,
+                on_close=self._on_close,
+            )
+            try:
+                app.run_forever(ping_interval=20, ping_timeout=10)
+            except Exception as e:
+                print(f"[WARN] Binance stream crashed: {e}")
+
+            self._ws = None
+            if self._stop.wait(self.reconnect_delay):
+                break
+
+
+_price_stream: Optional[BinancePriceStream] = None
+_price_stream_lock = threading.Lock()
+
+
+def get_binance_price_stream() -> Optional[BinancePriceStream]:
+    """Shared stream instance, started on first use. None when disabled."""
+    global _price_stream
+
+    if not FLAG_BINANCE_WS_ENABLE:
+        return None
+
+    with _price_stream_lock:
+        if _price_stream is None:
+            stream = BinancePriceStream()
+            if not stream.start():
+                return None
+            _price_stream = stream
+        return _price_stream
+
+
+def _fetch_binance_price_rest(
     symbol: str, max_retries: int = 5, base_delay: float = 0.5
 ) -> float:
     last_exc: Optional[Exception] = None
@@ -34,3 +225,229 @@ def get_binance_price(
     raise RuntimeError(
         f"Binance price fetch failed after {max_retries} retries"
     ) from last_exc
+
+
+def get_binance_price(
+    symbol: str, max_retries: int = 5, base_delay: float = 0.5
+) -> float:
+    stream = get_binance_price_stream()
+    if stream is not None:
+        stream.subscribe(symbol)
+        price = stream.get_price(symbol, max_age=BINANCE_WS_MAX_AGE_SEC)
+        if price is not None:
+            return price
+
+    # stream disabled, not yet warmed up or stale → REST fallback
+    return _fetch_binance_price_rest(symbol, max_retries, base_delay)
+
+
+def _fetch_binance_prices_rest(symbols: List[str]) -> Dict[str, float]:
+    """One request for many symbols (`?symbols=[...]`); unknown symbols are dropped."""
+    r = requests.get(
+        BINANCE_PRICE_API_URL,
+        params={"symbols": json.dumps(symbols, separators=(",", ":"))},
+        timeout=10,
+    )
+    r.raise_for_status()
+
+    prices: Dict[str, float] = {}
+    for item in r.json():
+        try:
+            prices[item["symbol"].upper()] = float(item["price"])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return prices
+
+
+def get_binance_prices(symbols: List[str]) -> Dict[str, float]:
+    """
+    Prices for many symbols at once: fresh stream values first, then a single
+    batched REST call for the rest (per-symbol REST when the batch fails).
+    Symbols that could not be priced are missing from the result.
+    """
+    symbols = [s.upper() for s in symbols]
+    prices: Dict[str, float] = {}
+
+    stream = get_binance_price_stream()
+    if stream is not None:
+        for symbol in symbols:
+            stream.subscribe(symbol)
+            price = stream.get_price(symbol, max_age=BINANCE_WS_MAX_AGE_SEC)
+            if price is not None:
+                prices[symbol] = price
+
+    missing = [s for s in symbols if s not in prices]
+    if len(missing) > 1:
+        try:
+            prices.update(_fetch_binance_prices_rest(missing))
+            return prices
+        except (requests.RequestException, ValueError) as e:
+            print(f"[WARN] Binance batch price fetch failed: {e} → per symbol")
+
+    for symbol in missing:
+        try:
+            prices[symbol] = _fetch_binance_price_rest(symbol, max_retries=1)
+        except RuntimeError:
+            continue
+    return prices
+
+
+class StalePriceError(RuntimeError):
+    pass
+
+
+class PricePrefetcher:
+    """
+    Background thread that keeps a fresh reference price per symbol so the
+    engines never block on Binance. Keeps the last known good value and
+    refuses to hand out prices older than `max_age_sec`.
+    """
+
+    def __init__(
+        self,
+        interval_sec: float = PRICE_PREFETCH_INTERVAL_SEC,
+        max_age_sec: float = PRICE_MAX_AGE_SEC,
+        fetch_price: Optional[Callable[[str], float]] = None,
+    ):
+        self.interval_sec = interval_sec
+        self.max_age_sec = max_age_sec
+        # defaults to Binance (one batched request for every symbol); the
+        # simulator benchmarks pass their own per-symbol source
+        self.fetch_price = fetch_price
+
+        self._symbols: Set[str] = set()
+        self._prices: Dict[str, Tuple[float, float]] = {}
+        self._errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, symbol: str):
+        symbol = symbol.upper()
+        with self._lock:
+            is_new = symbol not in self._symbols
+            self._symbols.add(symbol)
+        self.start()
+        if is_new:
+            self._wakeup.set()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="price-prefetcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def last(self, symbol: str) -> Optional[Tuple[float, float]]:
+        """(price, fetched_ts) of the last good fetch, regardless of age."""
+        with self._lock:
+            return self._prices.get(symbol.upper())
+
+    def age(self, symbol: str) -> Optional[float]:
+        entry = self.last(symbol)
+        return None if entry is None else time.time() - entry[1]
+
+    def is_fresh(self, symbol: str, max_age: Optional[float] = None) -> bool:
+        age = self.age(symbol)
+        limit = self.max_age_sec if max_age is None else max_age
+        return age is not None and age <= limit
+
+    def get(self, symbol: str, max_age: Optional[float] = None) -> float:
+        """Non-blocking read. Raises StalePriceError when missing or too old."""
+        symbol = symbol.upper()
+        limit = self.max_age_sec if max_age is None else max_age
+        entry = self.last(symbol)
+
+        if entry is None:
+            with self._lock:
+                err = self._errors.get(symbol)
+            raise StalePriceError(
+                f"No {symbol} price yet" + (f" (last error: {err})" if err else "")
+            )
+
+        price, fetched_ts = entry
+        age = time.time() - fetched_ts
+        if age > limit:
+            raise StalePriceError(
+                f"{symbol} price is {age:.1f}s old (limit {limit:.1f}s)"
+            )
+        return price
+
+    def wait_ready(self, symbol: str, timeout: float) -> bool:
+        """Block until a first price for `symbol` is available (startup only)."""
+        self.add(symbol)
+        end_time = time.time() + timeout
+        while time.time() < end_time:
+            if self.is_fresh(symbol):
+                return True
+            time.sleep(0.1)
+        return False
+
+    def _fetch_all(self):
+        with self._lock:
+            symbols = sorted(self._symbols)
+
+        if self.fetch_price is None:
+            self._fetch_all_batched(symbols)
+            return
+
+        for symbol in symbols:
+            try:
+                price = self.fetch_price(symbol)
+            except Exception as e:
+                with self._lock:
+                    self._errors[symbol] = str(e)
+                continue
+
+            with self._lock:
+                self._prices[symbol] = (price, time.time())
+                self._errors.pop(symbol, None)
+
+    def _fetch_all_batched(self, symbols: List[str]):
+        if not symbols:
+            return
+        try:
+            prices = get_binance_prices(symbols)
+        except Exception as e:
+            prices = {}
+            error = str(e)
+        else:
+            error = "no price returned"
+
+        now = time.time()
+        with self._lock:
+            for symbol in symbols:
+                if symbol in prices:
+                    self._prices[symbol] = (prices[symbol], now)
+                    self._errors.pop(symbol, None)
+                else:
+                    self._errors[symbol] = error
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._fetch_all()
+            self._wakeup.wait(self.interval_sec)
+            self._wakeup.clear()
+
+
+_prefetcher: Optional[PricePrefetcher] = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_price_prefetcher() -> PricePrefetcher:
+    """Shared prefetcher so every engine in the process polls each symbol once."""
+    global _prefetcher
+
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            _prefetcher = PricePrefetcher()
+        return _prefetcher
@@ -0,0 +1,225 @@
+# kill_switch.py
+"""
+Emergency flatten: cancel every open order an engine left on the book, as
+fast as the available path allows, within a hard deadline, and report
+exactly what is still open.
+
+Runs when an engine stops for any reason: Ctrl+C, SIGTERM (see
+install_signal_handlers) or a crash in the run_* entry points, and when the
+supervisor stops or gives up on a market. Paths, fastest first:
+
+- HTTP gateway: every cancel posted at once over the pooled session
+- UI: one in-page script for all ids (cancel_orders_by_id)
+
+Each path only starts while time is left; whatever survives the deadline is
+read back from the open-orders table and printed, never waited on.
+
+The table is shared by every market on the account, so each target only
+touches its own side(s), and with an engine's OrderBookState only the ids
+that engine placed (a market the supervisor gives up on while its siblings
+keep quoting). Only a final stop flattens whole sides.
+"""
+from __future__ import annotations
+
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Collection, List, Optional, Sequence, Tuple
+
+from config import KILL_SWITCH_DEADLINE_SEC
+from modes.mm.order_state import OrderBookState
+from modes.mm.vic_gateway import HttpOrderGateway, OrderGateway
+from modes.mm.vic_orders import OrderRow, cancel_orders_by_id, read_open_orders_at
+
+_HTTP_CANCEL_WORKERS = 8
+
+
+@dataclass
+class FlattenReport:
+    label: str
+    found: int = 0  # open orders when the kill switch started
+    paths: List[str] = field(default_factory=list)
+    remaining: Optional[List[OrderRow]] = None  # None → could not read the table
+    elapsed_sec: float = 0.0
+    error: str = ""
+
+    @property
+    def flat(self) -> bool:
+        return self.remaining is not None and not self.remaining
+
+    def format(self) -> str:
+        via = "+".join(self.paths) or "-"
+        head = f"[KILL SWITCH] {self.label}: found {self.found}, via {via}, "
+        head += f"{self.elapsed_sec:.1f}s"
+        if self.remaining is None:
+            return head + f" → open orders UNKNOWN ({self.error or 'table not readable'})"
+        if not self.remaining:
+            return head + " → flat"
+        lines = [head + f" → {len(self.remaining)} STILL OPEN:"]
+        for r in sorted(self.remaining, key=lambda r: (r.side, r.price)):
+            lines.append(
+                f"    {r.side.upper():<3} {r.price:>14,.8f} "
+                f"pending {r.pending_qty:,.8f} (ID: {r.order_id})"
+            )
+        return "\n".join(lines)
+
+
+# (label, driver, gateway, sides) from engine.kill_switch_targets(); sides None → both
+Target = Tuple[str, object, Optional[OrderGateway], Optional[Tuple[str, ...]]]
+
+
+def _read_rows(
+    driver,
+    deadline: float,
+    sides: Optional[Collection[str]] = None,
+    orders: Optional[OrderBookState] = None,
+) -> Optional[List[OrderRow]]:
+    """The open orders this flatten may cancel, or None when the table is unreadable."""
+    try:
+        timeout = max(1, int(deadline - time.time()))
+        rows, read_ts = read_open_orders_at(driver, timeout=timeout)
+    except Exception:
+        return None
+    if orders is not None:
+        # the whole table: the other lane of a dual engine shares this book
+        orders.reconcile(rows, read_ts=read_ts)
+        own = {o.order_id for o in orders.open_orders() if o.role != "external"}
+        rows = [r for r in rows if r.order_id in own]
+    return [r for r in rows if sides is None or r.side in sides]
+
+
+def _cancel_http(gateway: HttpOrderGateway, rows: List[OrderRow], deadline: float):
+    pool = ThreadPoolExecutor(
+        max_workers=min(_HTTP_CANCEL_WORKERS, len(rows)), thread_name_prefix="kill-http"
+    )
+    try:
+        futures = [pool.submit(gateway.cancel_order, row) for row in rows]
+        wait(futures, timeout=max(0.0, deadline - time.time()))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def flatten_orders(
+    driver,
+    gateway: Optional[OrderGateway] = None,
+    deadline_sec: float = KILL_SWITCH_DEADLINE_SEC,
+    label: str = "",
+    sides: Optional[Collection[str]] = None,
+    orders: Optional[OrderBookState] = None,
+) -> FlattenReport:
+    """
+    Cancel the open orders on `driver`'s trade page within `deadline_sec`
+    and report what is left: those on `sides` (None: both), and with
+    `orders` only the ids tracked there as placed by us.
+    """
+    start = time.time()
+    deadline = start + deadline_sec
+    report = FlattenReport(label=label)
+
+    rows = _read_rows(driver, deadline, sides, orders)
+    if rows is None:
+        report.error = "table not readable"
+        report.elapsed_sec = time.time() - start
+        return report
+    report.found = len(rows)
+
+    paths = []
+    if isinstance(gateway, HttpOrderGateway):
+        paths.append("HTTP")
+    paths.append("UI")
+
+    for path in paths:
+        if not rows or time.time() >= deadline:
+            break
+        report.paths.append(path)
+        try:
+            if path == "HTTP":
+                _cancel_http(gateway, rows, deadline)
+            else:
+                cancel_orders_by_id(
+                    driver,
+                    [r.order_id for r in rows],
+                    popup_timeout=min(10.0, deadline_sec),
+                    deadline=deadline,
+                )
+        except Exception as e:
+            report.error = f"{path}: {type(e).__name__}: {e}"
+        # what is left is what the next path (and the report) sees
+        rows = _read_rows(driver, max(deadline, time.time() + 5), sides, orders)
+        if rows is None:
+            break
+
+    report.remaining = rows
+    if rows is None and not report.error:
+        report.error = "table not readable"
+    report.elapsed_sec = time.time() - start
+    return report
+
+
+def flatten_engine(
+    engine, deadline_sec: float = KILL_SWITCH_DEADLINE_SEC, own_only: bool = False
+) -> List[FlattenReport]:
+    """
+    Flatten every page the engine trades on (both lanes of a two-lane dual
+    engine at the same time, each on its own side) and print one report per
+    page. `own_only`: just the orders in engine.orders, for an engine that
+    stops while other markets on the account keep running.
+    """
+    targets: Sequence[Target] = engine.kill_switch_targets()
+    orders = engine.orders if own_only else None
+    reports: List[Optional[FlattenReport]] = [None] * len(targets)
+
+    def _run(i: int):
+        label, driver, gateway, sides = targets[i]
+        try:
+            reports[i] = flatten_orders(
+                driver, gateway, deadline_sec, label=label, sides=sides, orders=orders
+            )
+        except Exception as e:
+            reports[i] = FlattenReport(label=label, error=f"{type(e).__name__}: {e}")
+
+    what = "our own" if own_only else "every"
+    print(f"[KILL SWITCH] Cancelling {what} open order (deadline {deadline_sec:.0f}s)...")
+    try:
+        if len(targets) == 1:
+            _run(0)
+        else:
+            threads = [
+                threading.Thread(target=_run, args=(i,), name=f"kill-{i}", daemon=True)
+                for i in range(len(targets))
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                # the reads around each path may run a little past the deadline
+                t.join(max(0.0, deadline_sec + 10.0))
+    except KeyboardInterrupt:
+        print("[KILL SWITCH] Interrupted → orders may still be open, check the exchange")
+
+    out = []
+    for (label, *_), report in zip(targets, reports):
+        if report is None:
+            report = FlattenReport(label=label, error="did not finish")
+        print(report.format())
+        out.append(report)
+    return out
+
+
+def _raise_keyboard_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def install_signal_handlers():
+    """
+    Turn SIGTERM (and SIGHUP where it exists) into KeyboardInterrupt, so a
+    service manager stopping us takes the same kill-switch path as Ctrl+C.
+    Only possible from the main thread; a no-op elsewhere.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for name in ("SIGTERM", "SIGHUP"):
+        sig = getattr(signal, name, None)
+        if sig is not None:
+            signal.signal(sig, _raise_keyboard_interrupt)
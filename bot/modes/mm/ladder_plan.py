@@ -0,0 +1,69 @@
+# ladder_plan.py
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable, List, Sequence, Union
+
+from modes.mm.vic_orders import OrderRow
+from modes.mm.order_state import TrackedOrder
+
+OpenOrder = Union[OrderRow, TrackedOrder]
+
+
+@dataclass
+class LadderPlan:
+    keep: List[OpenOrder] = field(default_factory=list)
+    cancel: List[OpenOrder] = field(default_factory=list)
+    place: List[float] = field(default_factory=list)
+
+    @property
+    def ops(self) -> int:
+        return len(self.cancel) + len(self.place)
+
+
+def _within(a: float, b: float, tolerance_ratio: float) -> bool:
+    return abs(a - b) <= abs(b) * tolerance_ratio
+
+
+def plan_ladder_reconciliation(
+    desired_prices: Sequence[float],
+    open_orders: Sequence[OpenOrder],
+    tolerance_ratio: float,
+    protected_prices: Iterable[float] = (),
+) -> LadderPlan:
+    """
+    Diff the desired ladder against our open orders on one side.
+
+    Each desired price is matched to at most one open order whose price is
+    within `tolerance_ratio` (closest pairs first). Matched orders are kept,
+    desired prices without a match are placed, and unmatched orders are
+    cancelled unless they sit on one of `protected_prices` (e.g. the anchor).
+    """
+    candidates = []
+    for di, price in enumerate(desired_prices):
+        for oi, order in enumerate(open_orders):
+            if _within(order.price, price, tolerance_ratio):
+                candidates.append((abs(order.price - price), di, oi))
+    candidates.sort()
+
+    matched_desired = set()
+    matched_orders = set()
+    for _, di, oi in candidates:
+        if di in matched_desired or oi in matched_orders:
+            continue
+        matched_desired.add(di)
+        matched_orders.add(oi)
+
+    protected = list(protected_prices)
+    plan = LadderPlan()
+
+    for oi, order in enumerate(open_orders):
+        if oi in matched_orders:
+            plan.keep.append(order)
+        elif any(_within(order.price, p, tolerance_ratio) for p in protected):
+            plan.keep.append(order)
+        else:
+            plan.cancel.append(order)
+
+    plan.place = [p for di, p in enumerate(desired_prices) if di not in matched_desired]
+    return plan
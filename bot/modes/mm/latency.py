@@ -0,0 +1,117 @@
+# latency.py
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+# Samples kept per (op, side, stage); old ones roll off.
+_MAX_SAMPLES = 2000
+
+Key = Tuple[str, str, str]  # (op, side, stage)
+
+
+def _percentile(sorted_samples: List[float], pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    idx = min(len(sorted_samples) - 1, int(round(pct / 100.0 * (len(sorted_samples) - 1))))
+    return sorted_samples[idx]
+
+
+class LatencySpan:
+    """
+    Stage timer for one order/cancel. mark(stage) records the time since
+    the previous mark, finish() records the total and the outcome.
+    """
+
+    __slots__ = ("_recorder", "op", "side", "_start", "_last", "_done")
+
+    def __init__(self, recorder: "LatencyRecorder", op: str, side: str):
+        self._recorder = recorder
+        self.op = op
+        self.side = side
+        self._start = self._last = time.perf_counter()
+        self._done = False
+
+    def mark(self, stage: str):
+        now = time.perf_counter()
+        self._recorder.add(self.op, self.side, stage, now - self._last)
+        self._last = now
+
+    def finish(self, ok: bool):
+        if self._done:
+            return
+        self._done = True
+        total = time.perf_counter() - self._start
+        self._recorder.add(self.op, self.side, "total" if ok else "total_failed", total)
+
+
+class LatencyRecorder:
+    """In-process latency histograms per (op, side, stage)."""
+
+    def __init__(self, max_samples: int = _MAX_SAMPLES):
+        self.max_samples = max_samples
+        self._samples: Dict[Key, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def span(self, op: str, side: str) -> LatencySpan:
+        return LatencySpan(self, op, side)
+
+    def add(self, op: str, side: str, stage: str, seconds: float):
+        key = (op, side, stage)
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.max_samples)
+            samples.append(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self, op: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, Dict[str, float]]]]:
+        """
+        {op: {side: {stage: {count, p50, p95, p99, max}}}} in milliseconds.
+        Sorting happens here, never on the recording path.
+        """
+        with self._lock:
+            snapshot = {k: list(v) for k, v in self._samples.items()}
+
+        out: Dict[str, Dict[str, Dict[str, Dict[str, float]]]] = {}
+        for (k_op, side, stage), samples in snapshot.items():
+            if op is not None and k_op != op:
+                continue
+            samples.sort()
+            out.setdefault(k_op, {}).setdefault(side, {})[stage] = {
+                "count": len(samples),
+                "p50": _percentile(samples, 50) * 1000.0,
+                "p95": _percentile(samples, 95) * 1000.0,
+                "p99": _percentile(samples, 99) * 1000.0,
+                "max": samples[-1] * 1000.0,
+            }
+        return out
+
+    def format_report(self) -> str:
+        summary = self.summary()
+        if not summary:
+            return "no latency samples"
+
+        lines = [
+            f"{'op':<8} {'side':<5} {'stage':<16} {'n':>6} "
+            f"{'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"
+        ]
+        for op in sorted(summary):
+            for side in sorted(summary[op]):
+                for stage, s in summary[op][side].items():
+                    lines.append(
+                        f"{op:<8} {side:<5} {stage:<16} {s['count']:>6} "
+                        f"{s['p50']:>7.1f}ms {s['p95']:>7.1f}ms "
+                        f"{s['p99']:>7.1f}ms {s['max']:>7.1f}ms"
+                    )
+        return "\n".join(lines)
+
+
+# Default for vic_trade / vic_orders calls made without a recorder (benchmarks).
+# Gateways carry their own, so each engine reports only its own market.
+LATENCY = LatencyRecorder()
@@ -7,11 +7,11 @@ from __future__ import annotations
 import random
 import time
 import re
+from concurrent.futures import ThreadPoolExecutor, wait
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from dataclasses import dataclass
-from typing import List, Optional, Dict
+from typing import Callable, List, Optional, Dict, Sequence
 from selenium.common.exceptions import (
     StaleElementReferenceException,
     WebDriverException,
@@ -30,22 +30,34 @@ from config import (
     MM_TOAST_WAIT_SEC,
     FLAG_REMOVE_EXCESS_ORDERS_ENABLE,
     FLAG_ADJUSTMENT_ENABLE,
+    FLAG_VIC_ORDERBOOK_MIRROR_ENABLE,
+    FLAG_KILL_SWITCH_ENABLE,
     ANCHOR_ORDER_BUDGET_RATIO,
     MIN_ORDER_USDT,
     MM_DISTRIBUTION_MODE,
+    MM_RECONCILE_TOLERANCE_PERCENT,
+    MM_ORDER_RECONCILE_INTERVAL_SEC,
 )
 from modes.utils_driver import init_driver
-from modes.mm.vic_account_balance import (
-    get_available_buy_usdt,
-    get_available_sell_qty,
-)
-from modes.mm.vic_trade import place_limit_order
+from modes.utils_wait import format_wait_report, wait_until
+from modes.mm.vic_account_balance import BalanceProvider
+from modes.mm.vic_gateway import OrderGateway, UIOrderGateway, build_order_gateway
+from modes.mm.kill_switch import Target, flatten_engine, install_signal_handlers
+from modes.mm.vic_orderbook import OrderbookMirror, read_orderbook_js
+from modes.mm.vic_network import network_capture_for
+from modes.mm.ladder_plan import LadderPlan, plan_ladder_reconciliation
 from modes.mm.vic_orders import (
-    read_open_orders_side,
-    cancel_open_orders_row,
+    OrderRow,
+    read_open_orders_at,
     cancel_all_open_orders,
 )
-from modes.market_data import get_binance_price
+from modes.mm.order_state import OrderBookState, TrackedOrder, role_from_label
+from modes.market_data import (
+    PricePrefetcher,
+    StalePriceError,
+    get_binance_price,
+    get_price_prefetcher,
+)
 from modes.utils_logging import setup_logger
 from modes.utils_ui import validate_login_or_exit
 
@@ -64,6 +76,8 @@ class DualEngineConfig:
     anchor_order_budget_ratio: float
     min_order_usdt: float
     distribution_mode: str
+    reconcile_tolerance_percent: float
+    order_reconcile_interval_sec: float
 
     # Dual-side specific
     bid_fixed_amount: float
@@ -89,6 +103,8 @@ def _build_dual_cfg(bid_amount: float, ask_amount: float) -> DualEngineConfig:
         anchor_order_budget_ratio=ANCHOR_ORDER_BUDGET_RATIO,
         min_order_usdt=MIN_ORDER_USDT,
         distribution_mode=MM_DISTRIBUTION_MODE,
+        reconcile_tolerance_percent=MM_RECONCILE_TOLERANCE_PERCENT,
+        order_reconcile_interval_sec=MM_ORDER_RECONCILE_INTERVAL_SEC,
         bid_fixed_amount=bid_amount,
         ask_fixed_amount=ask_amount,
     )
@@ -137,12 +153,34 @@ def _vic_trade_url(vic_url: str, ticker: str) -> str:
     return f"{vic_url}/trade?code=USDT-{ticker.upper()}"
 
 
-def read_orderbook(driver, side: str, timeout: int = 5) -> List[OrderbookLevel]:
+def read_orderbook(
+    driver, side: str, timeout: int = 5, mirror: Optional[OrderbookMirror] = None
+) -> List[OrderbookLevel]:
     """Read orderbook from the page"""
+    capture = network_capture_for(driver)
+    if capture is not None:
+        captured = capture.state.orderbook(side)
+        if captured is not None:
+            return [OrderbookLevel(price=p, qty=q) for p, q in captured]
+
+    if mirror is not None:
+        # only the rows changed since the last read cross the wire
+        mirrored = mirror.read(side)
+        if mirrored is not None:
+            return [OrderbookLevel(price=p, qty=q) for p, q in mirrored]
+
+    fast = read_orderbook_js(driver, side)
+    if fast is not None:
+        return [OrderbookLevel(price=p, qty=q) for p, q in fast]
+
+    # fallback: per-element reads
     container_id = "order-box-ask" if side == "ask" else "order-box-bid"
     try:
-        container = WebDriverWait(driver, timeout).until(
-            EC.presence_of_element_located((By.ID, container_id))
+        container = wait_until(
+            driver,
+            EC.presence_of_element_located((By.ID, container_id)),
+            timeout,
+            "orderbook.container",
         )
         rows = container.find_elements(By.CSS_SELECTOR, "a.bidding-table-rows")
 
@@ -163,20 +201,76 @@ def read_orderbook(driver, side: str, timeout: int = 5) -> List[OrderbookLevel]:
         return []
 
 
-class DualSideMMEngine:
-    """Market maker engine that manages both BID and ASK sides with single driver"""
+@dataclass(frozen=True)
+class SideLane:
+    """Logged-in driver (on the trade page) and gateway one side works through"""
 
-    def __init__(self, driver, cfg: DualEngineConfig, ticker: str):
+    driver: object
+    gateway: OrderGateway
+
+
+class DualSideMMEngine:
+    """
+    Market maker engine that manages both BID and ASK sides.
+
+    With `lanes` ({"bid": SideLane, "ask": SideLane}, one driver each) both
+    sides run at the same time on two worker threads, sharing the order
+    state and the price anchor; otherwise they run one after the other on
+    `driver`.
+    """
+
+    def __init__(
+        self,
+        driver,
+        cfg: DualEngineConfig,
+        ticker: str,
+        gateway: Optional[OrderGateway] = None,
+        prices: Optional[PricePrefetcher] = None,
+        lanes: Optional[Dict[str, SideLane]] = None,
+    ):
         self.logger = setup_logger("dual", ticker)
         self.driver = driver
+        self.gateway = gateway or UIOrderGateway(driver)
+        # this engine's order timings only, also under the supervisor
+        self.latency = self.gateway.latency
         self.cfg = cfg
         self.ticker = ticker.upper()
         self._step = _step_ratio(cfg.step_percent)
 
+        # Two-lane mode: one driver/gateway and one worker thread per side
+        self.lanes = lanes or {}
+        if self.lanes and set(self.lanes) != {"bid", "ask"}:
+            raise ValueError("lanes needs exactly a 'bid' and an 'ask' lane")
+        self._executor = (
+            ThreadPoolExecutor(max_workers=2, thread_name_prefix=f"dual-{self.ticker}")
+            if self.lanes
+            else None
+        )
+
         # Price tracking
         self._anchor_price: Optional[float] = None
         self._prev_anchor_price: Optional[float] = None
         self._price_adjustment: Optional[float] = None
+        self._placed_anchor_price: Optional[float] = None
+
+        # Ladder diff computed by _reconcile_ladders_both_sides, consumed on placement
+        self._ladder_plans: Dict[str, LadderPlan] = {}
+
+        # Orderbook mirror per driver (page), installed on first read
+        self._mirrors: Dict[int, OrderbookMirror] = {}
+
+        # Our own orders; the open-orders table is only re-read to reconcile
+        self.orders = OrderBookState(cfg.order_reconcile_interval_sec)
+
+        # Free USDT (BID page) and coin (ASK page), cached and updated from our orders
+        self.balances = BalanceProvider(
+            self._driver_for("bid"), self.ticker, coin_driver=self._driver_for("ask")
+        )
+
+        # Reference price comes from the shared background prefetcher
+        self._symbol = f"{self.ticker}USDT"
+        self.prices = prices or get_price_prefetcher()
+        self.prices.add(self._symbol)
 
         # Timing
         self._last_rebalance_ts = 0.0
@@ -189,12 +283,14 @@ class DualSideMMEngine:
         self.logger.info(f"  ASK Budget: {cfg.ask_fixed_amount:.2f} USDT (coin value)")
         self.logger.info(f"  Distribution: {cfg.distribution_mode}")
         self.logger.info(f"  Levels: {cfg.levels}")
+        self.logger.info(f"  Order gateway: {self.gateway.name}")
+        self.logger.info(f"  Lanes: {'BID + ASK in parallel' if self.lanes else 'single'}")
 
     def _validate_initial_balance(self):
         """Validate sufficient balance for both sides"""
         try:
             # Check USDT balance for BID side
-            available_usdt = get_available_buy_usdt(self.driver)
+            available_usdt = self.balances.usdt()
             required_usdt = self.cfg.bid_fixed_amount * 1.1  # 10% buffer
 
             self.logger.info(
@@ -209,7 +305,7 @@ class DualSideMMEngine:
                 )
 
             # Check coin balance for ASK side
-            available_coin = get_available_sell_qty(self.driver)
+            available_coin = self.balances.coin()
 
             if available_coin <= 0:
                 raise RuntimeError(f"No {self.ticker} coins available for ASK side")
@@ -250,6 +346,7 @@ class DualSideMMEngine:
         max_attempts = 3
         for attempt in range(max_attempts):
             success, total = cancel_all_open_orders(self.driver)
+            self.balances.invalidate()
             self.logger.info(
                 f"{self.ticker} [Cleanup attempt {attempt+1}]: "
                 f"{success}/{total} orders cancelled."
@@ -278,6 +375,15 @@ class DualSideMMEngine:
 
     def run_mm(self):
         """Main loop for dual-side market making"""
+        if not self.start():
+            return
+
+        while True:
+            self.tick()
+            time.sleep(0.5)
+
+    def start(self) -> bool:
+        """Clean start and first rebalance of both sides. False when unsafe"""
 
         # Validate balance
         self._validate_initial_balance()
@@ -286,42 +392,64 @@ class DualSideMMEngine:
         self._ensure_clean_start()
 
         # Verify cleanup
-        bid_orders = read_open_orders_side(self.driver, "bid")
-        ask_orders = read_open_orders_side(self.driver, "ask")
+        rows = self._sync_order_state()
+        bid_orders = [r for r in rows if r.side == "bid"]
+        ask_orders = [r for r in rows if r.side == "ask"]
 
         if bid_orders or ask_orders:
             self.logger.error(
                 f"⚠️ CRITICAL: Orders still exist after cleanup! "
                 f"BID: {len(bid_orders)}, ASK: {len(ask_orders)}"
             )
-            return
+            return False
 
         # Initial setup for both sides
-        self.full_rebalance_both_sides()
+        if not self.prices.wait_ready(self._symbol, timeout=30):
+            self.logger.warning(f"{self.ticker} No fresh reference price yet")
+        with self.balances.rebalance():
+            self.full_rebalance_both_sides()
+        return True
 
-        # Main loop
-        while True:
-            now = _now()
+    def next_due_ts(self) -> float:
+        """When tick() next has UI work to do"""
+        return min(
+            self._last_rebalance_ts + self.cfg.rebalance_interval_sec,
+            self._last_refill_ts + self.cfg.refill_interval_sec,
+        )
 
+    def tick(self) -> bool:
+        """One pass of the main loop; True when it did rebalance/refill work"""
+        now = _now()
+
+        # Never quote on a stale reference price
+        if not self.prices.is_fresh(self._symbol):
+            return False
+
+        worked = False
+        with self.balances.rebalance():
             # Rebalance check
             if now - self._last_rebalance_ts >= self.cfg.rebalance_interval_sec:
                 self._sync_with_binance_both_sides()
+                worked = True
 
             # Refill check
             if (not self._rebalance_lock) and (
                 now - self._last_refill_ts >= self.cfg.refill_interval_sec
             ):
                 self._refill_both_sides_if_needed()
+                worked = True
 
-            time.sleep(0.5)
+        return worked
 
     def full_rebalance_both_sides(self):
         """Full rebalance for both BID and ASK sides"""
         self._rebalance_lock = True
         try:
             # Get current price
-            symbol = f"{self.ticker}USDT"
-            self._anchor_price = get_binance_price(symbol)
+            price = self._reference_price()
+            if price is None:
+                return
+            self._anchor_price = price
 
             # Calculate adjustment
             if FLAG_ADJUSTMENT_ENABLE:
@@ -337,9 +465,9 @@ class DualSideMMEngine:
                 f"Adjustment={self._price_adjustment*100:.2f}%"
             )
 
-            # Cancel all existing orders
+            # Cancel off-ladder orders only
             if FLAG_REMOVE_EXCESS_ORDERS_ENABLE:
-                self._remove_excess_orders_both_sides()
+                self._reconcile_ladders_both_sides(keep_anchor=False)
 
             # Setup both sides
             self._setup_both_sides()
@@ -348,6 +476,9 @@ class DualSideMMEngine:
             self._last_rebalance_ts = _now()
             self._prev_anchor_price = self._anchor_price
 
+            # Bait/sweep fill against each other; pick that up on the next read
+            self.orders.mark_dirty("post-rebalance fills")
+
         finally:
             self._rebalance_lock = False
 
@@ -378,89 +509,83 @@ class DualSideMMEngine:
         """Place bait orders on opposite sides"""
         bait_qty = _normalize_qty(self.cfg.min_order_usdt / target_price)
 
-        # BID bait on ASK side
-        self.logger.info(
-            f"{self.ticker} [BAIT-BID] ASK {target_price:.3f} qty={bait_qty:.8f}"
-        )
-        if not self._retry_order("ask", target_price, bait_qty, "BAIT-BID"):
-            raise RuntimeError("BAIT-BID order failed")
-
-        time.sleep(0.3)
+        def _bait(side: str):
+            # BID bait is an ASK order and vice versa
+            label = "BAIT-BID" if side == "ask" else "BAIT-ASK"
+            self.logger.info(
+                f"{self.ticker} [{label}] {side.upper()} {target_price:.3f} "
+                f"qty={bait_qty:.8f}"
+            )
+            if not self._retry_order(side, target_price, bait_qty, label):
+                raise RuntimeError(f"{label} order failed")
 
-        # ASK bait on BID side
-        self.logger.info(
-            f"{self.ticker} [BAIT-ASK] BID {target_price:.3f} qty={bait_qty:.8f}"
-        )
-        if not self._retry_order("bid", target_price, bait_qty, "BAIT-ASK"):
-            raise RuntimeError("BAIT-ASK order failed")
+            time.sleep(0.3)
 
-        time.sleep(0.3)
+        self._for_both_sides(_bait, order=("ask", "bid"))
 
     def _sweep_blocking_orders(self, target_price: float):
         """Sweep blocking orders on both sides"""
 
-        # Sweep for BID side (buy from ASK orderbook)
-        ask_blocking = self._get_blocking_orders("ask", target_price, is_bid=True)
-        if ask_blocking:
-            total_sweep_qty = sum(o.qty for o in ask_blocking)
-            self.logger.info(
-                f"{self.ticker} [SWEEP-BID] BID {total_sweep_qty:.8f} units at {target_price:.3f}"
+        def _sweep(side: str):
+            # BID sweeps the ASK orderbook, ASK sweeps the BID orderbook
+            book_side = "ask" if side == "bid" else "bid"
+            blocking = self._get_blocking_orders(
+                book_side,
+                target_price,
+                is_bid=(side == "bid"),
+                driver=self._driver_for(side),
             )
-            if self._retry_order("bid", target_price, total_sweep_qty, "SWEEP-BID"):
-                time.sleep(0.2)
+            if not blocking:
+                return
 
-        # Sweep for ASK side (sell to BID orderbook)
-        bid_blocking = self._get_blocking_orders("bid", target_price, is_bid=False)
-        if bid_blocking:
-            total_sweep_qty = sum(o.qty for o in bid_blocking)
+            label = f"SWEEP-{side.upper()}"
+            total_sweep_qty = sum(o.qty for o in blocking)
             self.logger.info(
-                f"{self.ticker} [SWEEP-ASK] ASK {total_sweep_qty:.8f} units at {target_price:.3f}"
+                f"{self.ticker} [{label}] {side.upper()} {total_sweep_qty:.8f} units at {target_price:.3f}"
             )
-            if self._retry_order("ask", target_price, total_sweep_qty, "SWEEP-ASK"):
+            if self._retry_order(side, target_price, total_sweep_qty, label):
                 time.sleep(0.2)
 
+        self._for_both_sides(_sweep)
+
     def _place_anchor_orders(self, target_price: float):
         """Place anchor orders on both sides"""
+        self._placed_anchor_price = target_price
 
-        # BID anchor
-        try:
-            usdt = self.cfg.bid_fixed_amount * self.cfg.anchor_order_budget_ratio
-            qty = _normalize_qty(usdt / target_price)
+        def _anchor(side: str):
+            try:
+                if side == "bid":
+                    usdt = self.cfg.bid_fixed_amount * self.cfg.anchor_order_budget_ratio
+                    qty = _normalize_qty(usdt / target_price)
+                else:
+                    coin_value = self.cfg.ask_fixed_amount
+                    total_coin_qty = coin_value / target_price
+                    qty = _normalize_qty(
+                        total_coin_qty * self.cfg.anchor_order_budget_ratio
+                    )
 
-            if qty > 0:
-                self.logger.info(
-                    f"{self.ticker} [ANCHOR-BID] BID {target_price:.3f} qty={qty:.8f}"
-                )
-                self._retry_order("bid", target_price, qty, "ANCHOR-BID")
-                time.sleep(0.2)
-        except Exception as e:
-            self.logger.error(f"BID anchor failed: {e}")
+                if qty > 0:
+                    label = f"ANCHOR-{side.upper()}"
+                    self.logger.info(
+                        f"{self.ticker} [{label}] {side.upper()} {target_price:.3f} qty={qty:.8f}"
+                    )
+                    self._retry_order(side, target_price, qty, label)
+                    time.sleep(0.2)
+            except Exception as e:
+                self.logger.error(f"{side.upper()} anchor failed: {e}")
 
-        # ASK anchor
-        try:
-            coin_value = self.cfg.ask_fixed_amount
-            total_coin_qty = coin_value / target_price
-            qty = _normalize_qty(total_coin_qty * self.cfg.anchor_order_budget_ratio)
-
-            if qty > 0:
-                self.logger.info(
-                    f"{self.ticker} [ANCHOR-ASK] ASK {target_price:.3f} qty={qty:.8f}"
-                )
-                self._retry_order("ask", target_price, qty, "ANCHOR-ASK")
-                time.sleep(0.2)
-        except Exception as e:
-            self.logger.error(f"ASK anchor failed: {e}")
+        self._for_both_sides(_anchor)
 
     def _place_ladder_orders_both_sides(self):
         """Place ladder orders for both sides"""
 
-        # BID ladder
-        bid_prices = self._calculate_ladder_prices("bid")
-        self._place_ladder_orders_side("bid", bid_prices)
+        def _ladder(side: str):
+            prices = self._calculate_ladder_prices(side)
+            plan = self._ladder_plans.pop(side, None)
+            only = plan.place if plan is not None else None
+            self._place_ladder_orders_side(side, prices, only=only)
 
-        # ASK ladder
-        ask_prices = self._calculate_ladder_prices("ask")
-        self._place_ladder_orders_side("ask", ask_prices)
+        self._for_both_sides(_ladder)
 
     def _calculate_ladder_prices(self, side: str) -> List[float]:
         """Calculate ladder price levels"""
@@ -479,17 +604,26 @@ class DualSideMMEngine:
 
         return prices
 
-    def _place_ladder_orders_side(self, side: str, prices: List[float]):
-        """Place ladder orders for one side"""
+    def _place_ladder_orders_side(
+        self, side: str, prices: List[float], only: Optional[List[float]] = None
+    ):
+        """
+        Place ladder orders for one side.
+        `only` restricts placement to those prices (weights still follow the full ladder).
+        """
         if not prices:
             return
+        wanted = set(only) if only is not None else None
 
         weights = _get_weights(len(prices), self.cfg.distribution_mode)
+        batch = []
 
         if side == "bid":
             usdt = self.cfg.bid_fixed_amount * (1 - self.cfg.anchor_order_budget_ratio)
 
             for price, w in zip(prices, weights):
+                if wanted is not None and price not in wanted:
+                    continue
                 budget = usdt * w
                 qty = _normalize_qty(budget / price)
                 if qty <= 0:
@@ -500,12 +634,7 @@ class DualSideMMEngine:
                     f"{self.ticker} [LADDER-BID] BID price={price:.3f} "
                     f"qty={qty:.8f} ≈{usdt_value:,.0f}usdt"
                 )
-
-                try:
-                    place_limit_order(self.driver, "bid", price, qty)
-                    _sleep_tiny()
-                except Exception as e:
-                    self.logger.error(f"❌ LADDER-BID failed at {price:.3f}: {e}")
+                batch.append(("bid", price, qty))
 
         else:  # ask
             coin_value = self.cfg.ask_fixed_amount
@@ -513,6 +642,8 @@ class DualSideMMEngine:
             coin = total_coin_qty * (1 - self.cfg.anchor_order_budget_ratio)
 
             for price, w in zip(prices, weights):
+                if wanted is not None and price not in wanted:
+                    continue
                 qty = _normalize_qty(coin * w)
                 if qty <= 0:
                     continue
@@ -522,21 +653,34 @@ class DualSideMMEngine:
                     f"{self.ticker} [LADDER-ASK] ASK price={price:.3f} "
                     f"qty={qty:.8f} ≈{usdt_value:,.0f}usdt"
                 )
+                batch.append(("ask", price, qty))
 
-                try:
-                    place_limit_order(self.driver, "ask", price, qty)
-                    _sleep_tiny()
-                except Exception as e:
-                    self.logger.error(f"❌ LADDER-ASK failed at {price:.3f}: {e}")
+        self._place_ladder_batch(side, batch)
 
-    def _sync_with_binance_both_sides(self):
-        """Sync with Binance price and decide rebalance strategy"""
-        symbol = f"{self.ticker}USDT"
+    def _place_ladder_batch(self, side: str, batch: List[tuple]):
+        """Place collected ladder levels through the gateway in one batch"""
+        if not batch:
+            return
 
+        label = f"LADDER-{side.upper()}"
         try:
-            new_price = get_binance_price(symbol)
+            results = self._gateway_for(side).place_limit_orders(batch)
         except Exception as e:
-            self.logger.error(f"Failed to fetch Binance price: {e}")
+            self.orders.mark_dirty("ladder order error")
+            for order_side, price, qty in batch:
+                self.balances.on_placed(order_side, price, qty, confirmed=False)
+            self.logger.error(f"❌ {label} batch failed: {e}")
+            return
+
+        for (order_side, price, qty), success in zip(batch, results):
+            self._record_place(success, order_side, price, qty, "ladder")
+            if not success:
+                self.logger.error(f"❌ {label} failed at {price:.3f}")
+
+    def _sync_with_binance_both_sides(self):
+        """Sync with Binance price and decide rebalance strategy"""
+        new_price = self._reference_price()
+        if new_price is None:
             return
 
         if self._prev_anchor_price is None:
@@ -548,8 +692,8 @@ class DualSideMMEngine:
 
         # Check orderbook status
         try:
-            bid_orders = read_open_orders_side(self.driver, "bid")
-            ask_orders = read_open_orders_side(self.driver, "ask")
+            bid_orders = self._open_orders("bid")
+            ask_orders = self._open_orders("ask")
             bid_empty = len(bid_orders) == 0
             ask_empty = len(ask_orders) == 0
         except Exception as e:
@@ -597,13 +741,9 @@ class DualSideMMEngine:
             f"{self.ticker} [REFILL BOTH SIDES] Binance={self._anchor_price:.3f}"
         )
 
-        # Refill BID side
-        bid_prices = self._calculate_ladder_prices("bid")
-        self._place_ladder_orders_side("bid", bid_prices)
-
-        # Refill ASK side
-        ask_prices = self._calculate_ladder_prices("ask")
-        self._place_ladder_orders_side("ask", ask_prices)
+        # Cancel off-ladder orders, then place only the missing levels
+        self._reconcile_ladders_both_sides(keep_anchor=True)
+        self._place_ladder_orders_both_sides()
 
         self._last_rebalance_ts = _now()
 
@@ -613,12 +753,9 @@ class DualSideMMEngine:
             self.full_rebalance_both_sides()
             return
 
-        # Check BID side
-        bid_orders = read_open_orders_side(self.driver, "bid")
+        bid_orders = self._open_orders("bid")
+        ask_orders = self._open_orders("ask")
         bid_need = self.cfg.levels - len(bid_orders)
-
-        # Check ASK side
-        ask_orders = read_open_orders_side(self.driver, "ask")
         ask_need = self.cfg.levels - len(ask_orders)
 
         if bid_need > 0 or ask_need > 0:
@@ -626,11 +763,8 @@ class DualSideMMEngine:
                 f"{self.ticker} [REFILL CHECK] Need BID:{bid_need} ASK:{ask_need}"
             )
 
-            if bid_need > 0:
-                self._refill_ladder_side("bid", bid_orders)
-
-            if ask_need > 0:
-                self._refill_ladder_side("ask", ask_orders)
+            existing = {"bid": bid_orders, "ask": ask_orders}
+            self._for_both_sides(lambda side: self._refill_ladder_side(side, existing[side]))
 
             self._last_refill_ts = _now()
 
@@ -670,7 +804,8 @@ class DualSideMMEngine:
         """Retry order placement"""
         for i in range(max_retries):
             try:
-                success = place_limit_order(self.driver, side, price, qty)
+                success = self._gateway_for(side).place_limit_order(side, price, qty)
+                self._record_place(success, side, price, qty, role_from_label(label))
                 if success:
                     _sleep_tiny()
                     return True
@@ -679,6 +814,8 @@ class DualSideMMEngine:
                     if i < max_retries - 1:
                         time.sleep(1)
             except Exception as e:
+                self.orders.mark_dirty(f"{label} order error")
+                self.balances.on_placed(side, price, qty, confirmed=False)
                 self.logger.warning(f"⚠️ {label} FAILED ({i+1}/{max_retries}): {e}")
                 if i < max_retries - 1:
                     time.sleep(1)
@@ -686,9 +823,12 @@ class DualSideMMEngine:
         self.logger.error(f"❌ {label} FAILED after {max_retries} retries")
         return False
 
-    def _get_blocking_orders(self, side: str, target_price: float, is_bid: bool):
+    def _get_blocking_orders(
+        self, side: str, target_price: float, is_bid: bool, driver=None
+    ):
         """Get blocking orders from orderbook"""
-        orders = read_orderbook(self.driver, side)
+        driver = driver or self.driver
+        orders = read_orderbook(driver, side, mirror=self._orderbook_mirror(driver))
         if is_bid:
             blocking = [o for o in orders if o.price < target_price]
         else:
@@ -700,38 +840,199 @@ class DualSideMMEngine:
             )
         return blocking
 
-    def _remove_excess_orders_both_sides(self):
-        """Remove excess orders from both sides"""
-        bid_orders = read_open_orders_side(self.driver, "bid")
-        ask_orders = read_open_orders_side(self.driver, "ask")
+    def _reconcile_tolerance_ratio(self) -> float:
+        # never wider than half a step, or neighbouring levels would merge
+        return min(self.cfg.reconcile_tolerance_percent / 100.0, self._step / 2)
+
+    def _reconcile_ladders_both_sides(self, keep_anchor: bool):
+        """
+        Diff the target ladders against open orders: cancel only orders that
+        are off-ladder (or duplicates) and remember which levels to place.
+        keep_anchor=False when a new anchor is about to be placed anyway.
+        """
+        tolerance = self._reconcile_tolerance_ratio()
+        protected = []
+        if keep_anchor and self._placed_anchor_price is not None:
+            protected.append(self._placed_anchor_price)
+
+        def _plan(side: str, orders) -> LadderPlan:
+            return plan_ladder_reconciliation(
+                self._calculate_ladder_prices(side),
+                orders,
+                tolerance,
+                protected_prices=protected,
+            )
+
+        # Plan from memory first; only read the table when there is something to cancel
+        plans = {side: _plan(side, self._open_orders(side)) for side in ("bid", "ask")}
+        if any(plan.cancel for plan in plans.values()):
+            rows = self._sync_order_state()
+            plans = {
+                side: _plan(side, [r for r in rows if r.side == side])
+                for side in ("bid", "ask")
+            }
+
+        self._ladder_plans = dict(plans)
+
+        def _cancel_off_ladder(side: str):
+            plan = plans[side]
+            orders = plan.keep + plan.cancel
 
-        if len(bid_orders) > self.cfg.levels or len(ask_orders) > self.cfg.levels:
             self.logger.info(
-                f"{self.ticker} [REMOVE EXCESS] "
-                f"BID: {len(bid_orders)}/{self.cfg.levels}, "
-                f"ASK: {len(ask_orders)}/{self.cfg.levels}"
+                f"{self.ticker} [RECONCILE-{side.upper()}] "
+                f"open={len(orders)} keep={len(plan.keep)} "
+                f"cancel={len(plan.cancel)} place={len(plan.place)}"
             )
-            cancel_all_open_orders(self.driver)
-            time.sleep(1)
 
+            if not plan.cancel:
+                return
+            try:
+                results = self._gateway_for(side).cancel_orders(
+                    plan.cancel, timeout=self.cfg.cancel_row_timeout_sec
+                )
+            except (StaleElementReferenceException, WebDriverException) as e:
+                self.orders.mark_dirty("cancel failed")
+                self.logger.warning(f"⚠️ {side.upper()} cancel failed: {e}")
+                return
+            for row, ok in zip(plan.cancel, results):
+                if ok:
+                    self.orders.record_cancelled(row.order_id)
+                    self.balances.on_cancelled(
+                        row.side, row.price, row.pending_qty or row.qty
+                    )
+                elif ok is None:
+                    # gone before our cancel: it may have filled, so re-read funds
+                    self.orders.mark_dirty("order gone before cancel")
+                    self.balances.invalidate()
+                else:
+                    self.orders.mark_dirty("cancel failed")
+                    self.logger.warning(
+                        f"⚠️ Cancel failed for {side.upper()} {row.price:.3f} "
+                        f"(ID: {row.order_id})"
+                    )
 
-def run_dual_side_mm(vic_url: str, ticker: str, bid_amount: float, ask_amount: float):
-    """Run dual-side market maker"""
+        self._for_both_sides(_cancel_off_ladder)
+
+    def _gateway_for(self, side: str) -> OrderGateway:
+        lane = self.lanes.get(side)
+        return lane.gateway if lane is not None else self.gateway
+
+    def _driver_for(self, side: str):
+        lane = self.lanes.get(side)
+        return lane.driver if lane is not None else self.driver
+
+    def _for_both_sides(
+        self, fn: Callable[[str], None], order: Sequence[str] = ("bid", "ask")
+    ):
+        """
+        Run fn(side) for both sides: at the same time on their own lanes in
+        two-lane mode, else one after the other. Re-raises the first error
+        once both sides are done.
+        """
+        if self._executor is None:
+            for side in order:
+                fn(side)
+            return
+
+        futures = [self._executor.submit(fn, side) for side in order]
+        wait(futures)
+        for future in futures:
+            future.result()
+
+    def close(self):
+        """Stop the lane workers (two-lane mode)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def kill_switch_targets(self) -> List[Target]:
+        """(label, driver, gateway, sides) of every page this engine quotes on"""
+        if not self.lanes:
+            return [(self.ticker, self.driver, self.gateway, None)]
+        # each lane cancels its own side, so the two never race on the same ids
+        return [
+            (f"{self.ticker} {side.upper()}", lane.driver, lane.gateway, (side,))
+            for side, lane in self.lanes.items()
+        ]
+
+    def _orderbook_mirror(self, driver) -> Optional[OrderbookMirror]:
+        """One mirror per page; each lane reads its own driver's mirror"""
+        if not FLAG_VIC_ORDERBOOK_MIRROR_ENABLE:
+            return None
+        mirror = self._mirrors.get(id(driver))
+        if mirror is None:
+            mirror = self._mirrors[id(driver)] = OrderbookMirror(driver)
+        return mirror
+
+    def _reference_price(self) -> Optional[float]:
+        """Latest prefetched reference price, or None (refuse to quote) when stale."""
+        try:
+            return self.prices.get(self._symbol)
+        except StalePriceError as e:
+            self.logger.warning(f"{self.ticker} [STALE PRICE] {e} → not quoting")
+            return None
+
+    def _record_place(self, success: bool, side: str, price: float, qty: float, role):
+        if success:
+            self.orders.record_placed(side, price, qty, role)
+            self.balances.on_placed(side, price, qty)
+        else:
+            # The order may still have gone through
+            self.orders.mark_dirty(f"{role} order not confirmed")
+            self.balances.on_placed(side, price, qty, confirmed=False)
+
+    def _sync_order_state(self) -> List[OrderRow]:
+        """Read the open-orders table and reconcile the local order book with it"""
+        rows, read_ts = read_open_orders_at(self.driver)
+        summary = self.orders.reconcile(rows, read_ts=read_ts)
+        if any(summary.values()):
+            self.logger.info(f"{self.ticker} [ORDER STATE] reconciled {summary}")
+        if summary["closed"] or summary["dropped"]:
+            # Filled or cancelled elsewhere; either way the balances moved
+            self.balances.invalidate()
+        return rows
+
+    def _open_orders(self, side: Optional[str] = None) -> List[TrackedOrder]:
+        """Our open orders from memory; reconciles first when due or diverged"""
+        if self.orders.needs_reconcile(_now()):
+            self._sync_order_state()
+        return self.orders.open_orders(side)
+
+    def latency_report(self) -> Dict[str, Dict[str, Dict[str, Dict[str, float]]]]:
+        """p50/p95/p99 per op, side and stage (ms) for orders placed so far"""
+        return self.latency.summary()
+
+    def log_latency_report(self):
+        self.logger.info(f"{self.ticker} order latency:\n{self.latency.format_report()}")
+        self.logger.info(f"{self.ticker} wait time per call site:\n{format_wait_report()}")
+
+
+def run_dual_side_mm(
+    vic_url: str,
+    ticker: str,
+    bid_amount: float,
+    ask_amount: float,
+    driver=None,
+    ask_driver=None,
+):
+    """
+    Run dual-side market maker (on `driver` when given, e.g. a shared session).
+    A second logged-in `ask_driver` enables two-lane mode: BID on `driver`,
+    ASK on `ask_driver`, both at the same time.
+    """
     cfg = _build_dual_cfg(bid_amount, ask_amount)
-    driver = init_driver()
+    install_signal_handlers()
+    owns_driver = driver is None
+    if owns_driver:
+        driver = init_driver()
+    engine = None
 
     try:
-        driver.get(f"{vic_url}/account/login")
-        validate_login_or_exit(driver=driver, mode=5)
-        driver.get(_vic_trade_url(vic_url, ticker))
-
-        # Wait for page load
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.ID, "user_base_trans"))
-        )
+        if owns_driver:
+            driver.get(f"{vic_url}/account/login")
+            validate_login_or_exit(driver=driver, mode=5)
 
         # Run dual-side engine
-        engine = DualSideMMEngine(driver=driver, cfg=cfg, ticker=ticker)
+        engine = build_dual_engine(driver, vic_url, ticker, cfg, ask_driver=ask_driver)
         engine.run_mm()
 
     except KeyboardInterrupt:
@@ -742,8 +1043,60 @@ def run_dual_side_mm(vic_url: str, ticker: str, bid_amount: float, ask_amount: f
 
         traceback.print_exc()
     finally:
-        try:
-            driver.quit()
-        except (WebDriverException, Exception) as e:
-            print(f"[WARNING] Error during driver cleanup: {e}")
-        print("[INFO] Driver shutdown complete.")
+        if engine is not None:
+            engine.close()
+            if FLAG_KILL_SWITCH_ENABLE:
+                flatten_engine(engine)
+            engine.log_latency_report()
+        if owns_driver:
+            try:
+                driver.quit()
+            except (WebDriverException, Exception) as e:
+                print(f"[WARNING] Error during driver cleanup: {e}")
+            print("[INFO] Driver shutdown complete.")
+
+
+def _open_trade_page(driver, vic_url: str, ticker: str):
+    driver.get(_vic_trade_url(vic_url, ticker))
+
+    # Wait for page load
+    wait_until(
+        driver,
+        EC.presence_of_element_located((By.ID, "user_base_trans")),
+        20,
+        "page.load",
+    )
+
+
+def build_dual_engine(
+    driver,
+    vic_url: str,
+    ticker: str,
+    cfg: DualEngineConfig,
+    prices: Optional[PricePrefetcher] = None,
+    ask_driver=None,
+) -> DualSideMMEngine:
+    """Open the trade page(s) and build the engine; two lanes when `ask_driver` is given"""
+    _open_trade_page(driver, vic_url, ticker)
+    gateway = build_order_gateway(driver, vic_url, ticker)
+
+    lanes = None
+    if ask_driver is not None:
+        _open_trade_page(ask_driver, vic_url, ticker)
+        # both lanes time into the engine's one recorder
+        ask_gateway = build_order_gateway(
+            ask_driver, vic_url, ticker, latency=gateway.latency
+        )
+        lanes = {
+            "bid": SideLane(driver, gateway),
+            "ask": SideLane(ask_driver, ask_gateway),
+        }
+
+    return DualSideMMEngine(
+        driver=driver,
+        cfg=cfg,
+        ticker=ticker,
+        gateway=gateway,
+        prices=prices,
+        lanes=lanes,
+    )
@@ -5,10 +5,9 @@ import random
 import time
 import re
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from dataclasses import dataclass
-from typing import Literal, List, Optional
+from typing import Dict, Literal, List, Optional
 from selenium.common.exceptions import (
     StaleElementReferenceException,
     WebDriverException,
@@ -27,22 +26,32 @@ from config import (
     MM_TOAST_WAIT_SEC,
     FLAG_REMOVE_EXCESS_ORDERS_ENABLE,
     FLAG_ADJUSTMENT_ENABLE,
+    FLAG_VIC_ORDERBOOK_MIRROR_ENABLE,
+    FLAG_KILL_SWITCH_ENABLE,
     ANCHOR_ORDER_BUDGET_RATIO,
     MIN_ORDER_USDT,
     MM_DISTRIBUTION_MODE,  # NEW: "EQUAL" or "PYRAMID"
+    MM_ORDER_RECONCILE_INTERVAL_SEC,
 )
 from modes.utils_driver import init_driver
-from modes.mm.vic_account_balance import (
-    get_available_buy_usdt,
-    get_available_sell_qty,
-)
-from modes.mm.vic_trade import place_limit_order
+from modes.utils_wait import format_wait_report, wait_until
+from modes.mm.vic_account_balance import BalanceProvider
+from modes.mm.vic_gateway import OrderGateway, UIOrderGateway, build_order_gateway
+from modes.mm.kill_switch import Target, flatten_engine, install_signal_handlers
+from modes.mm.vic_orderbook import OrderbookMirror, read_orderbook_js
+from modes.mm.vic_network import network_capture_for
 from modes.mm.vic_orders import (
-    read_open_orders_side,
-    cancel_open_orders_row,
+    OrderRow,
+    read_open_orders_at,
     cancel_all_open_orders,
 )
-from modes.market_data import get_binance_price
+from modes.mm.order_state import OrderBookState, TrackedOrder, role_from_label
+from modes.market_data import (
+    PricePrefetcher,
+    StalePriceError,
+    get_binance_price,
+    get_price_prefetcher,
+)
 from modes.utils_logging import setup_logger
 from modes.utils_ui import validate_login_or_exit
 
@@ -65,6 +74,7 @@ class EngineConfig:
     min_order_usdt: float
     fixed_amount: Optional[float] = None  # NEW: Fixed USDT amount
     distribution_mode: str = "EQUAL"  # NEW: "EQUAL" or "PYRAMID"
+    order_reconcile_interval_sec: float = 30.0
 
 
 @dataclass
@@ -88,6 +98,7 @@ def _build_cfg(fixed_amount: Optional[float] = None) -> EngineConfig:
         min_order_usdt=MIN_ORDER_USDT,
         fixed_amount=fixed_amount,
         distribution_mode=MM_DISTRIBUTION_MODE,
+        order_reconcile_interval_sec=MM_ORDER_RECONCILE_INTERVAL_SEC,
     )
 
 
@@ -148,11 +159,33 @@ def _vic_trade_url(vic_url: str, ticker: str) -> str:
     return f"{vic_url}/trade?code=USDT-{ticker.upper()}"
 
 
-def read_orderbook(driver, side: Side, timeout: int = 5) -> List[OrderbookLevel]:
+def read_orderbook(
+    driver, side: Side, timeout: int = 5, mirror: Optional[OrderbookMirror] = None
+) -> List[OrderbookLevel]:
+    capture = network_capture_for(driver)
+    if capture is not None:
+        captured = capture.state.orderbook(side)
+        if captured is not None:
+            return [OrderbookLevel(price=p, qty=q) for p, q in captured]
+
+    if mirror is not None:
+        # only the rows changed since the last read cross the wire
+        mirrored = mirror.read(side)
+        if mirrored is not None:
+            return [OrderbookLevel(price=p, qty=q) for p, q in mirrored]
+
+    fast = read_orderbook_js(driver, side)
+    if fast is not None:
+        return [OrderbookLevel(price=p, qty=q) for p, q in fast]
+
+    # fallback: per-element reads
     container_id = "order-box-ask" if side == "ask" else "order-box-bid"
     try:
-        container = WebDriverWait(driver, timeout).until(
-            EC.presence_of_element_located((By.ID, container_id))
+        container = wait_until(
+            driver,
+            EC.presence_of_element_located((By.ID, container_id)),
+            timeout,
+            "orderbook.container",
         )
         rows = container.find_elements(By.CSS_SELECTOR, "a.bidding-table-rows")
 
@@ -174,9 +207,20 @@ def read_orderbook(driver, side: Side, timeout: int = 5) -> List[OrderbookLevel]
 
 
 class FollowMMEngine:
-    def __init__(self, driver, side: Side, cfg: EngineConfig, ticker: str):
+    def __init__(
+        self,
+        driver,
+        side: Side,
+        cfg: EngineConfig,
+        ticker: str,
+        gateway: Optional[OrderGateway] = None,
+        prices: Optional[PricePrefetcher] = None,
+    ):
         self.logger = setup_logger(side, ticker)
         self.driver = driver
+        self.gateway = gateway or UIOrderGateway(driver)
+        # this engine's order timings only, also under the supervisor
+        self.latency = self.gateway.latency
         self.side = side
         self.cfg = cfg
         self.ticker = ticker.upper()
@@ -188,12 +232,27 @@ class FollowMMEngine:
         self._last_refill_ts = 0.0
         self._rebalance_lock = False
 
+        # orderbook mirror per driver (page), installed on first read
+        self._mirrors: Dict[int, OrderbookMirror] = {}
+
+        # our own orders; the open-orders table is only re-read to reconcile
+        self.orders = OrderBookState(cfg.order_reconcile_interval_sec)
+
+        # free USDT/coin, cached and updated from our own orders
+        self.balances = BalanceProvider(driver, self.ticker)
+
+        # reference price comes from the shared background prefetcher
+        self._symbol = f"{self.ticker}USDT"
+        self.prices = prices or get_price_prefetcher()
+        self.prices.add(self._symbol)
+
         # NEW: Log fixed amount mode and distribution mode
         if cfg.fixed_amount is not None:
             self.logger.info(
                 f"{self.ticker} [FIXED AMOUNT MODE] Using {cfg.fixed_amount:.2f} USDT per trade"
             )
         self.logger.info(f"{self.ticker} [DISTRIBUTION MODE] {cfg.distribution_mode}")
+        self.logger.info(f"{self.ticker} [ORDER GATEWAY] {self.gateway.name}")
 
     def _validate_initial_balance(self):
         """
@@ -205,7 +264,7 @@ class FollowMMEngine:
 
         try:
             if self.side == "bid":
-                available = get_available_buy_usdt(self.driver)
+                available = self.balances.usdt()
 
                 if available <= 0:
                     self.logger.critical(
@@ -238,7 +297,7 @@ class FollowMMEngine:
                     )
 
             else:  # ask side - need to check coin value in USDT
-                available_coin = get_available_sell_qty(self.driver)
+                available_coin = self.balances.coin()
 
                 if available_coin <= 0:
                     self.logger.critical(
@@ -291,6 +350,7 @@ class FollowMMEngine:
         max_attempts = 3
         for attempt in range(max_attempts):
             success, total = cancel_all_open_orders(self.driver)
+            self.balances.invalidate()
             self.logger.info(
                 f"{self.ticker} [Cleanup attempt {attempt+1}]: "
                 f"{success}/{total} orders cancelled."
@@ -323,6 +383,15 @@ class FollowMMEngine:
         )
 
     def run_mm(self):
+        if not self.start():
+            return
+
+        while True:
+            self.tick()
+            time.sleep(0.5)
+
+    def start(self) -> bool:
+        """Clean start and first full rebalance. False when the start is unsafe."""
 
         # compare: balance with fixed_amount
         self._validate_initial_balance()
@@ -330,38 +399,61 @@ class FollowMMEngine:
         # cancel: open orders
         self._ensure_clean_start()
 
-        bid_orders = read_open_orders_side(self.driver, "bid")
-        ask_orders = read_open_orders_side(self.driver, "ask")
+        rows = self._sync_order_state()
+        bid_orders = [r for r in rows if r.side == "bid"]
+        ask_orders = [r for r in rows if r.side == "ask"]
 
         if bid_orders or ask_orders:
             self.logger.error(
                 f"⚠️ CRITICAL: Orders still exist after cleanup! "
                 f"BID: {len(bid_orders)}, ASK: {len(ask_orders)}"
             )
-            return
+            return False
 
         # init: bait -> anchor -> ladder
-        self.full_rebalance()
+        if not self.prices.wait_ready(self._symbol, timeout=30):
+            self.logger.warning(f"{self.ticker} No fresh reference price yet")
+        with self.balances.rebalance():
+            self.full_rebalance()
+        return True
 
-        while True:
-            now = _now()
+    def next_due_ts(self) -> float:
+        """When tick() next has UI work to do."""
+        return min(
+            self._last_rebalance_ts + self.cfg.rebalance_interval_sec,
+            self._last_refill_ts + self.cfg.refill_interval_sec,
+        )
+
+    def tick(self) -> bool:
+        """One pass of the main loop; True when it did rebalance/refill work."""
+        now = _now()
 
+        # never quote on a stale reference price
+        if not self.prices.is_fresh(self._symbol):
+            return False
+
+        worked = False
+        with self.balances.rebalance():
             if now - self._last_rebalance_ts >= self.cfg.rebalance_interval_sec:
                 self._sync_with_binance()
+                worked = True
 
             if (not self._rebalance_lock) and (
                 now - self._last_refill_ts >= self.cfg.refill_interval_sec
             ):
                 self._refill_missing_orders()
+                worked = True
 
-            time.sleep(0.5)
+        return worked
 
     # ... (keep full_rebalance, _set_current_price_and_anchor, etc. mostly unchanged)
     def full_rebalance(self):
         self._rebalance_lock = True
         try:
-            symbol = f"{self.ticker.upper()}USDT"
-            self._anchor_price = get_binance_price(symbol)
+            price = self._reference_price()
+            if price is None:
+                return
+            self._anchor_price = price
 
             if FLAG_ADJUSTMENT_ENABLE:
                 self._price_adjustment = (
@@ -384,6 +476,9 @@ class FollowMMEngine:
             self._last_rebalance_ts = _now()
             self._prev_anchor_price = self._anchor_price
 
+            # bait/sweep fill against each other; pick that up on the next read
+            self.orders.mark_dirty("post-rebalance fills")
+
         finally:
             self._rebalance_lock = False
 
@@ -423,6 +518,11 @@ class FollowMMEngine:
         )
         if not self._retry_order(my_side, target_price, total_sweep_qty, "SWEEP"):
             return
+        # the sweep takes our own bait and the blocking orders; any part that
+        # did not fill is picked up by the re-read after this rebalance
+        self.balances.on_filled(opp_side, target_price, bait_qty)
+        self.balances.on_filled(my_side, target_price, total_sweep_qty)
+        self.balances.invalidate()
 
         self._place_anchor_order(my_side, target_price, is_bid)
         self.logger.info(f"{self.ticker} ✅ Setup complete at {target_price:.3f}")
@@ -430,7 +530,8 @@ class FollowMMEngine:
     def _retry_order(self, side, price, qty, label, max_retries=3):
         for i in range(max_retries):
             try:
-                success = place_limit_order(self.driver, side, price, qty)
+                success = self.gateway.place_limit_order(side, price, qty)
+                self._record_place(success, side, price, qty, role_from_label(label))
                 if success:
                     _sleep_tiny()
                     self.logger.info(
@@ -444,6 +545,8 @@ class FollowMMEngine:
                     if i < max_retries - 1:
                         time.sleep(1)
             except Exception as e:
+                self.orders.mark_dirty(f"{label} order error")
+                self.balances.on_placed(side, price, qty, confirmed=False)
                 self.logger.warning(
                     f"⚠️ {label} order FAILED ({i+1}/{max_retries}): {e}"
                 )
@@ -453,7 +556,9 @@ class FollowMMEngine:
         return False
 
     def _get_blocking_orders(self, side, target_price, is_bid):
-        orders = read_orderbook(self.driver, side)
+        orders = read_orderbook(
+            self.driver, side, mirror=self._orderbook_mirror(self.driver)
+        )
         if is_bid:
             blocking = [o for o in orders if o.price < target_price]
         else:
@@ -472,9 +577,7 @@ class FollowMMEngine:
                 if self.cfg.fixed_amount is not None:
                     avail = self.cfg.fixed_amount
                 else:
-                    avail = (
-                        get_available_buy_usdt(self.driver) * self.cfg.buy_budget_ratio
-                    )
+                    avail = self.balances.usdt() * self.cfg.buy_budget_ratio
 
                 needed = qty * price
                 if needed > avail:
@@ -483,7 +586,7 @@ class FollowMMEngine:
                     )
                     return False
             else:
-                avail = get_available_sell_qty(self.driver) * self.cfg.sell_qty_ratio
+                avail = self.balances.coin() * self.cfg.sell_qty_ratio
                 if qty > avail:
                     self.logger.error(
                         f"[INSUFFICIENT QTY] Need: {qty:.8f}, Avail: {avail:.8f}"
@@ -502,14 +605,14 @@ class FollowMMEngine:
                     usdt = self.cfg.fixed_amount * self.cfg.anchor_order_budget_ratio
                 else:
                     usdt = (
-                        get_available_buy_usdt(self.driver)
+                        self.balances.usdt()
                         * self.cfg.buy_budget_ratio
                         * self.cfg.anchor_order_budget_ratio
                     )
                 qty = _normalize_qty(usdt / price)
             else:
                 qty = _normalize_qty(
-                    get_available_sell_qty(self.driver)
+                    self.balances.coin()
                     * self.cfg.sell_qty_ratio
                     * self.cfg.anchor_order_budget_ratio
                 )
@@ -526,12 +629,8 @@ class FollowMMEngine:
 
     # ... (keep _sync_with_binance, _refill_orderbook_only, etc.)
     def _sync_with_binance(self):
-        symbol = f"{self.ticker.upper()}USDT"
-
-        try:
-            new_price = get_binance_price(symbol)
-        except Exception as e:
-            self.logger.error(f"Failed to fetch Binance price: {e}")
+        new_price = self._reference_price()
+        if new_price is None:
             return
 
         if self._prev_anchor_price is None:
@@ -542,7 +641,7 @@ class FollowMMEngine:
         price_change_percent = (price_change / self._prev_anchor_price) * 100
 
         try:
-            rows = read_open_orders_side(self.driver, self.side)
+            rows = self._open_orders(self.side)
             orderbook_empty = len(rows) == 0
         except Exception as e:
             self.logger.error(f"Failed to read orderbook: {e}")
@@ -611,7 +710,7 @@ class FollowMMEngine:
         self._last_refill_ts = _now()
 
     def _refill_ladder_to_target(self):
-        rows = read_open_orders_side(self.driver, self.side)
+        rows = self._open_orders(self.side)
 
         if len(rows) > self.cfg.levels:
             if FLAG_REMOVE_EXCESS_ORDERS_ENABLE:
@@ -699,7 +798,7 @@ class FollowMMEngine:
                     )
                 else:
                     usdt = (
-                        get_available_buy_usdt(self.driver)
+                        self.balances.usdt()
                         * self.cfg.buy_budget_ratio
                         * (1 - self.cfg.anchor_order_budget_ratio)
                     )
@@ -709,6 +808,7 @@ class FollowMMEngine:
 
             # NEW: Use distribution mode from config
             weights = _get_weights(len(prices), self.cfg.distribution_mode)
+            batch = []
 
             for price, w in zip(prices, weights):
                 budget = usdt * w
@@ -720,26 +820,15 @@ class FollowMMEngine:
                     f"{self.ticker} [LADDER] {self.side.upper()} "
                     f"price={price:.3f} qty={qty:.8f} ≈{usdt_value:,.0f}usdt ({self.cfg.distribution_mode})"
                 )
-                try:
-                    success = place_limit_order(self.driver, "bid", price, qty)
-                    _sleep_tiny()
-                    if success:
-                        self.logger.info(f"✅ LADDER order SUCCESS at {price:.3f}")
-                    else:
-                        self.logger.error(
-                            f"❌ LADDER order FAILED at {price:.3f}: Order function returned False"
-                        )
-                except Exception as e:
-                    self.logger.error(f"❌ LADDER order FAILED at {price:.3f}: {e}")
-                    continue
+                batch.append(("bid", price, qty))
         else:
             try:
                 # For ask side - calculate remaining coin quantity
                 if available_budget is not None:
                     # This is a refill - need to calculate remaining coin from existing orders
-                    rows = read_open_orders_side(self.driver, "ask")
+                    rows = self._open_orders("ask")
                     total_coin = (
-                        get_available_sell_qty(self.driver)
+                        self.balances.coin()
                         * self.cfg.sell_qty_ratio
                         * (1 - self.cfg.anchor_order_budget_ratio)
                     )
@@ -752,7 +841,7 @@ class FollowMMEngine:
                     )
                 else:
                     coin = (
-                        get_available_sell_qty(self.driver)
+                        self.balances.coin()
                         * self.cfg.sell_qty_ratio
                         * (1 - self.cfg.anchor_order_budget_ratio)
                     )
@@ -762,6 +851,7 @@ class FollowMMEngine:
 
             # NEW: Use distribution mode from config
             weights = _get_weights(len(prices), self.cfg.distribution_mode)
+            batch = []
 
             for price, w in zip(prices, weights):
                 qty = _normalize_qty(coin * w)
@@ -772,22 +862,39 @@ class FollowMMEngine:
                     f"{self.ticker} [LADDER] {self.side.upper()} "
                     f"price={price:.3f} qty={qty:.8f} ≈{usdt_value:,.0f}usdt ({self.cfg.distribution_mode})"
                 )
-                try:
-                    success = place_limit_order(self.driver, "ask", price, qty)
-                    _sleep_tiny()
-                    if success:
-                        self.logger.info(f"✅ LADDER order SUCCESS at {price:.3f}")
-                    else:
-                        self.logger.error(
-                            f"❌ LADDER order FAILED at {price:.3f}: Order function returned False"
-                        )
-                except Exception as e:
-                    self.logger.error(f"❌ LADDER order FAILED at {price:.3f}: {e}")
-                    continue
+                batch.append(("ask", price, qty))
+
+        self._place_ladder_batch(batch)
+
+    def _place_ladder_batch(self, batch: List[tuple]):
+        """Place collected ladder levels through the gateway in one batch."""
+        if not batch:
+            return
+
+        try:
+            results = self.gateway.place_limit_orders(batch)
+        except Exception as e:
+            self.orders.mark_dirty("ladder order error")
+            for side, price, qty in batch:
+                self.balances.on_placed(side, price, qty, confirmed=False)
+            self.logger.error(f"❌ LADDER batch FAILED: {e}")
+            return
+
+        for (side, price, qty), success in zip(batch, results):
+            self._record_place(success, side, price, qty, "ladder")
+            if success:
+                self.logger.info(f"✅ LADDER order SUCCESS at {price:.3f}")
+            else:
+                self.logger.error(
+                    f"❌ LADDER order FAILED at {price:.3f}: Order function returned False"
+                )
 
     def _remove_excess_orders(self):
-        rows = read_open_orders_side(self.driver, self.side)
+        if len(self._open_orders(self.side)) <= self.cfg.levels:
+            return
 
+        # about to act: take the live rows from the table
+        rows = [r for r in self._sync_order_state() if r.side == self.side]
         if len(rows) <= self.cfg.levels:
             return
 
@@ -800,17 +907,85 @@ class FollowMMEngine:
             cancel = rows_sorted[self.cfg.levels :]
             cancel = sorted(cancel, key=lambda r: r.price)
 
-        ops = 0
-        for row in cancel:
-            if ops >= self.cfg.max_cancel_ops_per_cycle:
-                break
-            try:
-                cancel_open_orders_row(
-                    self.driver, row, timeout=self.cfg.cancel_row_timeout_sec
+        cancel = cancel[: self.cfg.max_cancel_ops_per_cycle]
+        try:
+            results = self.gateway.cancel_orders(
+                cancel, timeout=self.cfg.cancel_row_timeout_sec
+            )
+        except (StaleElementReferenceException, WebDriverException):
+            self.orders.mark_dirty("cancel failed")
+            return
+        for row, ok in zip(cancel, results):
+            if ok:
+                self.orders.record_cancelled(row.order_id)
+                self.balances.on_cancelled(
+                    row.side, row.price, row.pending_qty or row.qty
                 )
-                ops += 1
-            except (StaleElementReferenceException, WebDriverException):
-                continue
+            elif ok is None:
+                # gone before our cancel: it may have filled, so re-read funds
+                self.orders.mark_dirty("order gone before cancel")
+                self.balances.invalidate()
+            else:
+                self.orders.mark_dirty("cancel failed")
+
+    def _orderbook_mirror(self, driver) -> Optional[OrderbookMirror]:
+        if not FLAG_VIC_ORDERBOOK_MIRROR_ENABLE:
+            return None
+        mirror = self._mirrors.get(id(driver))
+        if mirror is None:
+            mirror = self._mirrors[id(driver)] = OrderbookMirror(driver)
+        return mirror
+
+    def _reference_price(self) -> Optional[float]:
+        """Latest prefetched reference price, or None (refuse to quote) when stale."""
+        try:
+            return self.prices.get(self._symbol)
+        except StalePriceError as e:
+            self.logger.warning(f"{self.ticker} [STALE PRICE] {e} → not quoting")
+            return None
+
+    def _record_place(self, success: bool, side: Side, price: float, qty: float, role):
+        if success:
+            self.orders.record_placed(side, price, qty, role)
+            self.balances.on_placed(side, price, qty)
+        else:
+            # the order may still have gone through
+            self.orders.mark_dirty(f"{role} order not confirmed")
+            self.balances.on_placed(side, price, qty, confirmed=False)
+
+    def _sync_order_state(self) -> List[OrderRow]:
+        """Read the open-orders table and reconcile the local order book with it."""
+        rows, read_ts = read_open_orders_at(self.driver)
+        summary = self.orders.reconcile(rows, read_ts=read_ts)
+        if any(summary.values()):
+            self.logger.info(f"{self.ticker} [ORDER STATE] reconciled {summary}")
+        if summary["closed"] or summary["dropped"]:
+            # filled or cancelled elsewhere; either way the balances moved
+            self.balances.invalidate()
+        return rows
+
+    def _open_orders(self, side: Optional[Side] = None) -> List[TrackedOrder]:
+        """Our open orders from memory; reconciles first when due or diverged."""
+        if self.orders.needs_reconcile(_now()):
+            self._sync_order_state()
+        return self.orders.open_orders(side)
+
+    def close(self):
+        """Nothing to release; the driver belongs to the caller."""
+
+    def kill_switch_targets(self) -> List[Target]:
+        """(label, driver, gateway, sides) of every page this engine quotes on."""
+        return [
+            (f"{self.ticker} {self.side.upper()}", self.driver, self.gateway, (self.side,))
+        ]
+
+    def latency_report(self) -> Dict[str, Dict[str, Dict[str, Dict[str, float]]]]:
+        """p50/p95/p99 per op, side and stage (ms) for orders placed so far."""
+        return self.latency.summary()
+
+    def log_latency_report(self):
+        self.logger.info(f"{self.ticker} order latency:\n{self.latency.format_report()}")
+        self.logger.info(f"{self.ticker} wait time per call site:\n{format_wait_report()}")
 
     def _calculate_orderbook_levels(self) -> List[float]:
         assert self._anchor_price is not None
@@ -833,18 +1008,32 @@ class FollowMMEngine:
 
 
 # MODIFIED: Update function signatures to accept fixed_amount
-def run_follow_mm_bid(vic_url: str, ticker: str, fixed_amount: Optional[float] = None):
+def run_follow_mm_bid(
+    vic_url: str, ticker: str, fixed_amount: Optional[float] = None, driver=None
+):
     cfg = _build_cfg(fixed_amount=fixed_amount)
-    driver = init_driver()
+    install_signal_handlers()
+    owns_driver = driver is None
+    if owns_driver:
+        driver = init_driver()
+    engine = None
 
     try:
-        driver.get(f"{vic_url}/account/login")
-        validate_login_or_exit(driver=driver, mode=3)
+        if owns_driver:
+            driver.get(f"{vic_url}/account/login")
+            validate_login_or_exit(driver=driver, mode=3)
         driver.get(_vic_trade_url(vic_url, ticker))
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.ID, "user_base_trans"))
+        wait_until(
+            driver,
+            EC.presence_of_element_located((By.ID, "user_base_trans")),
+            20,
+            "page.load",
         )
-        FollowMMEngine(driver=driver, side="bid", cfg=cfg, ticker=ticker).run_mm()
+        gateway = build_order_gateway(driver, vic_url, ticker)
+        engine = FollowMMEngine(
+            driver=driver, side="bid", cfg=cfg, ticker=ticker, gateway=gateway
+        )
+        engine.run_mm()
 
     except KeyboardInterrupt:
         print("\n[INFO] Follow MM BID stopped by user (KeyboardInterrupt)")
@@ -854,25 +1043,44 @@ def run_follow_mm_bid(vic_url: str, ticker: str, fixed_amount: Optional[float] =
 
         traceback.print_exc()
     finally:
-        try:
-            driver.quit()
-        except (WebDriverException, Exception) as e:
-            print(f"[WARNING] Error during driver cleanup: {e}")
-        print("[INFO] Driver shutdown complete.")
+        if engine is not None:
+            if FLAG_KILL_SWITCH_ENABLE:
+                flatten_engine(engine)
+            engine.log_latency_report()
+        if owns_driver:
+            try:
+                driver.quit()
+            except (WebDriverException, Exception) as e:
+                print(f"[WARNING] Error during driver cleanup: {e}")
+            print("[INFO] Driver shutdown complete.")
 
 
-def run_follow_mm_ask(vic_url: str, ticker: str, fixed_amount: Optional[float] = None):
+def run_follow_mm_ask(
+    vic_url: str, ticker: str, fixed_amount: Optional[float] = None, driver=None
+):
     cfg = _build_cfg(fixed_amount=fixed_amount)
-    driver = init_driver()
+    install_signal_handlers()
+    owns_driver = driver is None
+    if owns_driver:
+        driver = init_driver()
+    engine = None
 
     try:
-        driver.get(f"{vic_url}/account/login")
-        validate_login_or_exit(driver=driver, mode=4)
+        if owns_driver:
+            driver.get(f"{vic_url}/account/login")
+            validate_login_or_exit(driver=driver, mode=4)
         driver.get(_vic_trade_url(vic_url, ticker))
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.ID, "user_base_coin"))
+        wait_until(
+            driver,
+            EC.presence_of_element_located((By.ID, "user_base_coin")),
+            20,
+            "page.load",
+        )
+        gateway = build_order_gateway(driver, vic_url, ticker)
+        engine = FollowMMEngine(
+            driver=driver, side="ask", cfg=cfg, ticker=ticker, gateway=gateway
         )
-        FollowMMEngine(driver=driver, side="ask", cfg=cfg, ticker=ticker).run_mm()
+        engine.run_mm()
 
     except KeyboardInterrupt:
         print("\n[INFO] Follow MM ASK stopped by user (KeyboardInterrupt)")
@@ -882,8 +1090,13 @@ def run_follow_mm_ask(vic_url: str, ticker: str, fixed_amount: Optional[float] =
 
         traceback.print_exc()
     finally:
-        try:
-            driver.quit()
-        except (WebDriverException, Exception) as e:
-            print(f"[WARNING] Error during driver cleanup: {e}")
-        print("[INFO] Driver shutdown complete.")
+        if engine is not None:
+            if FLAG_KILL_SWITCH_ENABLE:
+                flatten_engine(engine)
+            engine.log_latency_report()
+        if owns_driver:
+            try:
+                driver.quit()
+            except (WebDriverException, Exception) as e:
+                print(f"[WARNING] Error during driver cleanup: {e}")
+            print("[INFO] Driver shutdown complete.")
@@ -0,0 +1,196 @@
+# order_state.py
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Literal, Optional, Sequence
+
+from modes.mm.vic_orders import OrderRow
+
+Side = Literal["bid", "ask"]
+Role = Literal["bait", "sweep", "anchor", "ladder", "external"]
+Status = Literal["pending", "open", "cancelled", "closed"]
+
+# Roles that usually rest on the book; a new row goes to one of these before
+# a bait/sweep of the same side, price and qty (those mostly fill at once).
+_RESTING_ROLES = ("anchor", "ladder", "external")
+
+
+@dataclass
+class TrackedOrder:
+    order_id: str  # exchange id, or "local-N" until seen in the table
+    side: Side
+    price: float
+    qty: float
+    role: Role
+    status: Status
+    created_ts: float
+
+    @property
+    def is_live(self) -> bool:
+        return self.status in ("pending", "open")
+
+
+class OrderBookState:
+    """
+    Local book of our own orders, keyed by order id.
+
+    Updated from place/cancel results and reconciled against the open-orders
+    table every `reconcile_interval_sec`, or sooner after mark_dirty().
+    """
+
+    def __init__(
+        self,
+        reconcile_interval_sec: float,
+        price_tolerance_ratio: float = 1e-6,
+        qty_tolerance_ratio: float = 1e-3,
+    ):
+        self.reconcile_interval_sec = reconcile_interval_sec
+        self.price_tolerance_ratio = price_tolerance_ratio
+        self.qty_tolerance_ratio = qty_tolerance_ratio
+
+        self._orders: Dict[str, TrackedOrder] = {}
+        self._local_ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self._last_reconcile_ts = 0.0
+        self._dirty_reason: Optional[str] = "initial"
+
+    # updates from our own actions
+    def record_placed(self, side: Side, price: float, qty: float, role: Role) -> TrackedOrder:
+        with self._lock:
+            order = TrackedOrder(
+                order_id=f"local-{next(self._local_ids)}",
+                side=side,
+                price=price,
+                qty=qty,
+                role=role,
+                status="pending",
+                created_ts=time.time(),
+            )
+            self._orders[order.order_id] = order
+            return order
+
+    def record_cancelled(self, order_id: str):
+        with self._lock:
+            order = self._orders.get(order_id)
+            if order is not None:
+                order.status = "cancelled"
+
+    def mark_dirty(self, reason: str):
+        """Force a table reconcile on the next read (failed or uncertain action)."""
+        with self._lock:
+            if self._dirty_reason is None:
+                self._dirty_reason = reason
+
+    # reads
+    def needs_reconcile(self, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        with self._lock:
+            if self._dirty_reason is not None:
+                return True
+            return now - self._last_reconcile_ts >= self.reconcile_interval_sec
+
+    def open_orders(self, side: Optional[Side] = None) -> List[TrackedOrder]:
+        with self._lock:
+            return [
+                o
+                for o in self._orders.values()
+                if o.is_live and (side is None or o.side == side)
+            ]
+
+    def get(self, order_id: str) -> Optional[TrackedOrder]:
+        with self._lock:
+            return self._orders.get(order_id)
+
+    # reconcile against the DOM
+    def _price_match(self, a: float, b: float) -> bool:
+        return abs(a - b) <= abs(b) * self.price_tolerance_ratio
+
+    def _matches(self, order: TrackedOrder, row: OrderRow) -> bool:
+        if order.side != row.side or not self._price_match(order.price, row.price):
+            return False
+        # qty 0 means the table cell did not parse; match on price alone then
+        return not row.qty or abs(order.qty - row.qty) <= row.qty * self.qty_tolerance_ratio
+
+    def reconcile(
+        self, rows: Sequence[OrderRow], read_ts: Optional[float] = None
+    ) -> Dict[str, int]:
+        """
+        Bring the local book in line with the open-orders table.
+
+        `read_ts` is when the table read started (default: now). A pending
+        order placed before it that has no row is gone (filled at once, as
+        bait/sweep usually are). Returns counts of adopted / closed /
+        external / dropped orders for logging.
+        """
+        now = time.time()
+        read_ts = now if read_ts is None else read_ts
+        summary = {"adopted": 0, "closed": 0, "external": 0, "dropped": 0}
+
+        with self._lock:
+            seen_ids = {r.order_id for r in rows}
+
+            # orders we knew by id but that left the table: filled or cancelled elsewhere
+            for order in self._orders.values():
+                if order.status == "open" and order.order_id not in seen_ids:
+                    order.status = "closed"
+                    summary["closed"] += 1
+
+            unknown_rows = [r for r in rows if r.order_id not in self._orders]
+            pending = [o for o in self._orders.values() if o.status == "pending"]
+
+            # give pending local orders the exchange id of a matching new row;
+            # resting roles first, then the oldest
+            pending.sort(key=lambda o: (o.role not in _RESTING_ROLES, o.created_ts))
+            for row in list(unknown_rows):
+                match = next((o for o in pending if self._matches(o, row)), None)
+                if match is None:
+                    continue
+
+                pending.remove(match)
+                unknown_rows.remove(row)
+                del self._orders[match.order_id]
+                match.order_id = row.order_id
+                match.status = "open"
+                if row.qty:
+                    match.qty = row.qty
+                self._orders[match.order_id] = match
+                summary["adopted"] += 1
+
+            for order in pending:
+                if order.created_ts < read_ts:
+                    order.status = "closed"
+                    summary["dropped"] += 1
+
+            for row in unknown_rows:
+                self._orders[row.order_id] = TrackedOrder(
+                    order_id=row.order_id,
+                    side=row.side,
+                    price=row.price,
+                    qty=row.qty,
+                    role="external",
+                    status="open",
+                    created_ts=now,
+                )
+                summary["external"] += 1
+
+            # forget finished orders so the book does not grow forever
+            for order_id in [
+                oid for oid, o in self._orders.items() if not o.is_live
+            ]:
+                del self._orders[order_id]
+
+            self._last_reconcile_ts = now
+            self._dirty_reason = None
+
+        return summary
+
+
+def role_from_label(label: str) -> Role:
+    """'BAIT', 'SWEEP-BID', 'ANCHOR-ASK' → 'bait' / 'sweep' / 'anchor'."""
+    head = label.split("-")[0].strip().lower()
+    if head in ("bait", "sweep", "anchor", "ladder"):
+        return head
+    return "ladder"
@@ -0,0 +1,442 @@
+# supervisor.py
+"""
+Run many MM engines (one per market) from one process.
+
+- one reference price feed: every engine reads the shared PricePrefetcher,
+  which polls all symbols in one batched request (or the Binance stream)
+- a driver pool: each market gets a tab in one of a few logged-in browsers
+  (`tabs_per_driver` tabs per browser), so a market costs a tab, not a Chrome
+- fair UI scheduling: one worker thread per browser round-robins over its
+  tabs and runs one engine tick at a time, only for engines that are due
+- health: per engine state, ticks, tick time, errors and open orders
+- kill switch: a market that fails, and every market on stop, gets its open
+  orders cancelled within KILL_SWITCH_DEADLINE_SEC (modes/mm/kill_switch.py)
+
+A browser drives one tab at a time, so engines on the same browser take
+turns; engines on different browsers run in parallel. Background tabs are
+throttled by Chrome unless the LEAN profile is used.
+"""
+from __future__ import annotations
+
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from config import FLAG_KILL_SWITCH_ENABLE, KILL_SWITCH_DEADLINE_SEC
+from modes.market_data import PricePrefetcher, get_price_prefetcher
+from modes.mm.kill_switch import FlattenReport, flatten_orders
+from modes.utils_wait import wait_until
+
+SUPERVISOR_TABS_PER_DRIVER = 8
+SUPERVISOR_REPORT_INTERVAL_SEC = 60.0
+SUPERVISOR_MAX_CONSECUTIVE_ERRORS = 5
+SUPERVISOR_IDLE_RECHECK_SEC = 0.5  # re-check engines that had nothing to do
+
+
+@dataclass(frozen=True)
+class MarketSpec:
+    mode: str  # "follow-bid", "follow-ask" or "dual"
+    ticker: str
+    fixed_amount: Optional[float] = None  # follow modes
+    bid_amount: Optional[float] = None  # dual mode
+    ask_amount: Optional[float] = None  # dual mode
+
+    @property
+    def name(self) -> str:
+        return f"{self.ticker}:{self.mode}"
+
+
+def build_engine(driver, vic_url: str, spec: MarketSpec, prices=None, ask_driver=None):
+    """
+    Open the market's trade page in the current tab and build its engine.
+    `ask_driver` (dual only) runs the ASK side on its own lane.
+    """
+    if spec.mode == "dual":
+        from modes.mm.mode_binance_dual import _build_dual_cfg, build_dual_engine
+
+        return build_dual_engine(
+            driver,
+            vic_url,
+            spec.ticker,
+            _build_dual_cfg(spec.bid_amount, spec.ask_amount),
+            prices=prices,
+            ask_driver=ask_driver,
+        )
+
+    from modes.mm.vic_gateway import build_order_gateway
+    from modes.mm.mode_binance_follow import FollowMMEngine, _build_cfg
+
+    driver.get(f"{vic_url}/trade?code=USDT-{spec.ticker}")
+    wait_until(
+        driver,
+        EC.presence_of_element_located((By.ID, "user_base_trans")),
+        20,
+        "page.load",
+    )
+    gateway = build_order_gateway(driver, vic_url, spec.ticker)
+
+    return FollowMMEngine(
+        driver=driver,
+        side="bid" if spec.mode == "follow-bid" else "ask",
+        cfg=_build_cfg(fixed_amount=spec.fixed_amount),
+        ticker=spec.ticker,
+        gateway=gateway,
+        prices=prices,
+    )
+
+
+@dataclass
+class EngineHealth:
+    state: str = "pending"  # pending → running; backoff / failed on errors
+    ticks: int = 0
+    work_ticks: int = 0  # ticks that rebalanced or refilled
+    busy_sec: float = 0.0
+    errors: int = 0
+    consecutive_errors: int = 0
+    last_error: str = ""
+    last_ok_ts: Optional[float] = None
+    started_ts: Optional[float] = None
+    tick_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=200))
+
+
+class EngineSlot:
+    """One market: its tab, its engine (once built) and its health."""
+
+    def __init__(self, spec: MarketSpec):
+        self.spec = spec
+        self.engine = None
+        self.started = False  # engine.start() returned True
+        self.handle: Optional[str] = None
+        self.health = EngineHealth()
+        self.due_ts = 0.0
+        self.idle_until = 0.0
+
+    def next_due(self) -> float:
+        if not self.started or self.health.state == "backoff":
+            return self.due_ts
+        return max(self.engine.next_due_ts(), self.idle_until)
+
+
+class DriverLane:
+    """One browser, its tabs and the worker thread that schedules them."""
+
+    def __init__(self, name: str, session, supervisor: "MarketSupervisor"):
+        self.name = name
+        self.session = session
+        self.supervisor = supervisor
+        self.slots: List[EngineSlot] = []
+        self._next = 0
+        self._current_handle: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def open_tabs(self):
+        driver = self.session.driver()
+        for i, slot in enumerate(self.slots):
+            if i > 0:
+                driver.switch_to.new_window("tab")
+            slot.handle = driver.current_window_handle
+        self._current_handle = driver.current_window_handle
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name=f"mm-lane-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def join(self, timeout: float):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _pick(self, now: float) -> Optional[EngineSlot]:
+        """Next due slot after the last one served (round-robin)."""
+        n = len(self.slots)
+        for i in range(n):
+            slot = self.slots[(self._next + i) % n]
+            if slot.health.state != "failed" and slot.next_due() <= now:
+                self._next = (self._next + i + 1) % n
+                return slot
+        return None
+
+    def _run(self):
+        stop = self.supervisor.stop_event
+        while not stop.is_set():
+            now = time.time()
+            slot = self._pick(now)
+            if slot is None:
+                pending = [
+                    s.next_due() for s in self.slots if s.health.state != "failed"
+                ]
+                if not pending:
+                    return
+                stop.wait(min(0.5, max(0.01, min(pending) - now)))
+                continue
+            self._step(slot)
+
+    def _step(self, slot: EngineSlot):
+        driver = self.session.driver()
+        health = slot.health
+        t0 = time.time()
+        try:
+            if self._current_handle != slot.handle:
+                driver.switch_to.window(slot.handle)
+                self._current_handle = slot.handle
+
+            if slot.engine is None:
+                # kept before start(): a start that fails half-way through its
+                # first rebalance leaves orders the kill switch has to find
+                slot.engine = build_engine(
+                    driver,
+                    self.supervisor.vic_url,
+                    slot.spec,
+                    prices=self.supervisor.prices,
+                )
+            if not slot.started:
+                if not slot.engine.start():
+                    # orders survived the clean start → not safe to quote
+                    health.state = "failed"
+                    health.last_error = "orders still open after clean start"
+                    if FLAG_KILL_SWITCH_ENABLE:
+                        deadline = time.time() + KILL_SWITCH_DEADLINE_SEC
+                        self.flatten(slot, deadline, own_only=True)
+                    return
+                slot.started = True
+                health.started_ts = time.time()
+                worked = True
+            else:
+                worked = slot.engine.tick()
+
+        except Exception as e:
+            self._on_error(slot, e)
+            return
+
+        elapsed = time.time() - t0
+        health.state = "running"
+        health.ticks += 1
+        health.busy_sec += elapsed
+        health.tick_ms.append(elapsed * 1000)
+        health.consecutive_errors = 0
+        health.last_ok_ts = time.time()
+        if worked:
+            health.work_ticks += 1
+        else:
+            slot.idle_until = time.time() + SUPERVISOR_IDLE_RECHECK_SEC
+
+    def flatten(
+        self, slot: EngineSlot, deadline: float, own_only: bool = False
+    ) -> List[FlattenReport]:
+        """
+        Kill switch for one market: cancel its open orders in its own tab.
+        `own_only` while other markets keep running: just the ids its engine
+        placed, never a sibling market's orders on the same account.
+        """
+        if slot.engine is None:
+            return []
+        driver = self.session.driver()
+        orders = slot.engine.orders if own_only else None
+        reports = []
+        for label, target, gateway, sides in slot.engine.kill_switch_targets():
+            try:
+                if target is driver and self._current_handle != slot.handle:
+                    driver.switch_to.window(slot.handle)
+                    self._current_handle = slot.handle
+                report = flatten_orders(
+                    target,
+                    gateway,
+                    max(0.0, deadline - time.time()),
+                    label=f"{slot.spec.name} {label}",
+                    sides=sides,
+                    orders=orders,
+                )
+            except Exception as e:
+                report = FlattenReport(
+                    label=slot.spec.name, error=f"{type(e).__name__}: {e}"
+                )
+            print(report.format())
+            reports.append(report)
+        return reports
+
+    def flatten_all(self, deadline: float):
+        for slot in self.slots:
+            self.flatten(slot, deadline)
+
+    def _on_error(self, slot: EngineSlot, e: Exception):
+        health = slot.health
+        health.errors += 1
+        health.consecutive_errors += 1
+        health.last_error = f"{type(e).__name__}: {e}"[:200]
+        print(f"[SUPERVISOR ERROR] {slot.spec.name} {health.last_error}")
+        if not isinstance(e, WebDriverException):
+            traceback.print_exc()
+
+        if slot.engine is not None:
+            slot.engine.orders.mark_dirty("engine error")
+
+        if health.consecutive_errors >= self.supervisor.max_consecutive_errors:
+            health.state = "failed"
+            print(
+                f"[SUPERVISOR ERROR] {slot.spec.name} stopped after "
+                f"{health.consecutive_errors} consecutive errors"
+            )
+            if FLAG_KILL_SWITCH_ENABLE:
+                self.flatten(slot, time.time() + KILL_SWITCH_DEADLINE_SEC, own_only=True)
+            return
+
+        health.state = "backoff"
+        slot.due_ts = time.time() + min(60.0, 2.0 ** health.consecutive_errors)
+
+
+class MarketSupervisor:
+    """
+    Runs `specs` over the browsers in `sessions` (logged-in BrowserSessions,
+    e.g. one per CHROME_USER_DATA_DIR). Markets are spread over the sessions,
+    at most `tabs_per_driver` per browser.
+    """
+
+    def __init__(
+        self,
+        vic_url: str,
+        specs: List[MarketSpec],
+        sessions: list,
+        tabs_per_driver: int = SUPERVISOR_TABS_PER_DRIVER,
+        prices: Optional[PricePrefetcher] = None,
+        report_interval_sec: float = SUPERVISOR_REPORT_INTERVAL_SEC,
+        max_consecutive_errors: int = SUPERVISOR_MAX_CONSECUTIVE_ERRORS,
+    ):
+        if len(specs) > len(sessions) * tabs_per_driver:
+            raise ValueError(
+                f"{len(specs)} markets need more than {len(sessions)} browser(s) "
+                f"x {tabs_per_driver} tabs"
+            )
+        names = [s.name for s in specs]
+        if len(set(names)) != len(names):
+            raise ValueError(f"duplicate markets in {names}")
+
+        self.vic_url = vic_url
+        self.prices = prices or get_price_prefetcher()
+        self.report_interval_sec = report_interval_sec
+        self.max_consecutive_errors = max_consecutive_errors
+        self.stop_event = threading.Event()
+
+        self.slots = [EngineSlot(spec) for spec in specs]
+        self.lanes = [
+            DriverLane(str(i), session, self) for i, session in enumerate(sessions)
+        ]
+        # fill browsers evenly so tabs (and turns) are shared out
+        for i, slot in enumerate(self.slots):
+            self.lanes[i % len(self.lanes)].slots.append(slot)
+        self.lanes = [lane for lane in self.lanes if lane.slots]
+
+        # start polling every symbol before the first engine asks for it
+        for spec in specs:
+            self.prices.add(f"{spec.ticker}USDT")
+
+    def run(self):
+        """Open the tabs, start one worker per browser and report until stopped."""
+        for lane in self.lanes:
+            lane.open_tabs()
+        for lane in self.lanes:
+            lane.start()
+        print(
+            f"[SUPERVISOR] {len(self.slots)} markets on {len(self.lanes)} browser(s): "
+            + ", ".join(s.spec.name for s in self.slots)
+        )
+
+        try:
+            while not self.stop_event.wait(self.report_interval_sec):
+                print(self.format_health_report())
+                if all(s.health.state == "failed" for s in self.slots):
+                    print("[SUPERVISOR ERROR] every market has failed → stopping")
+                    break
+        finally:
+            self.stop()
+
+    def stop(self, timeout: float = 30.0):
+        """
+        Let each worker finish its current tick, then run the kill switch on
+        every market (browsers in parallel, tabs of one browser in turn).
+        A worker still busy after `timeout` owns its driver, so its markets
+        are reported as not flattened instead of racing it on the session.
+        """
+        self.stop_event.set()
+        deadline = time.time() + timeout
+        for lane in self.lanes:
+            lane.join(max(0.0, deadline - time.time()))
+        lanes = []
+        for lane in self.lanes:
+            if lane.is_alive():
+                print(
+                    f"[SUPERVISOR ERROR] browser {lane.name} still busy after "
+                    f"{timeout:.0f}s → NOT flattened: "
+                    + ", ".join(s.spec.name for s in lane.slots)
+                )
+                continue
+            lanes.append(lane)
+            for slot in lane.slots:
+                if slot.engine is not None:
+                    slot.engine.close()
+
+        if not FLAG_KILL_SWITCH_ENABLE:
+            return
+        deadline = time.time() + KILL_SWITCH_DEADLINE_SEC
+        threads = [
+            threading.Thread(
+                target=lane.flatten_all, args=(deadline,), name=f"kill-{lane.name}"
+            )
+            for lane in lanes
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(KILL_SWITCH_DEADLINE_SEC + 10.0)
+
+    def health(self) -> Dict[str, Dict[str, object]]:
+        """Per market: state, throughput and error counters."""
+        now = time.time()
+        report: Dict[str, Dict[str, object]] = {}
+        for slot in self.slots:
+            h = slot.health
+            samples = sorted(h.tick_ms)
+            uptime = now - h.started_ts if h.started_ts else 0.0
+            engine = slot.engine
+            report[slot.spec.name] = {
+                "state": h.state,
+                "ticks": h.ticks,
+                "work_ticks": h.work_ticks,
+                "work_per_min": h.work_ticks * 60.0 / uptime if uptime > 0 else 0.0,
+                "busy_pct": 100.0 * h.busy_sec / uptime if uptime > 0 else 0.0,
+                "tick_p50_ms": samples[len(samples) // 2] if samples else 0.0,
+                "tick_max_ms": samples[-1] if samples else 0.0,
+                "errors": h.errors,
+                "last_error": h.last_error,
+                "last_ok_age": now - h.last_ok_ts if h.last_ok_ts else None,
+                "open_orders": len(engine.orders.open_orders()) if engine else 0,
+                "price_age": self.prices.age(f"{slot.spec.ticker}USDT"),
+            }
+        return report
+
+    def format_health_report(self) -> str:
+        lines = [
+            f"{'market':<18} {'state':<8} {'ticks':>6} {'work/min':>8} {'busy%':>6} "
+            f"{'p50ms':>7} {'maxms':>7} {'errs':>5} {'orders':>6} {'ok_age':>7} {'px_age':>7}"
+        ]
+        for name, h in self.health().items():
+            ok_age = "-" if h["last_ok_age"] is None else f"{h['last_ok_age']:.0f}s"
+            px_age = "-" if h["price_age"] is None else f"{h['price_age']:.1f}s"
+            lines.append(
+                f"{name:<18} {h['state']:<8} {h['ticks']:>6} {h['work_per_min']:>8.1f} "
+                f"{h['busy_pct']:>6.1f} {h['tick_p50_ms']:>7.0f} {h['tick_max_ms']:>7.0f} "
+                f"{h['errors']:>5} {h['open_orders']:>6} {ok_age:>7} {px_age:>7}"
+            )
+            if h["state"] != "running" and h["last_error"]:
+                lines.append(f"{'':<18} └ {h['last_error']}")
+        return "[SUPERVISOR] health\n" + "\n".join(lines)
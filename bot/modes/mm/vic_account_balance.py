@@ -2,9 +2,15 @@
 from __future__ import annotations
 
 import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Set
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from config import BALANCE_CACHE_TTL_SEC
+from modes.utils_wait import wait_until
+from modes.mm.vic_network import network_capture_for
 
 
 def _parse_number(text: str) -> float:
@@ -18,15 +24,168 @@ def _parse_number(text: str) -> float:
     return float(t)
 
 
+def _captured_balance(driver, asset: Optional[str]) -> Optional[float]:
+    if not asset:
+        return None
+    capture = network_capture_for(driver)
+    return capture.state.balance(asset) if capture is not None else None
+
+
 def get_available_buy_usdt(driver, timeout: int = 10) -> float:
-    el = WebDriverWait(driver, timeout).until(
-        EC.presence_of_element_located((By.ID, "user_base_trans"))
+    captured = _captured_balance(driver, "USDT")
+    if captured is not None:
+        return captured
+
+    el = wait_until(
+        driver,
+        EC.presence_of_element_located((By.ID, "user_base_trans")),
+        timeout,
+        "balance.usdt",
     )
     return _parse_number(el.text)
 
 
-def get_available_sell_qty(driver, timeout: int = 10) -> float:
-    el = WebDriverWait(driver, timeout).until(
-        EC.presence_of_element_located((By.ID, "user_base_coin"))
+def get_available_sell_qty(
+    driver, timeout: int = 10, asset: Optional[str] = None
+) -> float:
+    """Free coin balance; `asset` (the ticker) lets the network capture answer"""
+    captured = _captured_balance(driver, asset)
+    if captured is not None:
+        return captured
+
+    el = wait_until(
+        driver,
+        EC.presence_of_element_located((By.ID, "user_base_coin")),
+        timeout,
+        "balance.coin",
     )
     return _parse_number(el.text)
+
+
+class BalanceProvider:
+    """
+    Free USDT and coin balance of one market, read from the page at most
+    once per `ttl_sec` and kept current in between from our own actions:
+
+    - a placed order locks its funds (bid: price x qty USDT, ask: qty coins)
+    - an order that may or may not have gone through (not confirmed, or the
+      place call raised) locks them too and marks the asset stale
+    - a fill we know of credits the other asset (bid: coins, ask: USDT)
+    - a cancel gives the funds back and marks the asset stale
+
+    Anything else the engine cannot account for (fills found on reconcile)
+    marks the asset stale, and the next get() re-reads it. Inside
+    `with rebalance():` an asset is read at most once: a stale mark only
+    takes effect when the scope ends, and the optimistic value is used until
+    then, which is why uncertain orders are deducted rather than ignored.
+
+    `coin_driver` reads the coin balance from another page (two-lane dual).
+    """
+
+    def __init__(
+        self,
+        driver,
+        ticker: str,
+        coin_driver=None,
+        ttl_sec: float = BALANCE_CACHE_TTL_SEC,
+    ):
+        self.ticker = ticker.upper()
+        self.ttl_sec = ttl_sec
+        self._drivers = {"USDT": driver, self.ticker: coin_driver or driver}
+        self._values: Dict[str, float] = {}
+        self._read_ts: Dict[str, float] = {}
+        self._stale: Set[str] = set()
+        self._scope_depth = 0
+        self._scope_reads: Set[str] = set()
+        self._lock = threading.RLock()
+        self.reads = 0  # page reads so far
+
+    def _read(self, asset: str, timeout: int) -> float:
+        driver = self._drivers[asset]
+        if asset == "USDT":
+            return get_available_buy_usdt(driver, timeout=timeout)
+        return get_available_sell_qty(driver, timeout=timeout, asset=asset)
+
+    def _is_fresh(self, asset: str, now: float) -> bool:
+        if asset not in self._values:
+            return False
+        if asset in self._scope_reads:
+            return True
+        return asset not in self._stale and now - self._read_ts[asset] < self.ttl_sec
+
+    def get(self, asset: str, timeout: int = 10) -> float:
+        asset = asset.upper()
+        with self._lock:
+            if self._is_fresh(asset, time.time()):
+                return self._values[asset]
+            value = self._read(asset, timeout)
+            self.reads += 1
+            self._values[asset] = value
+            self._read_ts[asset] = time.time()
+            self._stale.discard(asset)
+            if self._scope_depth:
+                self._scope_reads.add(asset)
+            return value
+
+    def usdt(self, timeout: int = 10) -> float:
+        return self.get("USDT", timeout=timeout)
+
+    def coin(self, timeout: int = 10) -> float:
+        return self.get(self.ticker, timeout=timeout)
+
+    def refresh(self):
+        """Drop everything and read both balances now."""
+        with self._lock:
+            self._values.clear()
+            self._stale.clear()
+            self._scope_reads.clear()
+            self.usdt()
+            self.coin()
+
+    def invalidate(self, asset: Optional[str] = None):
+        """Re-read `asset` (default: both) on the next get()."""
+        with self._lock:
+            if asset is None:
+                self._stale.update(self._drivers)
+            else:
+                self._stale.add(asset.upper())
+
+    def _adjust(self, asset: str, delta: float):
+        if asset in self._values:
+            self._values[asset] = max(0.0, self._values[asset] + delta)
+
+    def on_placed(self, side: str, price: float, qty: float, confirmed: bool = True):
+        """`confirmed=False`: the order may be live; deduct it and re-read later."""
+        with self._lock:
+            asset = "USDT" if side == "bid" else self.ticker
+            self._adjust(asset, -price * qty if side == "bid" else -qty)
+            if not confirmed:
+                self._stale.add(asset)
+
+    def on_filled(self, side: str, price: float, qty: float):
+        """`qty` of our `side` order traded; its locked funds were taken at placement."""
+        with self._lock:
+            if side == "bid":
+                self._adjust(self.ticker, qty)
+            else:
+                self._adjust("USDT", price * qty)
+
+    def on_cancelled(self, side: str, price: float, qty: float):
+        """`qty` is what was still pending; part of it may have filled meanwhile."""
+        with self._lock:
+            asset = "USDT" if side == "bid" else self.ticker
+            self._adjust(asset, price * qty if side == "bid" else qty)
+            self._stale.add(asset)
+
+    @contextmanager
+    def rebalance(self):
+        """One rebalance pass: each asset is read from the page at most once."""
+        with self._lock:
+            self._scope_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._scope_depth -= 1
+                if self._scope_depth == 0:
+                    self._scope_reads.clear()
@@ -0,0 +1,286 @@
+# vic_gateway.py
+from __future__ import annotations
+
+import requests
+from requests.adapters import HTTPAdapter
+from typing import List, Literal, Optional, Sequence, Tuple
+from config import (
+    ORDER_GATEWAY,
+    FLAG_VIC_BATCH_PLACE_ENABLE,
+    FLAG_VIC_BATCH_CANCEL_ENABLE,
+    VIC_ORDER_API_PATH,
+    VIC_CANCEL_API_PATH,
+    FLAG_VIC_TRADE_DEBUGGING_PRINT,
+)
+from modes.mm.vic_trade import (
+    format_price,
+    format_qty,
+    place_limit_order,
+    place_limit_orders_batch,
+)
+from modes.mm.vic_orders import OrderRow, cancel_open_orders_row, cancel_orders_by_id
+from modes.mm.latency import LatencyRecorder
+
+Side = Literal["bid", "ask"]
+
+# Responses that mean "session expired" → re-copy cookies from the browser once
+_AUTH_RETRY_STATUS = (401, 403, 419)
+
+_CSRF_JS = """
+const meta = document.querySelector('meta[name="csrf-token"], meta[name="_csrf"]');
+if (meta) { return meta.getAttribute("content"); }
+const input = document.querySelector('input[name="_token"], input[name="_csrf"]');
+return input ? input.value : null;
+"""
+
+
+class OrderGateway:
+    """
+    Common interface the engines use to place and cancel orders. Timings
+    go to the gateway's `latency` recorder, which the owning engine reports.
+    """
+
+    name = "base"
+    latency: LatencyRecorder
+
+    def place_limit_order(self, side: Side, price: float, qty: float) -> bool:
+        raise NotImplementedError
+
+    def place_limit_orders(
+        self, orders: Sequence[Tuple[Side, float, float]]
+    ) -> List[bool]:
+        """Place [(side, price, qty), ...]; one success flag per order."""
+        return [self.place_limit_order(side, price, qty) for side, price, qty in orders]
+
+    def cancel_order(self, order_row: OrderRow, timeout: int = 15) -> bool:
+        raise NotImplementedError
+
+    def cancel_orders(
+        self, order_rows: Sequence[OrderRow], timeout: int = 15
+    ) -> List[Optional[bool]]:
+        """
+        Cancel several orders; one outcome per row. None means the order left
+        the book without our cancel being confirmed (see cancel_orders_by_id).
+        """
+        return [self.cancel_order(row, timeout=timeout) for row in order_rows]
+
+    def close(self):
+        pass
+
+
+class UIOrderGateway(OrderGateway):
+    """Drives the trade page through Selenium (inputs, buttons, popups)."""
+
+    name = "UI"
+
+    def __init__(
+        self, driver, timeout: int = 15, latency: Optional[LatencyRecorder] = None
+    ):
+        self.driver = driver
+        self.timeout = timeout
+        self.latency = latency if latency is not None else LatencyRecorder()
+
+    def place_limit_order(self, side: Side, price: float, qty: float) -> bool:
+        return place_limit_order(
+            self.driver, side, price, qty, timeout=self.timeout, latency=self.latency
+        )
+
+    def place_limit_orders(
+        self, orders: Sequence[Tuple[Side, float, float]]
+    ) -> List[bool]:
+        if FLAG_VIC_BATCH_PLACE_ENABLE and len(orders) > 1:
+            return place_limit_orders_batch(self.driver, orders, latency=self.latency)
+        return super().place_limit_orders(orders)
+
+    def cancel_order(self, order_row: OrderRow, timeout: int = 15) -> bool:
+        return cancel_open_orders_row(
+            self.driver, order_row, timeout=timeout, latency=self.latency
+        )
+
+    def cancel_orders(
+        self, order_rows: Sequence[OrderRow], timeout: int = 15
+    ) -> List[Optional[bool]]:
+        if FLAG_VIC_BATCH_CANCEL_ENABLE and len(order_rows) > 1:
+            results = cancel_orders_by_id(
+                self.driver,
+                [r.order_id for r in order_rows],
+                popup_timeout=timeout,
+                latency=self.latency,
+            )
+            return [results.get(str(r.order_id), False) for r in order_rows]
+        return super().cancel_orders(order_rows, timeout=timeout)
+
+
+class HttpOrderGateway(OrderGateway):
+    """
+    Calls the exchange's own order/cancel endpoints with a pooled HTTP
+    client, reusing the cookies and CSRF token of the logged-in browser.
+    """
+
+    name = "HTTP"
+
+    def __init__(
+        self,
+        driver,
+        vic_url: str,
+        ticker: str,
+        order_path: str,
+        cancel_path: str,
+        timeout: float = 10.0,
+        pool_size: int = 4,
+        latency: Optional[LatencyRecorder] = None,
+    ):
+        self.driver = driver
+        self.latency = latency if latency is not None else LatencyRecorder()
+        self.vic_url = vic_url.rstrip("/")
+        self.ticker = ticker.upper()
+        self.order_url = f"{self.vic_url}/{order_path.lstrip('/')}"
+        self.cancel_url = f"{self.vic_url}/{cancel_path.lstrip('/')}"
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._csrf_token: Optional[str] = None
+        self.refresh_session()
+
+    def refresh_session(self):
+        """Copy cookies, user agent and CSRF token out of the Selenium driver."""
+        self.session.cookies.clear()
+        for c in self.driver.get_cookies():
+            self.session.cookies.set(
+                c["name"], c["value"], domain=c.get("domain"), path=c.get("path", "/")
+            )
+
+        try:
+            user_agent = self.driver.execute_script("return navigator.userAgent;")
+        except Exception:
+            user_agent = None
+        try:
+            self._csrf_token = self.driver.execute_script(_CSRF_JS)
+        except Exception:
+            self._csrf_token = None
+
+        headers = {
+            "X-Requested-With": "XMLHttpRequest",
+            "Referer": f"{self.vic_url}/trade?code=USDT-{self.ticker}",
+        }
+        if user_agent:
+            headers["User-Agent"] = user_agent
+        if self._csrf_token:
+            headers["X-CSRF-TOKEN"] = self._csrf_token
+        self.session.headers.update(headers)
+
+    def _post(self, url: str, data: dict) -> Optional[dict]:
+        if self._csrf_token:
+            data = {**data, "_token": self._csrf_token}
+
+        for attempt in range(2):
+            try:
+                r = self.session.post(url, data=data, timeout=self.timeout)
+            except requests.RequestException as e:
+                print(f"[GATEWAY ERROR] POST {url} failed: {e}")
+                return None
+
+            if r.status_code in _AUTH_RETRY_STATUS and attempt == 0:
+                if FLAG_VIC_TRADE_DEBUGGING_PRINT:
+                    print(f"[GATEWAY] {r.status_code} from {url}, refreshing session")
+                self.refresh_session()
+                continue
+
+            if not r.ok:
+                print(f"[GATEWAY ERROR] POST {url} → HTTP {r.status_code}")
+                return None
+
+            try:
+                body = r.json()
+            except ValueError:
+                # e.g. a login page or redirect target served with 200
+                print(
+                    f"[GATEWAY ERROR] POST {url} → non-JSON response "
+                    f"({r.headers.get('Content-Type', '?')})"
+                )
+                return None
+            if not isinstance(body, dict):
+                print(f"[GATEWAY ERROR] POST {url} → unexpected body {body!r:.200}")
+                return None
+            return body
+
+        return None
+
+    @staticmethod
+    def _is_success(body: Optional[dict]) -> bool:
+        """Only an explicit success field counts; anything unrecognised is a failure."""
+        if not isinstance(body, dict):
+            return False
+        for key in ("result", "success", "status"):
+            if key in body:
+                v = body[key]
+                if isinstance(v, str):
+                    return v.strip().lower() in ("success", "ok", "true", "1")
+                return v is True or v == 1
+        return False
+
+    def place_limit_order(self, side: Side, price: float, qty: float) -> bool:
+        if qty <= 0 or price <= 0:
+            return False
+        if side not in ("bid", "ask"):
+            print(f"[GATEWAY ERROR] Invalid side: {side}")
+            return False
+
+        span = self.latency.span("http_place", side)
+        body = self._post(
+            self.order_url,
+            {
+                "code": f"USDT-{self.ticker}",
+                "type": side,
+                "price": format_price(price),
+                "qty": format_qty(qty),
+            },
+        )
+        ok = self._is_success(body)
+        span.finish(ok)
+        if FLAG_VIC_TRADE_DEBUGGING_PRINT:
+            print(f"[GATEWAY] {side.upper()} {price} x {qty} → {ok} ({body})")
+        return ok
+
+    def cancel_order(self, order_row: OrderRow, timeout: int = 15) -> bool:
+        span = self.latency.span("http_cancel", order_row.side)
+        body = self._post(
+            self.cancel_url,
+            {"code": f"USDT-{self.ticker}", "orderid": order_row.order_id},
+        )
+        ok = self._is_success(body)
+        span.finish(ok)
+        if FLAG_VIC_TRADE_DEBUGGING_PRINT:
+            print(f"[GATEWAY] CANCEL {order_row.order_id} → {ok} ({body})")
+        return ok
+
+    def close(self):
+        self.session.close()
+
+
+def build_order_gateway(
+    driver, vic_url: str, ticker: str, latency: Optional[LatencyRecorder] = None
+) -> OrderGateway:
+    """
+    Pick the gateway selected by ORDER_GATEWAY ("UI" or "HTTP"). Pass the
+    same `latency` to gateways that report as one engine (two-lane dual).
+    """
+    if ORDER_GATEWAY == "HTTP":
+        if not VIC_ORDER_API_PATH or not VIC_CANCEL_API_PATH:
+            raise RuntimeError(
+                "[ENV ERROR] ORDER_GATEWAY=HTTP needs VIC_ORDER_API_PATH "
+                "and VIC_CANCEL_API_PATH in .env"
+            )
+        return HttpOrderGateway(
+            driver,
+            vic_url,
+            ticker,
+            order_path=VIC_ORDER_API_PATH,
+            cancel_path=VIC_CANCEL_API_PATH,
+            latency=latency,
+        )
+    return UIOrderGateway(driver, latency=latency)
@@ -0,0 +1,564 @@
+# vic_network.py
+"""
+Market data straight from the trade page's own network traffic.
+
+Chrome's performance log (goog:loggingPrefs, set by init_driver when
+FLAG_VIC_NETWORK_CAPTURE_ENABLE is on) carries the DevTools Network events,
+including every WebSocket frame the page receives. NetworkCapture drains that
+log, fetches XHR/fetch JSON bodies over CDP, runs each payload through a
+FrameDecoder and keeps the typed result in a NetworkState:
+
+    orderbook per side, open orders, balances per asset
+
+read_orderbook / read_open_orders / the balance getters ask
+network_capture_for(driver) first and fall back to the DOM when the capture
+is off, unsupported, has not seen the data yet or last saw it more than
+VIC_NETWORK_MAX_AGE_SEC ago.
+
+The exchange's message format is not documented, so decoding is pluggable
+(set_frame_decoder). JsonFrameDecoder understands the common JSON shapes;
+set VIC_NETWORK_RECORD_PATH to write every frame to a JSONL file and
+`python -m sim.replay_frames <file>` to see what a decoder makes of it.
+"""
+from __future__ import annotations
+
+import base64
+import json
+import re
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from config import (
+    FLAG_VIC_NETWORK_CAPTURE_ENABLE,
+    VIC_NETWORK_MAX_AGE_SEC,
+    VIC_NETWORK_RECORD_PATH,
+)
+from modes.mm.vic_orders import OrderRow
+
+NETWORK_POLL_MIN_INTERVAL_SEC = 0.05  # reads closer together share one log drain
+
+_XHR_TYPES = ("XHR", "Fetch")
+
+
+@dataclass
+class BookUpdate:
+    side: str  # "bid" or "ask"
+    levels: List[Tuple[float, float]]
+    snapshot: bool = True  # False: delta, qty 0 removes the level
+
+
+@dataclass
+class OrdersUpdate:
+    orders: List[OrderRow]
+    snapshot: bool = True  # False: upsert, qty 0 removes the order
+
+
+@dataclass
+class BalanceUpdate:
+    available: Dict[str, float] = field(default_factory=dict)  # asset → free amount
+
+
+Update = Union[BookUpdate, OrdersUpdate, BalanceUpdate]
+
+
+class FrameDecoder:
+    """Turns one WebSocket frame / XHR body into typed updates."""
+
+    def decode(self, kind: str, url: str, payload: str) -> List[Update]:
+        raise NotImplementedError
+
+
+def _num(value) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    t = re.sub(r"[^0-9\-.]", "", str(value).replace(",", ""))
+    try:
+        return float(t)
+    except ValueError:
+        return None
+
+
+def _first(d: dict, keys: Iterable[str]):
+    for k in keys:
+        if k in d:
+            return d[k]
+    return None
+
+
+class JsonFrameDecoder(FrameDecoder):
+    """
+    Best-effort decoder for JSON (and Socket.IO "42[event, data]") payloads.
+
+    A payload is only read as a book, open orders or balances when its
+    channel says so: the URL, the Socket.IO event or a "type" / "event" /
+    "channel" / ... field names it (see _CHANNELS; "orderbook", "depth",
+    "openOrders", "balance", ...). Within that channel:
+
+    - book: {"asks": [[p, q], ...], "bids": [...]} (or "ask"/"bid",
+      "sell"/"buy", or level dicts with price/qty|amount) → BookUpdate;
+      a marker of update/delta/diff makes it a delta
+    - orders: {"orders" | "openOrders" | "outstanding": [{orderid, price,
+      qty, type}]} → OrdersUpdate snapshot
+    - balances: {"balances" | "balance": {asset: amount} or
+      [{asset, available}]} → BalanceUpdate
+
+    Wrappers under "data" / "result" / "payload" are unpacked and inherit
+    the channel.
+    """
+
+    # checked in this order: "orderbook" must not read as "order"
+    _CHANNELS = (
+        ("book", ("orderbook", "order_book", "depth", "book")),
+        ("orders", ("openorder", "open_order", "outstanding", "myorder", "order")),
+        ("balances", ("balance", "wallet", "asset")),
+    )
+    _MARKER_KEYS = ("type", "action", "event", "e", "channel", "topic", "stream", "ch")
+    _BOOK_KEYS = {"bid": ("bids", "bid", "buy"), "ask": ("asks", "ask", "sell")}
+    _ORDER_KEYS = ("orders", "openOrders", "open_orders", "outstanding")
+    _BALANCE_KEYS = ("balances", "balance", "wallet")
+    _DELTA_WORDS = ("update", "delta", "diff", "incremental")
+
+    def decode(self, kind: str, url: str, payload: str) -> List[Update]:
+        parsed = self._parse(payload)
+        if parsed is None:
+            return []
+        event, data = parsed
+        # the URL path names the channel for XHR; the query string never does
+        channel = self._channel(event) or self._channel(url.split("?")[0])
+        out: List[Update] = []
+        self._walk(data, out, depth=0, delta=False, channel=channel)
+        return out
+
+    @classmethod
+    def _channel(cls, text: str) -> Optional[str]:
+        text = text.lower().replace("-", "_")
+        for name, words in cls._CHANNELS:
+            if any(w in text for w in words):
+                return name
+        return None
+
+    @staticmethod
+    def _parse(payload: str):
+        text = (payload or "").strip()
+        # Socket.IO / Engine.IO: numeric packet type before the JSON
+        m = re.match(r"^\d+", text)
+        if m and len(text) > m.end() and text[m.end()] in "[{":
+            text = text[m.end():]
+        if not text or text[0] not in "[{":
+            return None
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return None
+        # ["event", {...}] → ("event", {...})
+        if isinstance(data, list) and len(data) == 2 and isinstance(data[0], str):
+            return data[0], data[1]
+        return "", data
+
+    def _walk(
+        self, data, out: List[Update], depth: int, delta: bool, channel: Optional[str]
+    ):
+        if depth > 4 or not isinstance(data, dict):
+            return
+
+        markers = [str(data[k]) for k in self._MARKER_KEYS if isinstance(data.get(k), str)]
+        marker = " ".join(markers).lower()
+        delta = delta or any(w in marker for w in self._DELTA_WORDS)
+        channel = self._channel(marker) or channel
+
+        if channel == "book":
+            for side, keys in self._BOOK_KEYS.items():
+                levels = _first(data, keys)
+                if isinstance(levels, list):
+                    parsed = self._levels(levels)
+                    if parsed is not None:
+                        out.append(BookUpdate(side, parsed, snapshot=not delta))
+
+        elif channel == "orders":
+            orders = _first(data, self._ORDER_KEYS)
+            if isinstance(orders, list):
+                rows = [r for r in (self._order(o) for o in orders) if r is not None]
+                out.append(OrdersUpdate(rows, snapshot=not delta))
+
+        elif channel == "balances":
+            parsed_balances = self._balances(_first(data, self._BALANCE_KEYS))
+            if parsed_balances:
+                out.append(BalanceUpdate(parsed_balances))
+
+        for key in ("data", "result", "payload", "d"):
+            if isinstance(data.get(key), dict):
+                self._walk(data[key], out, depth + 1, delta, channel)
+
+    @staticmethod
+    def _levels(items: list) -> Optional[List[Tuple[float, float]]]:
+        levels = []
+        for item in items:
+            if isinstance(item, (list, tuple)) and len(item) >= 2:
+                price, qty = _num(item[0]), _num(item[1])
+            elif isinstance(item, dict):
+                price = _num(_first(item, ("price", "p")))
+                qty = _num(_first(item, ("qty", "quantity", "amount", "q", "size")))
+            else:
+                return None  # not a book after all
+            if price is not None and qty is not None:
+                levels.append((price, qty))
+        return levels
+
+    @staticmethod
+    def _order(item) -> Optional[OrderRow]:
+        if not isinstance(item, dict):
+            return None
+        order_id = _first(item, ("orderid", "orderId", "order_id", "id"))
+        price = _num(_first(item, ("price", "p")))
+        if order_id is None or price is None:
+            return None
+
+        side_text = str(_first(item, ("type", "side", "tradetype")) or "").lower()
+        if side_text in ("buy", "bid"):
+            side = "bid"
+        elif side_text in ("sell", "ask"):
+            side = "ask"
+        else:
+            return None
+
+        qty = _num(_first(item, ("qty", "quantity", "amount")))
+        pending = _num(_first(item, ("pending", "remain", "remaining", "left")))
+        return OrderRow(
+            side=side,
+            price=price,
+            order_id=str(order_id),
+            row_el=None,
+            qty=qty or 0.0,
+            pending_qty=pending if pending is not None else (qty or 0.0),
+        )
+
+    @staticmethod
+    def _balances(balances) -> Dict[str, float]:
+        out: Dict[str, float] = {}
+        if isinstance(balances, dict):
+            for asset, value in balances.items():
+                if isinstance(value, dict):
+                    value = _first(value, ("available", "free", "avail"))
+                amount = _num(value)
+                if amount is not None:
+                    out[str(asset).upper()] = amount
+        elif isinstance(balances, list):
+            for item in balances:
+                if not isinstance(item, dict):
+                    continue
+                asset = _first(item, ("asset", "currency", "coin", "symbol"))
+                amount = _num(_first(item, ("available", "free", "avail")))
+                if asset is not None and amount is not None:
+                    out[str(asset).upper()] = amount
+        return out
+
+
+class NetworkState:
+    """
+    Orderbook / open orders / balances built from decoded updates. The
+    getters return None for data last updated more than `max_age_sec` ago
+    (None: never too old, for offline replays).
+    """
+
+    def __init__(self, max_age_sec: Optional[float] = VIC_NETWORK_MAX_AGE_SEC):
+        self.max_age_sec = max_age_sec
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._book: Dict[str, Optional[Dict[float, float]]] = {
+                "bid": None,
+                "ask": None,
+            }
+            self._orders: Optional[Dict[str, OrderRow]] = None
+            self._balances: Dict[str, float] = {}
+            self.updated_ts: Dict[str, float] = {}
+
+    def apply(self, update: Update, ts: Optional[float] = None):
+        """`ts`: when the frame arrived (default: now)."""
+        now = time.time() if ts is None else ts
+        with self._lock:
+            if isinstance(update, BookUpdate):
+                book = self._book.get(update.side)
+                if update.snapshot or book is None:
+                    if not update.snapshot:
+                        return  # deltas before the first snapshot are useless
+                    book = self._book[update.side] = {}
+                    book.update((p, q) for p, q in update.levels if q > 0)
+                else:
+                    for price, qty in update.levels:
+                        if qty > 0:
+                            book[price] = qty
+                        else:
+                            book.pop(price, None)
+                self.updated_ts[f"book.{update.side}"] = now
+
+            elif isinstance(update, OrdersUpdate):
+                if update.snapshot or self._orders is None:
+                    if not update.snapshot:
+                        return
+                    self._orders = {}
+                for row in update.orders:
+                    if update.snapshot or row.pending_qty > 0 or row.qty > 0:
+                        self._orders[row.order_id] = row
+                    else:
+                        self._orders.pop(row.order_id, None)
+                self.updated_ts["orders"] = now
+
+            elif isinstance(update, BalanceUpdate):
+                self._balances.update(update.available)
+                for asset in update.available:
+                    self.updated_ts[f"balance.{asset}"] = now
+
+    def _fresh(self, key: str, now: float) -> bool:
+        if self.max_age_sec is None:
+            return True
+        ts = self.updated_ts.get(key)
+        return ts is not None and now - ts <= self.max_age_sec
+
+    def orderbook(self, side: str) -> Optional[List[Tuple[float, float]]]:
+        now = time.time()
+        with self._lock:
+            book = self._book.get(side)
+            if book is None or not self._fresh(f"book.{side}", now):
+                return None
+            return sorted(book.items(), reverse=(side == "bid"))
+
+    def open_orders(self, side: Optional[str] = None) -> Optional[List[OrderRow]]:
+        snapshot = self.open_orders_at(side)
+        return None if snapshot is None else snapshot[0]
+
+    def open_orders_at(
+        self, side: Optional[str] = None
+    ) -> Optional[Tuple[List[OrderRow], float]]:
+        """Open orders and the arrival time of the frame they are current as of."""
+        now = time.time()
+        with self._lock:
+            if self._orders is None or not self._fresh("orders", now):
+                return None
+            rows = [r for r in self._orders.values() if side is None or r.side == side]
+            return rows, self.updated_ts["orders"]
+
+    def balance(self, asset: str) -> Optional[float]:
+        asset = asset.upper()
+        now = time.time()
+        with self._lock:
+            if not self._fresh(f"balance.{asset}", now):
+                return None
+            return self._balances.get(asset)
+
+    def balances(self) -> Dict[str, float]:
+        """Every asset with a fresh balance → free amount."""
+        now = time.time()
+        with self._lock:
+            return {
+                asset: amount
+                for asset, amount in self._balances.items()
+                if self._fresh(f"balance.{asset}", now)
+            }
+
+
+def replay_frames(
+    path: str, decoder: Optional[FrameDecoder] = None
+) -> Tuple[NetworkState, int]:
+    """Feed a VIC_NETWORK_RECORD_PATH recording through `decoder` → (state, updates)."""
+    decoder = decoder or get_frame_decoder()
+    state = NetworkState(max_age_sec=None)  # recorded data is old by definition
+    count = 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                frame = json.loads(line)
+            except ValueError:
+                continue
+            updates = decoder.decode(
+                frame.get("kind", "ws"), frame.get("url", ""), frame.get("payload", "")
+            )
+            for update in updates:
+                state.apply(update)
+                count += 1
+    return state, count
+
+
+class NetworkCapture:
+    """
+    Drains one driver's performance log into a NetworkState. `available`
+    turns False when the driver was started without performance logging.
+
+    The log mixes the frames of every tab on the driver, so while the driver
+    has more than one window (supervisor tab pool) `shared` is True, frames
+    are dropped and the state is empty: one market must never quote on
+    another market's book, orders or balances.
+    """
+
+    def __init__(
+        self,
+        driver,
+        decoder: Optional[FrameDecoder] = None,
+        record_path: Optional[str] = VIC_NETWORK_RECORD_PATH,
+    ):
+        self.driver = driver
+        self.decoder = decoder or get_frame_decoder()
+        self.state = NetworkState()
+        self.available = True
+        self.record_path = record_path
+
+        self._ws_urls: Dict[str, str] = {}
+        self._xhr_urls: Dict[str, str] = {}
+        self._last_poll = 0.0
+        self._lock = threading.Lock()
+
+        self.shared = False
+
+        # counters for debugging
+        self.frames = 0
+        self.updates = 0
+        self.decode_errors = 0
+
+    def poll(self, force: bool = False) -> int:
+        """Drain the log and apply what it decodes. Returns the update count."""
+        with self._lock:
+            now = time.time()
+            if not force and now - self._last_poll < NETWORK_POLL_MIN_INTERVAL_SEC:
+                return 0
+            self._last_poll = now
+
+            try:
+                entries = self.driver.get_log("performance")
+            except Exception as e:
+                print(f"[NETWORK WARN] Performance log unavailable → DOM reads only: {e}")
+                self.available = False
+                return 0
+
+            try:
+                shared = len(self.driver.window_handles) > 1
+            except Exception:
+                shared = True  # cannot tell whose frames these are
+            if shared != self.shared:
+                self.shared = shared
+                self.state.reset()
+                if shared:
+                    print("[NETWORK WARN] Several tabs on one driver → DOM reads only")
+            if shared:
+                return 0
+
+            applied = 0
+            for entry in entries:
+                try:
+                    message = json.loads(entry["message"])["message"]
+                except (KeyError, TypeError, ValueError):
+                    continue
+                # logged by chromedriver in ms; frames can sit in the log a while
+                ts = entry.get("timestamp")
+                applied += self._on_event(
+                    message.get("method", ""),
+                    message.get("params") or {},
+                    ts / 1000.0 if isinstance(ts, (int, float)) else None,
+                )
+            return applied
+
+    def _on_event(self, method: str, params: dict, ts: Optional[float] = None) -> int:
+        if method == "Network.webSocketCreated":
+            self._ws_urls[params.get("requestId")] = params.get("url", "")
+        elif method == "Network.webSocketFrameReceived":
+            response = params.get("response") or {}
+            if response.get("opcode", 1) == 1:  # text frames only
+                url = self._ws_urls.get(params.get("requestId"), "")
+                return self._feed("ws", url, response.get("payloadData", ""), ts)
+        elif method == "Network.webSocketClosed":
+            # pushed state is only complete while the socket lives
+            self._ws_urls.pop(params.get("requestId"), None)
+            self.state.reset()
+        elif method == "Network.requestWillBeSent":
+            if params.get("type") == "Document":
+                self.state.reset()  # navigation: everything is re-sent
+        elif method == "Network.responseReceived":
+            response = params.get("response") or {}
+            is_json = "json" in (response.get("mimeType") or "")
+            if params.get("type") in _XHR_TYPES and is_json:
+                self._xhr_urls[params.get("requestId")] = response.get("url", "")
+        elif method == "Network.loadingFinished":
+            url = self._xhr_urls.pop(params.get("requestId"), None)
+            if url is not None:
+                body = self._response_body(params.get("requestId"))
+                return self._feed("xhr", url, body, ts)
+        return 0
+
+    def _response_body(self, request_id: str) -> str:
+        try:
+            body = self.driver.execute_cdp_cmd(
+                "Network.getResponseBody", {"requestId": request_id}
+            )
+        except Exception:
+            return ""  # already evicted
+        text = body.get("body", "")
+        if body.get("base64Encoded"):
+            try:
+                text = base64.b64decode(text).decode("utf-8", "replace")
+            except ValueError:
+                return ""
+        return text
+
+    def _feed(self, kind: str, url: str, payload: str, ts: Optional[float] = None) -> int:
+        if not payload:
+            return 0
+        self.frames += 1
+        if self.record_path:
+            self._record(kind, url, payload)
+        try:
+            updates = self.decoder.decode(kind, url, payload)
+        except Exception:
+            self.decode_errors += 1
+            return 0
+        for update in updates:
+            self.state.apply(update, ts)
+        self.updates += len(updates)
+        return len(updates)
+
+    def _record(self, kind: str, url: str, payload: str):
+        try:
+            with open(self.record_path, "a", encoding="utf-8") as f:
+                record = {"ts": time.time(), "kind": kind, "url": url, "payload": payload}
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"[NETWORK WARN] Cannot record frames to {self.record_path}: {e}")
+            self.record_path = None
+
+
+_decoder: FrameDecoder = JsonFrameDecoder()
+_captures: "weakref.WeakKeyDictionary[object, NetworkCapture]" = weakref.WeakKeyDictionary()
+_captures_lock = threading.Lock()
+
+
+def get_frame_decoder() -> FrameDecoder:
+    return _decoder
+
+
+def set_frame_decoder(decoder: FrameDecoder):
+    """Use `decoder` for every capture created from now on."""
+    global _decoder
+    _decoder = decoder
+
+
+def network_capture_for(driver) -> Optional[NetworkCapture]:
+    """
+    The driver's capture, freshly polled, or None when capture is off, the
+    driver has no performance log, or it has several tabs whose frames
+    cannot be told apart (see NetworkCapture.shared).
+    """
+    if not FLAG_VIC_NETWORK_CAPTURE_ENABLE:
+        return None
+    with _captures_lock:
+        capture = _captures.get(driver)
+        if capture is None:
+            capture = _captures[driver] = NetworkCapture(driver)
+    if not capture.available:
+        return None
+    capture.poll()
+    return capture if capture.available and not capture.shared else None
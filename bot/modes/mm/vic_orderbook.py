@@ -0,0 +1,306 @@
+# vic_orderbook.py
+from __future__ import annotations
+
+import time
+from typing import Dict, List, Literal, Optional, Tuple
+
+Side = Literal["bid", "ask"]
+
+# One round trip: returns [[price, qty], ...] for every parsable row, or null
+# when the container is not on the page yet.
+_READ_ORDERBOOK_JS = """
+const box = document.getElementById(arguments[0]);
+if (!box) { return null; }
+const num = (el) => {
+    if (!el) { return NaN; }
+    const t = (el.textContent || "").replace(/[^0-9\\-,.]/g, "").replace(/,/g, "");
+    return t ? parseFloat(t) : NaN;
+};
+const out = [];
+for (const row of box.querySelectorAll("a.bidding-table-rows")) {
+    const price = num(row.querySelector("div.col-price"));
+    const qty = num(row.querySelector("div.col-cost"));
+    if (isFinite(price) && isFinite(qty)) { out.push([price, qty]); }
+}
+return out;
+"""
+
+
+def orderbook_container_id(side: Side) -> str:
+    return "order-box-ask" if side == "ask" else "order-box-bid"
+
+
+def read_orderbook_js(driver, side: Side) -> Optional[List[Tuple[float, float]]]:
+    """
+    Read every (price, qty) pair of one orderbook side with a single
+    execute_script call. Returns None when the script fails or the
+    container is missing, so callers can fall back to the element path.
+    """
+    try:
+        raw = driver.execute_script(_READ_ORDERBOOK_JS, orderbook_container_id(side))
+    except Exception:
+        return None
+
+    if raw is None:
+        return None
+
+    levels: List[Tuple[float, float]] = []
+    for pair in raw:
+        try:
+            levels.append((float(pair[0]), float(pair[1])))
+        except (TypeError, ValueError, IndexError):
+            continue
+    return levels
+
+
+# Orderbook mirror: a MutationObserver per side keeps the page's rows in an
+# in-page price → qty map and writes every level change into a ring buffer.
+# One call drains the changes made since the last drain; a fresh snapshot
+# comes back instead when the buffer wrapped (gap), the page was reloaded
+# (new epoch) or a container was replaced.
+#
+# arguments: key, {side: container selector}, row selector, price selector,
+#            qty selector, capacity, epoch seen by Python, last seq seen
+# events:    [seq, side, price, qty] with qty null when the level is gone
+_MIRROR_DRAIN_JS = """
+const [key, containers, ROW, PRICE_SEL, QTY_SEL, cap, epoch, after] = arguments;
+const root = (window.__vicBookMirrors = window.__vicBookMirrors || {});
+const num = (el) => {
+    if (!el) { return NaN; }
+    const t = (el.textContent || "").replace(/[^0-9\\-,.]/g, "").replace(/,/g, "");
+    return t ? parseFloat(t) : NaN;
+};
+const parse = (row) => {
+    const price = num(row.querySelector(PRICE_SEL));
+    const qty = num(row.querySelector(QTY_SEL));
+    return isFinite(price) && isFinite(qty) ? [price, qty] : null;
+};
+const forRows = (node, fn) => {
+    if (!node || node.nodeType !== 1) { return; }
+    if (node.matches(ROW)) { fn(node); }
+    node.querySelectorAll(ROW).forEach(fn);
+};
+
+const install = () => {
+    const m = { epoch: Math.random().toString(36).slice(2), seq: 0, buf: new Array(cap), sides: {} };
+    const push = (side, price, qty) => {
+        m.seq += 1;
+        m.buf[m.seq % cap] = [m.seq, side, price, qty];
+    };
+    for (const side of Object.keys(containers)) {
+        const box = document.querySelector(containers[side]);
+        if (!box) { m.sides[side] = null; continue; }
+        const st = { box: box, rowState: new WeakMap(), byPrice: new Map() };
+        const emit = (price) => {
+            const rows = st.byPrice.get(price);
+            if (!rows || rows.size === 0) {
+                st.byPrice.delete(price);
+                push(side, price, null);
+                return;
+            }
+            let last = null;
+            for (const r of rows) { last = r; }
+            push(side, price, st.rowState.get(last)[1]);
+        };
+        const detach = (row, quiet) => {
+            const old = st.rowState.get(row);
+            if (!old) { return; }
+            st.rowState.delete(row);
+            const rows = st.byPrice.get(old[0]);
+            if (rows) { rows.delete(row); }
+            if (!quiet) { emit(old[0]); }
+        };
+        const attach = (row, quiet) => {
+            const v = parse(row);
+            if (!v) { return; }
+            st.rowState.set(row, v);
+            let rows = st.byPrice.get(v[0]);
+            if (!rows) { rows = new Set(); st.byPrice.set(v[0], rows); }
+            rows.add(row);
+            if (!quiet) { emit(v[0]); }
+        };
+        const refresh = (row) => {
+            const old = st.rowState.get(row);
+            const v = parse(row);
+            if (old && v && old[0] === v[0]) {
+                if (old[1] !== v[1]) { st.rowState.set(row, v); emit(v[0]); }
+                return;
+            }
+            detach(row, false);
+            attach(row, false);
+        };
+        box.querySelectorAll(ROW).forEach((row) => attach(row, true));
+        st.observer = new MutationObserver((mutations) => {
+            const touched = new Set();
+            for (const mu of mutations) {
+                mu.removedNodes.forEach((n) => forRows(n, (r) => {
+                    if (!box.contains(r)) { detach(r, false); }
+                }));
+                mu.addedNodes.forEach((n) => forRows(n, (r) => touched.add(r)));
+                const el = mu.target.nodeType === 1 ? mu.target : mu.target.parentElement;
+                const row = el && el.closest ? el.closest(ROW) : null;
+                if (row) { touched.add(row); }
+            }
+            for (const r of touched) {
+                if (box.contains(r)) { refresh(r); }
+            }
+        });
+        st.observer.observe(box, { childList: true, subtree: true, characterData: true });
+        m.sides[side] = st;
+    }
+    return m;
+};
+
+let m = root[key];
+const stale = !m || Object.keys(containers).some((side) => {
+    const st = m.sides[side];
+    const box = document.querySelector(containers[side]);
+    return (st ? st.box : null) !== box;
+});
+if (stale) {
+    if (m) {
+        for (const st of Object.values(m.sides)) { if (st) { st.observer.disconnect(); } }
+    }
+    m = root[key] = install();
+}
+
+if (stale || epoch !== m.epoch || after < m.seq - cap) {
+    const snapshot = {};
+    for (const side of Object.keys(m.sides)) {
+        const st = m.sides[side];
+        if (!st) { snapshot[side] = null; continue; }
+        const levels = [];
+        for (const [price, rows] of st.byPrice) {
+            let last = null;
+            for (const r of rows) { last = r; }
+            if (last) { levels.push([price, st.rowState.get(last)[1]]); }
+        }
+        snapshot[side] = levels;
+    }
+    return { epoch: m.epoch, seq: m.seq, snapshot: snapshot };
+}
+
+const events = [];
+for (let s = after + 1; s <= m.seq; s++) { events.push(m.buf[s % cap]); }
+return { epoch: m.epoch, seq: m.seq, events: events };
+"""
+
+MIRROR_CAPACITY = 4096
+
+
+class OrderbookMirror:
+    """
+    Local copy of the page's orderbook, kept current by an injected
+    MutationObserver instead of re-scraping every row.
+
+    sync() costs one execute_script and O(changes since the last sync); the
+    first call (and any gap / reload / replaced container) re-snapshots.
+    One mirror per page (tab): the in-page ring buffer has a single reader.
+    """
+
+    def __init__(
+        self,
+        driver,
+        containers: Optional[Dict[str, str]] = None,
+        row_selector: str = "a.bidding-table-rows",
+        price_selector: str = "div.col-price",
+        qty_selector: str = "div.col-cost",
+        key: str = "engine",
+        capacity: int = MIRROR_CAPACITY,
+    ):
+        self.driver = driver
+        self.containers = containers or {
+            side: f"#{orderbook_container_id(side)}" for side in ("bid", "ask")
+        }
+        self.row_selector = row_selector
+        self.price_selector = price_selector
+        self.qty_selector = qty_selector
+        self.key = key
+        self.capacity = capacity
+
+        self._epoch: Optional[str] = None
+        self._seq = 0
+        self._book: Dict[str, Optional[Dict[float, float]]] = {}
+        self.last_sync_ts: Optional[float] = None
+
+        # counters for benchmarks / debugging
+        self.syncs = 0
+        self.snapshots = 0
+        self.changes = 0
+
+    def sync(self) -> Optional[int]:
+        """
+        Pull changes from the page. Returns the number of level changes
+        applied (-1 after a snapshot), or None when the script failed.
+        """
+        try:
+            raw = self.driver.execute_script(
+                _MIRROR_DRAIN_JS,
+                self.key,
+                self.containers,
+                self.row_selector,
+                self.price_selector,
+                self.qty_selector,
+                self.capacity,
+                self._epoch,
+                self._seq,
+            )
+        except Exception:
+            return None
+        if not isinstance(raw, dict):
+            return None
+
+        self.syncs += 1
+        self.last_sync_ts = time.time()
+        self._epoch = raw.get("epoch")
+        self._seq = int(raw.get("seq") or 0)
+
+        snapshot = raw.get("snapshot")
+        if snapshot is not None:
+            self.snapshots += 1
+            self._book = {
+                side: None if levels is None else _levels_dict(levels)
+                for side, levels in snapshot.items()
+            }
+            return -1
+
+        applied = 0
+        for event in raw.get("events") or ():
+            try:
+                _, side, price, qty = event
+                book = self._book.get(side)
+                if book is None:
+                    continue
+                if qty is None:
+                    book.pop(float(price), None)
+                else:
+                    book[float(price)] = float(qty)
+                applied += 1
+            except (TypeError, ValueError):
+                continue
+        self.changes += applied
+        return applied
+
+    def levels(self, side: str) -> Optional[List[Tuple[float, float]]]:
+        """(price, qty) from the last sync, best first; None when the side is missing."""
+        book = self._book.get(side)
+        if book is None:
+            return None
+        # best bid is the highest price, best ask the lowest
+        return sorted(book.items(), reverse=(side == "bid"))
+
+    def read(self, side: str) -> Optional[List[Tuple[float, float]]]:
+        """sync() then levels(); None when the mirror is unavailable (fall back)."""
+        if self.sync() is None:
+            return None
+        return self.levels(side)
+
+
+def _levels_dict(levels) -> Dict[float, float]:
+    book: Dict[float, float] = {}
+    for pair in levels:
+        try:
+            book[float(pair[0])] = float(pair[1])
+        except (TypeError, ValueError, IndexError):
+            continue
+    return book
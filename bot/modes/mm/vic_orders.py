@@ -4,27 +4,61 @@ from __future__ import annotations
 import re
 import time
 from dataclasses import dataclass
-from typing import List, Literal
+from typing import Dict, Iterable, List, Literal, Optional, Tuple
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     ElementClickInterceptedException,
-    TimeoutException,
     StaleElementReferenceException,
 )
-from config import FLAG_VIC_ORDERS_DEBUGGING_PRINT
+from config import FLAG_VIC_ORDERS_DEBUGGING_PRINT, CANCEL_BATCH_MAX_ROUNDS
+from modes.mm.vic_popup import current_popup_seq, handle_popup
+from modes.mm.latency import LATENCY, LatencyRecorder
+from modes.utils_wait import ensure_script_timeout, wait_until
 
 Side = Literal["bid", "ask"]
 
 TBODY = (By.CSS_SELECTOR, "tbody#out-standing-list")
 ROWS = (By.CSS_SELECTOR, "tbody#out-standing-list > tr")
 CANCEL_BTN_IN_ROW = (By.CSS_SELECTOR, "button.order-cancel[data-orderid]")
+CANCEL_BTN_BY_ID = 'button.order-cancel[data-orderid="{}"]'
 
 # row
 # 0: Date, 1: Pair, 2: Type, 3: Price, 4: Qty, 5: Pending Qty, 6: Cancel(btn)
 TYPE_TD_IDX = 2
 PRICE_TD_IDX = 3
+QTY_TD_IDX = 4
+PENDING_QTY_TD_IDX = 5
+
+# One round trip for the whole table: [{side, price, qty, pending, orderId, row}]
+# Numbers that fail to parse come back as null and are skipped in Python.
+_READ_OPEN_ORDERS_JS = """
+const tbody = document.querySelector("tbody#out-standing-list");
+if (!tbody) { return null; }
+const num = (td) => {
+    if (!td) { return null; }
+    const t = (td.textContent || "").replace(/[^0-9\\-,.]/g, "").replace(/,/g, "");
+    const v = t ? parseFloat(t) : NaN;
+    return isFinite(v) ? v : null;
+};
+const out = [];
+for (const tr of tbody.querySelectorAll(":scope > tr")) {
+    const tds = tr.querySelectorAll("td");
+    if (tds.length <= arguments[1]) { continue; }
+    const btn = tr.querySelector("button.order-cancel[data-orderid]");
+    if (!btn) { continue; }
+    out.push({
+        type: (tds[arguments[0]].textContent || "").trim().toLowerCase(),
+        tradetype: (btn.getAttribute("data-tradetype") || "").trim().toLowerCase(),
+        price: num(tds[arguments[1]]),
+        qty: num(tds[arguments[2]]),
+        pending: num(tds[arguments[3]]),
+        orderId: btn.getAttribute("data-orderid"),
+        row: tr,
+    });
+}
+return out;
+"""
 
 
 @dataclass
@@ -33,6 +67,8 @@ class OrderRow:
     price: float
     order_id: str
     row_el: object
+    qty: float = 0.0
+    pending_qty: float = 0.0
 
 
 def _parse_number(text: str) -> float:
@@ -53,92 +89,111 @@ def _infer_side_from_type_text(type_text: str) -> Side:
     raise ValueError(f"unknown type text: {type_text!r}")
 
 
-def _get_popup_text(driver):
+def _side_from_type_or_tradetype(type_text: str, tradetype: str) -> Side | None:
     try:
-        modal = driver.find_element(By.CLASS_NAME, "swal-modal")
-        text_el = modal.find_element(By.CLASS_NAME, "swal-text")
-        return text_el.text.strip()
-    except:
-        return ""
+        return _infer_side_from_type_text(type_text)
+    except ValueError:
+        pass
+    if tradetype in ("bid", "ask"):
+        return tradetype
+    return None
 
 
-def _click_ok_button(
-    driver,
-    timeout: int = 20,
-    popup_description: str = "popup",
-    wait_animation: float = 1.2,
-):
-    wait = WebDriverWait(driver, timeout)
+def read_open_orders(driver, timeout: int = 10) -> List[OrderRow]:
+    """
+    Read every open order (both sides) with a single execute_script call.
+    Falls back to the per-element reader when the script fails.
+    Served from the captured network traffic instead when that is enabled.
+    """
+    return read_open_orders_at(driver, timeout=timeout)[0]
 
-    try:
-        wait.until(EC.visibility_of_element_located((By.CLASS_NAME, "swal-overlay")))
 
-        ok_btn = wait.until(
-            EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "button.swal-button--ok, button.swal-button--confirm")
-            )
-        )
+def read_open_orders_at(driver, timeout: int = 10) -> Tuple[List[OrderRow], float]:
+    """
+    read_open_orders() and the time the rows describe: when the captured
+    orders frame arrived, or when the table read started. Pass it to
+    OrderBookState.reconcile() as `read_ts`; a captured snapshot can be
+    seconds older than the call.
+    """
+    from modes.mm.vic_network import network_capture_for  # imports OrderRow
+
+    capture = network_capture_for(driver)
+    if capture is not None:
+        snapshot = capture.state.open_orders_at()
+        if snapshot is not None:
+            return snapshot
+
+    read_ts = time.time()
+    return _read_open_orders_table(driver, timeout), read_ts
 
-        time.sleep(wait_animation)
 
-        popup_text = _get_popup_text(driver)
+def _read_open_orders_table(driver, timeout: int) -> List[OrderRow]:
+    wait_until(driver, EC.presence_of_element_located(TBODY), timeout, "orders.tbody")
+
+    try:
+        raw = driver.execute_script(
+            _READ_OPEN_ORDERS_JS,
+            TYPE_TD_IDX,
+            PRICE_TD_IDX,
+            QTY_TD_IDX,
+            PENDING_QTY_TD_IDX,
+        )
+    except Exception as e:
         if FLAG_VIC_ORDERS_DEBUGGING_PRINT:
-            print(f"[CANCEL] {popup_description}: Popup text = '{popup_text}'")
+            print(f"[ORDERS WARN] Scripted read failed, using element path: {e}")
+        raw = None
 
-        wait.until(EC.element_to_be_clickable(ok_btn))
+    if raw is None:
+        return _read_open_orders_side_elements(
+            driver, "bid"
+        ) + _read_open_orders_side_elements(driver, "ask")
 
-        max_attempts = 3
-        for attempt in range(max_attempts):
-            try:
-                ok_btn.click()
-                if FLAG_VIC_ORDERS_DEBUGGING_PRINT:
-                    print(
-                        f"[CANCEL] {popup_description}: Click succeeded (attempt {attempt + 1})."
-                    )
-                break
-            except ElementClickInterceptedException:
-                if attempt < max_attempts - 1:
-                    print(
-                        f"[CANCEL WARN] {popup_description}: Click intercepted, retrying..."
-                    )
-                    time.sleep(0.5)
-                else:
-                    driver.execute_script("arguments[0].click();", ok_btn)
-                    if FLAG_VIC_ORDERS_DEBUGGING_PRINT:
-                        print(f"[CANCEL] {popup_description}: JavaScript click used.")
+    out: List[OrderRow] = []
+    for item in raw:
+        row_side = _side_from_type_or_tradetype(
+            item.get("type") or "", item.get("tradetype") or ""
+        )
+        if row_side is None:
+            continue
 
-        time.sleep(0.5)
+        price = item.get("price")
+        order_id = item.get("orderId")
+        if price is None or not order_id:
+            continue
 
-        if FLAG_VIC_ORDERS_DEBUGGING_PRINT:
-            print(f"[CANCEL] {popup_description}: Button clicked successfully.")
-        return True
+        qty = item.get("qty")
+        pending = item.get("pending")
+        out.append(
+            OrderRow(
+                side=row_side,
+                price=float(price),
+                order_id=order_id,
+                row_el=item.get("row"),
+                qty=float(qty) if qty is not None else 0.0,
+                pending_qty=float(pending) if pending is not None else 0.0,
+            )
+        )
 
-    except TimeoutException as e:
-        print(f"[CANCEL ERROR] {popup_description}: Timeout - {e}")
-        return False
-    except Exception as e:
-        print(f"[CANCEL ERROR] {popup_description}: Unexpected error - {e}")
-        return False
+    return out
 
 
-def _is_popup_visible(driver):
-    try:
-        overlays = driver.find_elements(By.CLASS_NAME, "swal-overlay")
-        for overlay in overlays:
-            if overlay.is_displayed():
-                buttons = overlay.find_elements(
-                    By.CSS_SELECTOR,
-                    "button.swal-button--ok, button.swal-button--confirm",
-                )
-                if buttons and buttons[0].is_displayed():
-                    return True
-        return False
-    except:
-        return False
+def read_open_orders_both_sides(
+    driver, timeout: int = 10
+) -> tuple[List[OrderRow], List[OrderRow]]:
+    rows = read_open_orders(driver, timeout=timeout)
+    bids = [r for r in rows if r.side == "bid"]
+    asks = [r for r in rows if r.side == "ask"]
+    return bids, asks
 
 
 def read_open_orders_side(driver, side: Side, timeout: int = 10) -> List[OrderRow]:
-    WebDriverWait(driver, timeout).until(EC.presence_of_element_located(TBODY))
+    return [r for r in read_open_orders(driver, timeout=timeout) if r.side == side]
+
+
+def _read_open_orders_side_elements(
+    driver, side: Side, timeout: int = 10
+) -> List[OrderRow]:
+    wait_until(driver, EC.presence_of_element_located(TBODY), timeout, "orders.tbody")
     rows = driver.find_elements(*ROWS)
 
     out: List[OrderRow] = []
@@ -181,16 +236,45 @@ def read_open_orders_side(driver, side: Side, timeout: int = 10) -> List[OrderRo
         except Exception:
             continue
 
-        out.append(OrderRow(side=row_side, price=price, order_id=order_id, row_el=tr))
+        qty = 0.0
+        pending_qty = 0.0
+        try:
+            if len(tds) > QTY_TD_IDX:
+                qty = _parse_number(tds[QTY_TD_IDX].text)
+            if len(tds) > PENDING_QTY_TD_IDX:
+                pending_qty = _parse_number(tds[PENDING_QTY_TD_IDX].text)
+        except Exception:
+            pass
+
+        out.append(
+            OrderRow(
+                side=row_side,
+                price=price,
+                order_id=order_id,
+                row_el=tr,
+                qty=qty,
+                pending_qty=pending_qty,
+            )
+        )
 
     return out
 
 
-def cancel_open_orders_row(driver, order_row: OrderRow, timeout: int = 15) -> bool:
+def cancel_open_orders_row(
+    driver,
+    order_row: OrderRow,
+    timeout: int = 15,
+    latency: Optional[LatencyRecorder] = None,
+) -> bool:
     order_id = order_row.order_id
+    span = (LATENCY if latency is None else latency).span("cancel", order_row.side)
+    ok = False
 
     try:
-        btn = order_row.row_el.find_element(*CANCEL_BTN_IN_ROW)
+        seq_before = current_popup_seq(driver)
+        # by id, not through row_el: the row goes stale whenever the table re-renders
+        btn = driver.find_element(By.CSS_SELECTOR, CANCEL_BTN_BY_ID.format(order_id))
+        span.mark("locate")
 
         try:
             btn.click()
@@ -202,15 +286,20 @@ def cancel_open_orders_row(driver, order_row: OrderRow, timeout: int = 15) -> bo
             driver.execute_script("arguments[0].click();", btn)
             if FLAG_VIC_ORDERS_DEBUGGING_PRINT:
                 print(f"[CANCEL] Button clicked (JS) for order {order_id}")
+        span.mark("click")
 
-        time.sleep(0.5)
-
-        if not _click_ok_button(
+        confirm_seq = handle_popup(
             driver,
+            after_seq=seq_before,
             timeout=timeout,
             popup_description="Cancel confirmation",
-            wait_animation=1.2,
-        ):
+            debug_tag="CANCEL",
+            debug=FLAG_VIC_ORDERS_DEBUGGING_PRINT,
+            span=span,
+            appear_stage="popup1_appear",
+            closed_stage="popup1_dismiss",
+        )
+        if confirm_seq is None:
             print(f"[CANCEL ERROR] Failed to confirm cancellation for order {order_id}")
             return False
         if FLAG_VIC_ORDERS_DEBUGGING_PRINT:
@@ -218,60 +307,33 @@ def cancel_open_orders_row(driver, order_row: OrderRow, timeout: int = 15) -> bo
                 f"[CANCEL] Confirmation done for order {order_id}. Waiting for success notification..."
             )
 
-        time.sleep(0.8)
-
-        if _is_popup_visible(driver):
-            if FLAG_VIC_ORDERS_DEBUGGING_PRINT:
-                print("[CANCEL] Success notification already visible!")
-        else:
-            end_time = time.time() + 10
-            popup_appeared = False
-
-            while time.time() < end_time:
-                if _is_popup_visible(driver):
-                    popup_appeared = True
-                    break
-                time.sleep(0.3)
-
-            if not popup_appeared:
-                print(
-                    f"[CANCEL WARN] Success notification did not appear for order {order_id}"
-                )
-                selector = f'button.order-cancel[data-orderid="{order_id}"]'
-                try:
-                    driver.find_element(By.CSS_SELECTOR, selector)
-                    return False
-                except:
-                    if FLAG_VIC_ORDERS_DEBUGGING_PRINT:
-                        print(
-                            f"[CANCEL] Order {order_id} button disappeared, assuming success"
-                        )
-                    return True
-
-        time.sleep(0.8)
-
-        if not _click_ok_button(
+        done_seq = handle_popup(
             driver,
-            timeout=timeout,
+            after_seq=confirm_seq,
+            timeout=10,
             popup_description="Cancelled notification",
-            wait_animation=1.5,
-        ):
+            debug_tag="CANCEL",
+            debug=FLAG_VIC_ORDERS_DEBUGGING_PRINT,
+            span=span,
+            appear_stage="popup2_appear",
+            closed_stage="overlay_gone",
+        )
+        if done_seq is None:
             print(
-                f"[CANCEL ERROR] Failed to close success notification for order {order_id}"
+                f"[CANCEL WARN] Success notification not handled for order {order_id}"
             )
+            if driver.find_elements(By.CSS_SELECTOR, CANCEL_BTN_BY_ID.format(order_id)):
+                return False
+            if FLAG_VIC_ORDERS_DEBUGGING_PRINT:
+                print(f"[CANCEL] Order {order_id} button disappeared, assuming success")
+            ok = True
             return True
 
-        try:
-            WebDriverWait(driver, 5).until(
-                EC.invisibility_of_element_located((By.CLASS_NAME, "swal-overlay"))
-            )
-        except:
-            pass
-
         if FLAG_VIC_ORDERS_DEBUGGING_PRINT:
             print(
                 f"[CANCEL] Order {order_id} @ {order_row.price:.3f} cancelled successfully."
             )
+        ok = True
         return True
 
     except StaleElementReferenceException:
@@ -282,61 +344,238 @@ def cancel_open_orders_row(driver, order_row: OrderRow, timeout: int = 15) -> bo
     except Exception as e:
         print(f"[CANCEL ERROR] Failed to cancel order {order_id}: {e}")
         return False
+    finally:
+        span.finish(ok)
+
+
+# Cancel [orderId, ...] in one async call: for each id, click its cancel button,
+# confirm, dismiss the result popup. Stops at the first failure (the page may be
+# stuck on a popup) or when the budget (ms, 0 = none) runs out; the rest come
+# back "skipped". An id without a button comes back "missing" and does not stop
+# the batch.
+_CANCEL_BATCH_JS = """
+const ids = arguments[0];
+const popupTimeoutMs = arguments[1];
+const budgetMs = arguments[2];
+const done = arguments[arguments.length - 1];
+const started = performance.now();
+const left = () => (budgetMs ? budgetMs - (performance.now() - started) : Infinity);
+const sleep = (ms) => new Promise((r) => setTimeout(r, ms));
+const overlay = () => document.querySelector(".swal-overlay.swal-overlay--show-modal");
+const popupText = (ov) => {
+    const t = ov && ov.querySelector(".swal-text, .swal-title");
+    return t ? (t.textContent || "").trim() : "";
+};
+const readyButton = () => {
+    const ov = overlay();
+    if (!ov) { return null; }
+    const btn = ov.querySelector("button.swal-button--ok, button.swal-button--confirm");
+    const modal = ov.querySelector(".swal-modal");
+    if (!btn || btn.disabled) { return null; }
+    const r = btn.getBoundingClientRect();
+    if (!(r.width > 0 && r.height > 0)) { return null; }
+    const animating = [ov, modal].some(
+        (el) => el && el.getAnimations && el.getAnimations().some((a) => a.playState === "running")
+    );
+    return animating ? null : btn;
+};
+const until = async (cond, timeoutMs) => {
+    const end = performance.now() + timeoutMs;
+    while (performance.now() < end) {
+        const v = cond();
+        if (v) { return v; }
+        await sleep(15);
+    }
+    return null;
+};
+const step = async (res, stage, cond) => {
+    res.stage = stage;
+    const v = await until(cond, Math.min(popupTimeoutMs, left()));
+    if (!v) { throw new Error(stage + " timeout"); }
+    return v;
+};
+const button = (id) => document.querySelector(
+    'button.order-cancel[data-orderid="' + CSS.escape(String(id)) + '"]'
+);
+(async () => {
+    const results = [];
+    let failed = false;
+    for (const id of ids) {
+        const res = { ok: false, stage: "skipped", side: "", text: "", ms: 0 };
+        results.push(res);
+        if (failed || left() <= 0) { continue; }
+        const t0 = performance.now();
+        try {
+            await step(res, "overlay", () => !overlay());
+            const btn = button(id);
+            if (!btn) {
+                res.stage = "missing";
+                continue;
+            }
+            res.side = (btn.getAttribute("data-tradetype") || "").trim().toLowerCase();
+            btn.click();
+            const confirm = await step(res, "popup1", readyButton);
+            const firstText = popupText(overlay());
+            confirm.click();
+            await step(res, "popup1_dismiss", () => {
+                const ov = overlay();
+                return !ov || popupText(ov) !== firstText;
+            });
+            const result = await step(res, "popup2", readyButton);
+            res.text = popupText(overlay());
+            result.click();
+            await step(res, "overlay_gone", () => !overlay());
+            res.ok = true;
+            res.stage = "done";
+        } catch (e) {
+            res.error = String(e && e.message ? e.message : e);
+            failed = true;
+        }
+        res.ms = performance.now() - t0;
+    }
+    return results;
+})().then(done, (e) => done({ error: String(e) }));
+"""
+
+
+def _open_order_ids(driver, timeout: int = 10):
+    """Ids currently in the open-orders table, or None when it cannot be read."""
+    try:
+        return {r.order_id for r in read_open_orders(driver, timeout=timeout)}
+    except Exception as e:
+        print(f"[CANCEL WARN] Could not read open orders: {e}")
+        return None
 
 
-def _cancel_all_open_orders_side(
-    driver, side: Side, timeout: int = 15
-) -> tuple[int, int]:
-
-    if FLAG_VIC_ORDERS_DEBUGGING_PRINT:
-        print(f"[CANCEL] Starting {side.upper()} orders cancellation...")
-
-    cancelled = 0
-    max_iterations = 50
+def _run_cancel_batch(
+    driver, ids: List[str], popup_timeout: float, budget: Optional[float] = None
+) -> List[dict]:
+    # every stage has its own popup timeout; 5 stages per order is the worst case
+    worst = len(ids) * 5 * popup_timeout
+    ensure_script_timeout(driver, worst if budget is None else min(worst, budget))
+    try:
+        raw = driver.execute_async_script(
+            _CANCEL_BATCH_JS,
+            ids,
+            int(popup_timeout * 1000),
+            int(budget * 1000) if budget is not None else 0,
+        )
+    except Exception as e:
+        print(f"[CANCEL ERROR] Batch cancel script failed: {e}")
+        return []
+    if not isinstance(raw, list):
+        print(f"[CANCEL ERROR] Batch cancel returned {raw!r}")
+        return []
+    return raw
 
-    for iteration in range(max_iterations):
-        try:
-            rows = read_open_orders_side(driver, side, timeout=10)
 
-            if not rows:
-                if FLAG_VIC_ORDERS_DEBUGGING_PRINT:
-                    if cancelled > 0:
-                        print(
-                            f"[CANCEL] ✅ All {cancelled} {side.upper()} orders cancelled"
-                        )
-                    else:
-                        print(f"[CANCEL] No {side.upper()} orders to cancel")
-                return (cancelled, cancelled)
+def cancel_orders_by_id(
+    driver,
+    order_ids: Iterable[str],
+    popup_timeout: float = 10,
+    max_rounds: int = CANCEL_BATCH_MAX_ROUNDS,
+    deadline: Optional[float] = None,
+    latency: Optional[LatencyRecorder] = None,
+) -> Dict[str, Optional[bool]]:
+    """
+    Cancel a set of orders by id and return {order_id: outcome}: True when
+    our cancel was confirmed, False when the order is still open, None when
+    it left the table without a confirmed cancel (filled, or cancelled
+    elsewhere) - its funds may be spent, so callers must not credit them.
+
+    Each round reads the open-orders table once, then cancels the ids still
+    in it with one in-page script that finds every button by its
+    data-orderid, so nothing goes stale between cancels. Ids that failed are
+    retried in the next round, up to `max_rounds`. With a `deadline`
+    (time.time()), no cancel is started after it passes.
+    """
+    latency = LATENCY if latency is None else latency
+    pending = list(dict.fromkeys(str(i) for i in order_ids if i))
+    results: Dict[str, Optional[bool]] = {oid: False for oid in pending}
+
+    for round_no in range(max_rounds + 1):
+        if round_no > 0:
+            time.sleep(0.5)  # let the table catch up with the last batch
+        open_ids = _open_order_ids(driver)
+        if open_ids is not None:
+            for oid in pending:
+                if oid not in open_ids:
+                    results[oid] = None
+            pending = [oid for oid in pending if oid in open_ids]
+        if not pending or round_no == max_rounds:
+            break  # the last round only checks what is left
+
+        if round_no > 0:
+            if FLAG_VIC_ORDERS_DEBUGGING_PRINT:
+                print(f"[CANCEL] Retry {round_no}: {len(pending)} order(s) left")
 
-            first_row = rows[0]
+        budget = None
+        if deadline is not None:
+            budget = deadline - time.time()
+            if budget <= 0:
+                break
 
-            if FLAG_VIC_ORDERS_DEBUGGING_PRINT:
+        raw = _run_cancel_batch(driver, pending, popup_timeout, budget)
+        failed = []
+        for oid, res in zip(pending, raw):
+            ok = bool(res.get("ok"))
+            # no cancel was attempted for these, so there is nothing to time
+            if res.get("stage") not in ("skipped", "missing"):
+                latency.add(
+                    "batch_cancel",
+                    res.get("side") or "-",
+                    "total" if ok else "total_failed",
+                    float(res.get("ms") or 0.0) / 1000.0,
+                )
+            if ok:
+                results[oid] = True
+                continue
+            failed.append(oid)
+            if res.get("stage") not in ("skipped", "missing"):
                 print(
-                    f"[CANCEL] Cancelling {side.upper()} order {cancelled+1} "
-                    f"@ {first_row.price:.3f} (ID: {first_row.order_id})"
+                    f"[CANCEL WARN] Order {oid} failed at {res.get('stage')}: "
+                    f"{res.get('error')}"
                 )
+        # ids the script never returned a result for are retried too
+        pending = failed + pending[len(raw) :]
 
-            if cancel_open_orders_row(driver, first_row, timeout=timeout):
-                cancelled += 1
-                time.sleep(0.3)
-            else:
-                time.sleep(0.5)
+    if FLAG_VIC_ORDERS_DEBUGGING_PRINT:
+        left = [oid for oid, ok in results.items() if ok is False]
+        gone = sum(1 for ok in results.values() if ok is None)
+        print(
+            f"[CANCEL] Batch: {len(results) - len(left) - gone}/{len(results)} cancelled"
+            + (f", {gone} already gone" if gone else "")
+            + (f", still open: {left}" if left else "")
+        )
+    return results
 
-        except Exception as e:
-            print(f"[CANCEL ERROR] Error during iteration {iteration}: {e}")
-            time.sleep(0.5)
-            continue
 
-    remaining_rows = read_open_orders_side(driver, side, timeout=5)
-    total = cancelled + len(remaining_rows)
+def _cancel_all_open_orders_side(
+    driver, side: Side, timeout: int = 15
+) -> tuple[int, int]:
+
+    if FLAG_VIC_ORDERS_DEBUGGING_PRINT:
+        print(f"[CANCEL] Starting {side.upper()} orders cancellation...")
+
+    rows = read_open_orders_side(driver, side, timeout=10)
+    if not rows:
+        if FLAG_VIC_ORDERS_DEBUGGING_PRINT:
+            print(f"[CANCEL] No {side.upper()} orders to cancel")
+        return (0, 0)
+
+    results = cancel_orders_by_id(driver, [r.order_id for r in rows], popup_timeout=timeout)
+    # an order that is gone is off the book too, whoever took it off
+    cancelled = sum(1 for ok in results.values() if ok is not False)
 
     if FLAG_VIC_ORDERS_DEBUGGING_PRINT:
-        print(
-            f"[CANCEL] ⚠️ Max iterations reached. "
-            f"Cancelled {cancelled}/{total} {side.upper()} orders"
-        )
+        if cancelled == len(results):
+            print(f"[CANCEL] ✅ All {cancelled} {side.upper()} orders cancelled")
+        else:
+            print(
+                f"[CANCEL] ⚠️ Cancelled {cancelled}/{len(results)} {side.upper()} orders"
+            )
 
-    return (cancelled, total)
+    return (cancelled, len(results))
 
 
 def cancel_all_open_orders(driver, timeout: int = 15) -> tuple[int, int]:
@@ -0,0 +1,230 @@
+# vic_popup.py
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Page hook: a MutationObserver bumps `seq` every time a SweetAlert modal opens
+# (or its content is replaced while open) and records open/close timestamps.
+# Readiness (button visible, no running animation) is computed on demand.
+_INSTALL_HOOK_JS = """
+if (window.__mmSwal) { return true; }
+const st = { seq: 0, open: false, openedAt: 0, closedAt: 0, text: "" };
+const overlayOpen = () => document.querySelector(".swal-overlay.swal-overlay--show-modal");
+const readText = (ov) => {
+    const t = ov && ov.querySelector(".swal-text, .swal-title");
+    return t ? (t.textContent || "").trim() : "";
+};
+const sync = () => {
+    const ov = overlayOpen();
+    if (ov) {
+        const text = readText(ov);
+        if (!st.open || text !== st.text) {
+            st.seq += 1;
+            st.openedAt = performance.now();
+        }
+        st.open = true;
+        st.text = text;
+    } else if (st.open) {
+        st.open = false;
+        st.closedAt = performance.now();
+    }
+};
+new MutationObserver(sync).observe(document.documentElement, {
+    subtree: true, childList: true, characterData: true,
+    attributes: true, attributeFilter: ["class", "style"],
+});
+st.status = () => {
+    const ov = overlayOpen();
+    let ready = false;
+    if (ov) {
+        const btn = ov.querySelector("button.swal-button--ok, button.swal-button--confirm");
+        const modal = ov.querySelector(".swal-modal");
+        const r = btn ? btn.getBoundingClientRect() : null;
+        const animating = [ov, modal].some(
+            (el) => el && el.getAnimations && el.getAnimations().some((a) => a.playState === "running")
+        );
+        ready = !!(r && r.width > 0 && r.height > 0 && !btn.disabled && !animating);
+    }
+    return {
+        seq: st.seq, open: !!ov, ready: ready, text: st.text,
+        openFor: ov ? performance.now() - st.openedAt : 0,
+    };
+};
+sync();
+window.__mmSwal = st;
+return true;
+"""
+
+_STATUS_JS = """
+return window.__mmSwal ? window.__mmSwal.status() : null;
+"""
+
+# Click only if the expected popup is the one currently showing and ready.
+_CLICK_OK_JS = """
+const st = window.__mmSwal;
+if (!st) { return false; }
+const s = st.status();
+if (!s.open || !s.ready || s.seq !== arguments[0]) { return false; }
+const btn = document.querySelector(
+    ".swal-overlay--show-modal button.swal-button--ok, .swal-overlay--show-modal button.swal-button--confirm"
+);
+if (!btn) { return false; }
+btn.click();
+return true;
+"""
+
+_POLL_SEC = 0.03
+
+
+@dataclass
+class PopupTiming:
+    description: str
+    appear_sec: float  # wait start → popup open
+    ready_sec: float  # popup open → button clickable (animation done)
+    dismiss_sec: float  # click → popup closed or replaced
+    text: str = ""
+
+
+POPUP_TIMINGS: List[PopupTiming] = []
+_MAX_TIMINGS = 1000
+
+
+def _record(timing: PopupTiming):
+    POPUP_TIMINGS.append(timing)
+    if len(POPUP_TIMINGS) > _MAX_TIMINGS:
+        del POPUP_TIMINGS[: len(POPUP_TIMINGS) - _MAX_TIMINGS]
+
+
+def popup_timing_summary() -> Dict[str, Dict[str, float]]:
+    """Average appear/ready/dismiss seconds per popup description."""
+    out: Dict[str, Dict[str, float]] = {}
+    for desc in {t.description for t in POPUP_TIMINGS}:
+        rows = [t for t in POPUP_TIMINGS if t.description == desc]
+        n = len(rows)
+        out[desc] = {
+            "count": n,
+            "appear_avg": sum(t.appear_sec for t in rows) / n,
+            "ready_avg": sum(t.ready_sec for t in rows) / n,
+            "dismiss_avg": sum(t.dismiss_sec for t in rows) / n,
+        }
+    return out
+
+
+def install_popup_hook(driver) -> bool:
+    try:
+        return bool(driver.execute_script(_INSTALL_HOOK_JS))
+    except Exception as e:
+        print(f"[POPUP WARN] Could not install popup hook: {e}")
+        return False
+
+
+def popup_status(driver) -> Optional[dict]:
+    """Current popup state; installs the hook if the page was reloaded."""
+    try:
+        status = driver.execute_script(_STATUS_JS)
+        if status is None and install_popup_hook(driver):
+            status = driver.execute_script(_STATUS_JS)
+        return status
+    except Exception:
+        return None
+
+
+def current_popup_seq(driver) -> int:
+    status = popup_status(driver)
+    return int(status["seq"]) if status else 0
+
+
+def wait_for_popup(driver, after_seq: int, timeout: float) -> Optional[dict]:
+    """Wait until a popup newer than `after_seq` is open and clickable."""
+    end_time = time.time() + timeout
+    while time.time() < end_time:
+        status = popup_status(driver)
+        if status and status["open"] and status["seq"] > after_seq and status["ready"]:
+            return status
+        time.sleep(_POLL_SEC)
+    return None
+
+
+def wait_for_popup_closed(driver, seq: int, timeout: float) -> bool:
+    """
+    Wait until popup `seq` is closed or replaced by a newer one. A failed
+    status read proves nothing, so it is polled again; False on timeout.
+    """
+    end_time = time.time() + timeout
+    while time.time() < end_time:
+        status = popup_status(driver)
+        if status is not None and (not status["open"] or status["seq"] != seq):
+            return True
+        time.sleep(_POLL_SEC)
+    return False
+
+
+def handle_popup(
+    driver,
+    after_seq: int,
+    timeout: float = 20,
+    popup_description: str = "popup",
+    debug_tag: str = "POPUP",
+    debug: bool = False,
+    span=None,
+    appear_stage: str = "popup_appear",
+    closed_stage: str = "popup_dismiss",
+) -> Optional[int]:
+    """
+    Wait for the next popup after `after_seq`, click its OK/confirm button as
+    soon as it is ready and wait for it to go away. Returns the handled
+    popup's seq, or None when it never appeared or could not be dismissed.
+
+    With a LatencySpan, marks `appear_stage` once the popup is clickable and
+    `closed_stage` once it is gone.
+    """
+    start = time.time()
+    opened = wait_for_popup(driver, after_seq, timeout)
+    if opened is None:
+        print(f"[{debug_tag} WARN] {popup_description}: No popup within {timeout}s.")
+        return None
+
+    seq = int(opened["seq"])
+    appeared = time.time()
+    if span is not None:
+        span.mark(appear_stage)
+    if debug:
+        print(f"[{debug_tag}] {popup_description}: Popup text = '{opened['text']}'")
+
+    clicked_at = None
+    while time.time() - start < timeout:
+        try:
+            if driver.execute_script(_CLICK_OK_JS, seq):
+                clicked_at = time.time()
+                break
+        except Exception as e:
+            print(f"[{debug_tag} WARN] {popup_description}: Click failed - {e}")
+        status = popup_status(driver)
+        if status is not None and (not status["open"] or status["seq"] != seq):
+            break  # closed by the page itself
+        time.sleep(_POLL_SEC)
+
+    if clicked_at is None:
+        clicked_at = time.time()
+
+    remaining = max(0.5, timeout - (time.time() - start))
+    if not wait_for_popup_closed(driver, seq, remaining):
+        print(f"[{debug_tag} ERROR] {popup_description}: Popup did not close.")
+        return None
+    if span is not None:
+        span.mark(closed_stage)
+
+    _record(
+        PopupTiming(
+            description=popup_description,
+            appear_sec=appeared - start,
+            ready_sec=max(0.0, float(opened["openFor"]) / 1000.0),
+            dismiss_sec=time.time() - clicked_at,
+            text=opened["text"],
+        )
+    )
+    if debug:
+        print(f"[{debug_tag}] {popup_description}: Button clicked successfully.")
+    return seq
@@ -1,23 +1,120 @@
 from __future__ import annotations
 
-import time
-from selenium.webdriver.common.by import By
+from typing import Dict, List, Optional, Sequence, Tuple
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import (
-    ElementClickInterceptedException,
-    TimeoutException,
-    StaleElementReferenceException,
-)
-from config import FLAG_VIC_TRADE_DEBUGGING_PRINT
+from selenium.common.exceptions import ElementClickInterceptedException
+from config import FLAG_VIC_TRADE_DEBUGGING_PRINT, FLAG_VIC_SCRIPTED_INPUT_ENABLE
+from modes.mm.vic_popup import current_popup_seq, handle_popup
+from modes.mm.latency import LATENCY, LatencyRecorder
+from modes.utils_wait import WaitBudget, ensure_script_timeout, wait_js
+
+# Element (by id) once no popup overlay is showing and it is visible + enabled
+_READY_BY_ID_JS = """
+if (document.querySelector(".swal-overlay.swal-overlay--show-modal")) { return null; }
+const el = document.getElementById(args[0]);
+if (!el || el.disabled) { return null; }
+const r = el.getBoundingClientRect();
+return (r.width > 0 && r.height > 0) ? el : null;
+"""
+
+
+# Fill several inputs at once: waits (via wait_js) until no popup is showing
+# and every field is editable, then sets each value through the native setter
+# and fires the events the page's handlers listen for. Returns the values the
+# fields read back.
+_FILL_INPUTS_JS = """
+if (document.querySelector(".swal-overlay.swal-overlay--show-modal")) { return null; }
+const fields = args[0];
+const els = [];
+for (const f of fields) {
+    const el = document.getElementById(f[0]);
+    if (!el || el.disabled || el.readOnly) { return null; }
+    els.push(el);
+}
+const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, "value").set;
+const out = {};
+els.forEach((el, i) => {
+    el.focus();
+    setValue.call(el, fields[i][1]);
+    for (const type of ["input", "keyup", "change"]) {
+        el.dispatchEvent(new Event(type, { bubbles: true }));
+    }
+    out[fields[i][0]] = el.value;
+});
+return out;
+"""
+
+FORM_FIELDS = {
+    "bid": ("bid_price", "bid_coin", "btnBuying"),
+    "ask": ("ask_price", "ask_coin", "btnSelling"),
+}
+
+
+def format_price(price: float) -> str:
+    return f"{price:.6f}".rstrip("0").rstrip(".")
+
+
+def format_qty(qty: float) -> str:
+    return f"{qty:.8f}".rstrip("0").rstrip(".")
+
+
+def order_form_values(side: str, price: float, qty: float) -> Dict[str, str]:
+    """{input id: value} for one side's order form."""
+    price_id, qty_id, _ = FORM_FIELDS[side]
+    return {price_id: format_price(price), qty_id: format_qty(qty)}
+
+
+def _same_number(read_back, expected: str) -> bool:
+    try:
+        return float(str(read_back).replace(",", "")) == float(expected)
+    except (TypeError, ValueError):
+        return False
+
+
+def fill_inputs(
+    driver,
+    values: Dict[str, str],
+    timeout: float = 10,
+    budget: Optional[WaitBudget] = None,
+) -> bool:
+    """
+    Fill every input in `values` (id → text) in one script call and verify
+    the fields read back the same numbers. Both order forms can be filled
+    together by merging two order_form_values() dicts.
+    """
+    read_back = wait_js(
+        driver,
+        _FILL_INPUTS_JS,
+        [[k, v] for k, v in values.items()],
+        timeout=timeout,
+        site="trade.fill",
+        budget=budget,
+    )
+    mismatched = {
+        k: read_back.get(k)
+        for k, v in values.items()
+        if not _same_number(read_back.get(k), v)
+    }
+    if mismatched:
+        print(f"[TRADE WARN] Scripted fill did not stick: {mismatched}")
+        return False
+    return True
+
 
+def _wait_ready(driver, element_id: str, timeout: float, site: str, budget=None):
+    return wait_js(
+        driver, _READY_BY_ID_JS, element_id, timeout=timeout, site=site, budget=budget
+    )
 
-def _set_input_value(driver, by, locator, value: str, timeout: int = 10):
-    wait = WebDriverWait(driver, timeout)
-    wait.until(EC.invisibility_of_element_located((By.CLASS_NAME, "swal-overlay")))
 
-    el = wait.until(EC.element_to_be_clickable((by, locator)))
+def _set_input_value(
+    driver,
+    element_id: str,
+    value: str,
+    timeout: int = 10,
+    budget: Optional[WaitBudget] = None,
+):
+    el = _wait_ready(driver, element_id, timeout, "trade.input", budget)
     try:
         el.click()
     except ElementClickInterceptedException:
@@ -30,208 +127,257 @@ def _set_input_value(driver, by, locator, value: str, timeout: int = 10):
     return el
 
 
-def _get_popup_text(driver):
-    try:
-        modal = driver.find_element(By.CLASS_NAME, "swal-modal")
-        text_el = modal.find_element(By.CLASS_NAME, "swal-text")
-        return text_el.text.strip()
-    except:
-        return ""
-
-
-def _click_ok_button(
-    driver,
-    timeout: int = 20,
-    popup_description: str = "popup",
-    wait_animation: float = 1.2,
-):
-    wait = WebDriverWait(driver, timeout)
-
-    try:
-        wait.until(EC.visibility_of_element_located((By.CLASS_NAME, "swal-overlay")))
-
-        ok_btn = wait.until(
-            EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "button.swal-button--ok, button.swal-button--confirm")
-            )
-        )
-
-        if FLAG_VIC_TRADE_DEBUGGING_PRINT:
-            print(
-                f"[TRADE] {popup_description}: Waiting {wait_animation}s for animation..."
-            )
-        time.sleep(wait_animation)
-
-        popup_text = _get_popup_text(driver)
-        if FLAG_VIC_TRADE_DEBUGGING_PRINT:
-            print(f"[TRADE] {popup_description}: Popup text = '{popup_text}'")
-
-        wait.until(EC.element_to_be_clickable(ok_btn))
-
-        max_attempts = 3
-        for attempt in range(max_attempts):
-            try:
-                ok_btn.click()
-                if FLAG_VIC_TRADE_DEBUGGING_PRINT:
-                    print(
-                        f"[TRADE] {popup_description}: Click succeeded (attempt {attempt + 1})."
-                    )
-                break
-            except ElementClickInterceptedException:
-                if attempt < max_attempts - 1:
-                    print(
-                        f"[TRADE WARN] {popup_description}: Click intercepted, retrying..."
-                    )
-                    time.sleep(0.5)
-                else:
-                    driver.execute_script("arguments[0].click();", ok_btn)
-                    if FLAG_VIC_TRADE_DEBUGGING_PRINT:
-                        print(f"[TRADE] {popup_description}: JavaScript click used.")
-
-        time.sleep(0.5)
-        if FLAG_VIC_TRADE_DEBUGGING_PRINT:
-            print(f"[TRADE] {popup_description}: Button clicked successfully.")
-        return True
-
-    except TimeoutException as e:
-        print(f"[TRADE ERROR] {popup_description}: Timeout - {e}")
-        return False
-    except Exception as e:
-        print(f"[TRADE ERROR] {popup_description}: Unexpected error - {e}")
-        return False
-
-
-def _wait_for_popup_to_appear(driver, max_wait: int = 30, check_interval: float = 0.3):
-
-    if FLAG_VIC_TRADE_DEBUGGING_PRINT:
-        print(f"[TRADE] Waiting for popup to appear (max {max_wait}s)...")
-
-    end_time = time.time() + max_wait
-
-    while time.time() < end_time:
-        try:
-            overlays = driver.find_elements(By.CLASS_NAME, "swal-overlay")
-
-            for overlay in overlays:
-                try:
-                    if overlay.is_displayed():
-                        buttons = overlay.find_elements(
-                            By.CSS_SELECTOR,
-                            "button.swal-button--ok, button.swal-button--confirm",
-                        )
-                        if buttons and buttons[0].is_displayed():
-                            if FLAG_VIC_TRADE_DEBUGGING_PRINT:
-                                print("[TRADE] Popup with OK button detected!")
-                            return True
-                except (StaleElementReferenceException, Exception):
-                    continue
-
-            time.sleep(check_interval)
-
-        except Exception as e:
-            print(f"[TRADE WARN] Error while waiting for popup: {e}")
-            time.sleep(check_interval)
-
-    print(f"[TRADE WARN] No popup appeared within {max_wait} seconds.")
-    return False
-
-
-def _is_popup_visible(driver):
-    try:
-        overlays = driver.find_elements(By.CLASS_NAME, "swal-overlay")
-        for overlay in overlays:
-            if overlay.is_displayed():
-                buttons = overlay.find_elements(
-                    By.CSS_SELECTOR,
-                    "button.swal-button--ok, button.swal-button--confirm",
-                )
-                if buttons and buttons[0].is_displayed():
-                    return True
-        return False
-    except:
-        return False
-
-
 def place_limit_order(
-    driver, side: str, price: float, qty: float, timeout: int = 15
+    driver,
+    side: str,
+    price: float,
+    qty: float,
+    timeout: int = 15,
+    latency: Optional[LatencyRecorder] = None,
 ) -> bool:
     if qty <= 0 or price <= 0:
         return False
 
-    price_str = f"{price:.6f}".rstrip("0").rstrip(".")
-    qty_str = f"{qty:.8f}".rstrip("0").rstrip(".")
+    if side not in ("bid", "ask"):
+        print(f"[TRADE ERROR] Invalid side: {side}")
+        return False
 
+    span = (LATENCY if latency is None else latency).span("place", side)
+    budget = WaitBudget(timeout)
+    ok = False
     try:
-        if side == "bid":
-            _set_input_value(driver, By.ID, "bid_price", price_str, timeout=timeout)
-            _set_input_value(driver, By.ID, "bid_coin", qty_str, timeout=timeout)
-            btn = WebDriverWait(driver, timeout).until(
-                EC.element_to_be_clickable((By.ID, "btnBuying"))
-            )
-            btn.click()
-            order_type = "BUY"
-        elif side == "ask":
-            _set_input_value(driver, By.ID, "ask_price", price_str, timeout=timeout)
-            _set_input_value(driver, By.ID, "ask_coin", qty_str, timeout=timeout)
-            btn = WebDriverWait(driver, timeout).until(
-                EC.element_to_be_clickable((By.ID, "btnSelling"))
-            )
-            btn.click()
-            order_type = "SELL"
-        else:
-            print(f"[TRADE ERROR] Invalid side: {side}")
-            return False
+        seq_before = current_popup_seq(driver)
+
+        price_id, qty_id, button_id = FORM_FIELDS[side]
+        order_type = "BUY" if side == "bid" else "SELL"
+        values = order_form_values(side, price, qty)
+
+        filled = FLAG_VIC_SCRIPTED_INPUT_ENABLE and fill_inputs(
+            driver, values, timeout=timeout, budget=budget
+        )
+        if not filled:
+            # keystroke path: slower, but goes through the page like a user
+            for input_id in (price_id, qty_id):
+                _set_input_value(
+                    driver, input_id, values[input_id], timeout=timeout, budget=budget
+                )
+        span.mark("fill")
+        btn = _wait_ready(driver, button_id, timeout, "trade.button", budget)
+        btn.click()
+        span.mark("click")
         if FLAG_VIC_TRADE_DEBUGGING_PRINT:
             print(f"[TRADE] {order_type} button clicked, waiting for first popup...")
 
-        if not _wait_for_popup_to_appear(driver, max_wait=10, check_interval=0.3):
-            print("[TRADE ERROR] First popup did not appear.")
-            return False
-
-        if not _click_ok_button(
+        confirm_seq = handle_popup(
             driver,
-            timeout=timeout,
+            after_seq=seq_before,
+            timeout=10,
             popup_description="First confirmation",
-            wait_animation=1.2,
-        ):
-            print("[TRADE ERROR] Failed to click first popup.")
+            debug_tag="TRADE",
+            debug=FLAG_VIC_TRADE_DEBUGGING_PRINT,
+            span=span,
+            appear_stage="popup1_appear",
+            closed_stage="popup1_dismiss",
+        )
+        if confirm_seq is None:
+            print("[TRADE ERROR] Failed to handle first popup.")
             return False
 
         if FLAG_VIC_TRADE_DEBUGGING_PRINT:
-            print("[TRADE] First popup clicked. Checking for second popup...")
-
-        time.sleep(0.8)
-
-        if _is_popup_visible(driver):
-            if FLAG_VIC_TRADE_DEBUGGING_PRINT:
-                print("[TRADE] Second popup already visible!")
-        else:
-            if not _wait_for_popup_to_appear(driver, max_wait=30, check_interval=0.3):
-                print(
-                    "[TRADE WARN] Second popup did not appear. Order may have failed."
-                )
-                return False
+            print("[TRADE] First popup clicked. Waiting for second popup...")
 
-        if not _click_ok_button(
+        success_seq = handle_popup(
             driver,
+            after_seq=confirm_seq,
             timeout=30,
             popup_description="Success notification",
-            wait_animation=1.5,
-        ):
-            print("[TRADE ERROR] Failed to click second popup.")
+            debug_tag="TRADE",
+            debug=FLAG_VIC_TRADE_DEBUGGING_PRINT,
+            span=span,
+            appear_stage="popup2_appear",
+            closed_stage="overlay_gone",
+        )
+        if success_seq is None:
+            print("[TRADE WARN] Second popup not handled. Order may have failed.")
             return False
 
-        try:
-            WebDriverWait(driver, 5).until(
-                EC.invisibility_of_element_located((By.CLASS_NAME, "swal-overlay"))
-            )
-        except:
-            pass
-
         if FLAG_VIC_TRADE_DEBUGGING_PRINT:
             print(f"[TRADE] {order_type} order completed successfully.")
+        ok = True
         return True
 
     except Exception as e:
         print(f"[TRADE ERROR] place_limit_order failed: {e}")
         return False
+    finally:
+        span.finish(ok)
+
+
+# Places a list of orders inside the page, one after another: wait for no
+# popup, fill, click, confirm the first popup, dismiss the result popup, wait
+# for the overlay to go. Stops at the first failure (the page state is then
+# unknown) and reports the rest as "skipped".
+# Result per order: {ok, stage, text, ms}.
+_PLACE_BATCH_JS = """
+const orders = arguments[0];
+const popupTimeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+const sleep = (ms) => new Promise((r) => setTimeout(r, ms));
+const overlay = () => document.querySelector(".swal-overlay.swal-overlay--show-modal");
+const popupText = (ov) => {
+    const t = ov && ov.querySelector(".swal-text, .swal-title");
+    return t ? (t.textContent || "").trim() : "";
+};
+const readyButton = () => {
+    const ov = overlay();
+    if (!ov) { return null; }
+    const btn = ov.querySelector("button.swal-button--ok, button.swal-button--confirm");
+    const modal = ov.querySelector(".swal-modal");
+    if (!btn || btn.disabled) { return null; }
+    const r = btn.getBoundingClientRect();
+    if (!(r.width > 0 && r.height > 0)) { return null; }
+    const animating = [ov, modal].some(
+        (el) => el && el.getAnimations && el.getAnimations().some((a) => a.playState === "running")
+    );
+    return animating ? null : btn;
+};
+const until = async (cond, timeoutMs) => {
+    const end = performance.now() + timeoutMs;
+    while (performance.now() < end) {
+        const v = cond();
+        if (v) { return v; }
+        await sleep(15);
+    }
+    return null;
+};
+const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, "value").set;
+const fill = (id, value) => {
+    const el = document.getElementById(id);
+    if (!el || el.disabled || el.readOnly) { return false; }
+    el.focus();
+    setValue.call(el, value);
+    for (const type of ["input", "keyup", "change"]) {
+        el.dispatchEvent(new Event(type, { bubbles: true }));
+    }
+    return parseFloat(String(el.value).replace(/,/g, "")) === parseFloat(value);
+};
+const step = async (res, stage, cond) => {
+    res.stage = stage;
+    const v = await until(cond, popupTimeoutMs);
+    if (!v) { throw new Error(stage + " timeout"); }
+    return v;
+};
+(async () => {
+    const results = [];
+    let failed = false;
+    for (const o of orders) {
+        const res = { ok: false, stage: "skipped", text: "", ms: 0 };
+        results.push(res);
+        if (failed) { continue; }
+        const t0 = performance.now();
+        try {
+            await step(res, "overlay", () => !overlay());
+            res.stage = "fill";
+            if (!fill(o.priceId, o.price) || !fill(o.qtyId, o.qty)) {
+                throw new Error("fill did not stick");
+            }
+            const submit = await step(res, "click", () => {
+                const b = document.getElementById(o.buttonId);
+                return b && !b.disabled ? b : null;
+            });
+            submit.click();
+            const confirm = await step(res, "popup1", readyButton);
+            const firstText = popupText(overlay());
+            confirm.click();
+            await step(res, "popup1_dismiss", () => {
+                const ov = overlay();
+                return !ov || popupText(ov) !== firstText;
+            });
+            const result = await step(res, "popup2", readyButton);
+            res.text = popupText(overlay());
+            result.click();
+            await step(res, "overlay_gone", () => !overlay());
+            res.ok = true;
+            res.stage = "done";
+        } catch (e) {
+            res.error = String(e && e.message ? e.message : e);
+            failed = true;
+        }
+        res.ms = performance.now() - t0;
+    }
+    return results;
+})().then(done, (e) => done({ error: String(e) }));
+"""
+
+
+def place_limit_orders_batch(
+    driver,
+    orders: Sequence[Tuple[str, float, float]],
+    popup_timeout: float = 10,
+    latency: Optional[LatencyRecorder] = None,
+) -> List[bool]:
+    """
+    Place [(side, price, qty), ...] with one execute_async_script call and
+    return a success flag per order. The script stops at the first failure
+    and leaves the page in an unknown state (a popup or overlay may still be
+    up), so the orders it never reached come back False; the next reconcile
+    and refill place them again from a fresh read of the table.
+    """
+    latency = LATENCY if latency is None else latency
+    results: List[bool] = [False] * len(orders)
+    payload = []
+    index = []
+    for i, (side, price, qty) in enumerate(orders):
+        if side not in FORM_FIELDS or qty <= 0 or price <= 0:
+            print(f"[TRADE ERROR] Invalid batch order: {side} {price} x {qty}")
+            continue
+        price_id, qty_id, button_id = FORM_FIELDS[side]
+        payload.append(
+            {
+                "priceId": price_id,
+                "qtyId": qty_id,
+                "buttonId": button_id,
+                "price": format_price(price),
+                "qty": format_qty(qty),
+            }
+        )
+        index.append(i)
+
+    if not payload:
+        return results
+
+    # every stage has its own popup timeout; 6 stages per order is the worst case
+    ensure_script_timeout(driver, len(payload) * 6 * popup_timeout)
+    try:
+        raw = driver.execute_async_script(
+            _PLACE_BATCH_JS, payload, int(popup_timeout * 1000)
+        )
+    except Exception as e:
+        print(f"[TRADE ERROR] Batch placement script failed: {e}")
+        return results
+
+    if not isinstance(raw, list):
+        print(f"[TRADE ERROR] Batch placement returned {raw!r}")
+        return results
+
+    for i, res in zip(index, raw):
+        side, price, qty = orders[i]
+        if res.get("stage") == "skipped":
+            continue
+
+        results[i] = bool(res.get("ok"))
+        latency.add(
+            "batch",
+            side,
+            "total" if results[i] else "total_failed",
+            float(res.get("ms") or 0.0) / 1000.0,
+        )
+        if not results[i]:
+            print(
+                f"[TRADE WARN] Batch order {side.upper()} {price} x {qty} failed "
+                f"at {res.get('stage')}: {res.get('error')}"
+            )
+        elif FLAG_VIC_TRADE_DEBUGGING_PRINT:
+            print(f"[TRADE] Batch {side.upper()} {price} x {qty} → {res.get('text')}")
+
+    return results
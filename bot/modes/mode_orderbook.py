@@ -1,12 +1,20 @@
 # orderbook_mode.py
 import time
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from modes.utils_driver import init_driver
+from modes.utils_wait import wait_until
 from modes.utils_ui import clear_console
 from modes.utils_ui import validate_login_or_exit
-from config import ORDERBOOK_REFRESH_INTERVAL
+from modes.mm.vic_orderbook import OrderbookMirror
+from config import (
+    ORDERBOOK_REFRESH_INTERVAL,
+    ORDERBOOK_MIRROR_DRAIN_SEC,
+    FLAG_VIC_ORDERBOOK_MIRROR_ENABLE,
+)
+
+_ASK_CONTAINER = "#mCSB_2_container"
+_BID_CONTAINER = "#mCSB_3_container"
 
 
 def _parse_rows(rows):
@@ -44,18 +52,16 @@ def _get_vic_last_price(driver) -> float:
 
 def _fetch_vic_orderbook_snapshot(driver):
     ask_rows = driver.find_elements(
-        By.CSS_SELECTOR, "#mCSB_2_container > a.bidding-table-rows"
+        By.CSS_SELECTOR, f"{_ASK_CONTAINER} > a.bidding-table-rows"
     )
     bid_rows = driver.find_elements(
-        By.CSS_SELECTOR, "#mCSB_3_container > a.bidding-table-rows"
+        By.CSS_SELECTOR, f"{_BID_CONTAINER} > a.bidding-table-rows"
     )
 
     ask_prices, ask_amounts = _parse_rows(ask_rows)
     bid_prices, bid_amounts = _parse_rows(bid_rows)
 
-    coin_name = driver.find_element(By.CSS_SELECTOR, "b.pair-title").text.strip()
-    ticker_text = driver.find_element(By.CSS_SELECTOR, "span.unit").text.strip()
-    coin_ticker = ticker_text.replace("/USDT", "")
+    coin_name, coin_ticker = _read_pair_title(driver)
 
     if len(ask_prices) < 10 or len(bid_prices) < 10:
         return None
@@ -71,6 +77,35 @@ def _fetch_vic_orderbook_snapshot(driver):
     return coin_name, coin_ticker, last_price, asks, bids
 
 
+def _new_mirror(driver) -> OrderbookMirror:
+    return OrderbookMirror(
+        driver,
+        containers={"ask": _ASK_CONTAINER, "bid": _BID_CONTAINER},
+        price_selector=".col-price",
+        qty_selector=".col-amount",
+        key="display",
+    )
+
+
+def _read_pair_title(driver):
+    coin_name = driver.find_element(By.CSS_SELECTOR, "b.pair-title").text.strip()
+    ticker_text = driver.find_element(By.CSS_SELECTOR, "span.unit").text.strip()
+    return coin_name, ticker_text.replace("/USDT", "")
+
+
+def _mirror_orderbook_snapshot(driver, mirror: OrderbookMirror, title):
+    """Same shape as _fetch_vic_orderbook_snapshot, from the mirror's local book"""
+    asks_best_first = mirror.levels("ask") or []
+    bids = mirror.levels("bid") or []
+    if len(asks_best_first) < 10 or len(bids) < 10:
+        return None
+
+    # asks are printed from the 10th level down to the best one
+    asks = list(reversed(asks_best_first[:10]))
+    coin_name, coin_ticker = title
+    return coin_name, coin_ticker, _get_vic_last_price(driver), asks, bids[:10]
+
+
 def _print_orderbook(coin_name, coin_ticker, last_price, asks, bids):
     print(f"┌───────────── {time.strftime('%H:%M:%S')}  {coin_ticker} ─────────────┐")
 
@@ -88,22 +123,46 @@ def _print_orderbook(coin_name, coin_ticker, last_price, asks, bids):
     print("\n└" + "─" * 41 + "┘\n")
 
 
-def run_vic_orderbook_mode(vic_url: str):
-    driver = init_driver()
+def run_vic_orderbook_mode(vic_url: str, driver=None):
+    # a shared (session) driver is already logged in and is not ours to quit
+    owns_driver = driver is None
+    if owns_driver:
+        driver = init_driver()
 
     try:
-        driver.get(f"{vic_url}/account/login")
-
-        validate_login_or_exit(driver=driver, mode=1)
+        if owns_driver:
+            driver.get(f"{vic_url}/account/login")
+            validate_login_or_exit(driver=driver, mode=1)
 
         driver.get(f"{vic_url}/trade")
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "a.bidding-table-rows"))
+        wait_until(
+            driver,
+            EC.presence_of_element_located((By.CSS_SELECTOR, "a.bidding-table-rows")),
+            20,
+            "page.load",
         )
 
+        # the mirror pulls only changed rows every ORDERBOOK_MIRROR_DRAIN_SEC
+        # and redraws on change; without it, re-scrape every refresh interval
+        mirror = _new_mirror(driver) if FLAG_VIC_ORDERBOOK_MIRROR_ENABLE else None
+        title = None
+        last_draw = 0.0
+
         while True:
             try:
-                snapshot = _fetch_vic_orderbook_snapshot(driver)
+                changes = mirror.sync() if mirror is not None else None
+                if changes is None:
+                    snapshot = _fetch_vic_orderbook_snapshot(driver)
+                    interval = ORDERBOOK_REFRESH_INTERVAL
+                else:
+                    if changes == 0 and time.time() - last_draw < ORDERBOOK_REFRESH_INTERVAL:
+                        time.sleep(ORDERBOOK_MIRROR_DRAIN_SEC)
+                        continue
+                    if title is None:
+                        title = _read_pair_title(driver)
+                    snapshot = _mirror_orderbook_snapshot(driver, mirror, title)
+                    interval = ORDERBOOK_MIRROR_DRAIN_SEC
+
                 if snapshot is None:
                     time.sleep(0.5)
                     continue
@@ -111,8 +170,9 @@ def run_vic_orderbook_mode(vic_url: str):
                 coin_name, coin_ticker, last_price, asks, bids = snapshot
                 clear_console()
                 _print_orderbook(coin_name, coin_ticker, last_price, asks, bids)
+                last_draw = time.time()
 
-                time.sleep(ORDERBOOK_REFRESH_INTERVAL)
+                time.sleep(interval)
 
             except KeyboardInterrupt:
                 print("\nStopped by user. Returning to menu...")
@@ -123,5 +183,6 @@ def run_vic_orderbook_mode(vic_url: str):
                 time.sleep(1)
 
     finally:
-        driver.quit()
-        print("Driver shutdown complete.")
+        if owns_driver:
+            driver.quit()
+            print("Driver shutdown complete.")
@@ -2,9 +2,9 @@
 import time
 import random
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from modes.utils_driver import init_driver
+from modes.utils_wait import wait_until
 from modes.utils_ui import clear_console
 from modes.utils_ui import validate_login_or_exit
 from modes.market_data import get_binance_price
@@ -21,17 +21,22 @@ def _get_current_binance_symbol_from_vic(driver) -> str:
     return unit_text.replace("/", "").upper()
 
 
-def print_binance_referenced_price_mode(VIC_URL: str):
-    driver = init_driver()
+def print_binance_referenced_price_mode(VIC_URL: str, driver=None):
+    owns_driver = driver is None
+    if owns_driver:
+        driver = init_driver()
 
     try:
-        driver.get(f"{VIC_URL}/account/login")
-
-        validate_login_or_exit(driver=driver, mode=2)
+        if owns_driver:
+            driver.get(f"{VIC_URL}/account/login")
+            validate_login_or_exit(driver=driver, mode=2)
 
         driver.get(f"{VIC_URL}/trade")
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "b.pair-title"))
+        wait_until(
+            driver,
+            EC.presence_of_element_located((By.CSS_SELECTOR, "b.pair-title")),
+            20,
+            "page.load",
         )
 
         while True:
@@ -70,5 +75,6 @@ def print_binance_referenced_price_mode(VIC_URL: str):
                 return
 
     finally:
-        driver.quit()
-        print("Driver shutdown complete.")
+        if owns_driver:
+            driver.quit()
+            print("Driver shutdown complete.")
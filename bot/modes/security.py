@@ -1,13 +1,10 @@
 # security.py
-import os
 import getpass
-from selenium.common.exceptions import NoSuchElementException
-from selenium.webdriver.common.by import By
-from config import FLAG_LOGIN_ENABLE
+from config import FLAG_LOGIN_ENABLE, get_settings
 
 
 def check_password():
-    system_pw = os.getenv("APP_PASSWORD")
+    system_pw = get_settings().APP_PASSWORD
     if not system_pw:
         print("\n⚠️ The environment variable (APP_PASSWORD) is not set.")
         return False
@@ -23,6 +20,10 @@ def check_password():
 
 
 def check_login_success(driver) -> bool:
+    # selenium is imported here so the password prompt does not pay for it
+    from selenium.common.exceptions import NoSuchElementException
+    from selenium.webdriver.common.by import By
+
     # if
     if FLAG_LOGIN_ENABLE:
         try:
@@ -0,0 +1,142 @@
+# session.py
+from __future__ import annotations
+
+import threading
+import time
+from typing import Optional
+
+from config import CHROME_DEBUGGER_ADDRESS, CHROME_USER_DATA_DIR
+from modes.security import check_login_success
+from modes.utils_driver import init_driver
+from modes.utils_ui import validate_login_or_exit
+
+
+class BrowserSession:
+    """
+    One Chrome for the whole menu loop.
+
+    Launches Chrome once (or attaches to a running one through its
+    remote-debugging address), keeps the logged-in profile and hands the same
+    driver to every mode. Modes only navigate to their own page; a mode
+    switch costs a page load instead of a cold start plus a manual login.
+    """
+
+    def __init__(
+        self,
+        vic_url: str,
+        debugger_address: Optional[str] = CHROME_DEBUGGER_ADDRESS,
+        user_data_dir: Optional[str] = CHROME_USER_DATA_DIR,
+        profile: Optional[str] = None,
+    ):
+        self.vic_url = vic_url
+        self.debugger_address = debugger_address
+        self.user_data_dir = user_data_dir
+        self.profile = profile  # None → DRIVER_PROFILE
+        self._driver = None
+        self._prelaunch: Optional[threading.Thread] = None
+
+    @property
+    def attached(self) -> bool:
+        return bool(self.debugger_address)
+
+    def is_alive(self) -> bool:
+        if self._driver is None:
+            return False
+        try:
+            self._driver.window_handles
+            return True
+        except Exception:
+            return False
+
+    def prelaunch(self):
+        """
+        Start Chrome and open the login page in the background, so the boot
+        overlaps with the mode's prompts. acquire() picks the driver up.
+        """
+        if self._prelaunch is not None and self._prelaunch.is_alive():
+            return
+        self._prelaunch = threading.Thread(
+            target=self._prelaunch_run, name="driver-prelaunch", daemon=True
+        )
+        self._prelaunch.start()
+
+    def _prelaunch_run(self):
+        try:
+            if self.is_alive():
+                return
+            driver = self.driver(quiet=True)
+            if not self.is_logged_in():
+                driver.get(self._login_url())
+        except Exception as e:
+            # acquire() launches again in the foreground
+            print(f"[SESSION WARN] Background browser launch failed: {e}")
+
+    def _wait_prelaunch(self):
+        thread = self._prelaunch
+        if thread is not None:
+            thread.join()
+            self._prelaunch = None
+
+    def _login_url(self) -> str:
+        return f"{self.vic_url}/account/login"
+
+    def driver(self, quiet: bool = False):
+        """The shared driver; (re)launches it when missing or dead."""
+        if not self.is_alive():
+            self._discard()
+            start = time.time()
+            kwargs = {"profile": self.profile} if self.profile else {}
+            self._driver = init_driver(
+                debugger_address=self.debugger_address,
+                user_data_dir=self.user_data_dir,
+                survive_ctrl_c=True,
+                **kwargs,
+            )
+            if not quiet:
+                how = "Attached to" if self.attached else "Launched"
+                print(f"[SESSION] {how} Chrome in {time.time() - start:.1f}s")
+        return self._driver
+
+    def is_logged_in(self) -> bool:
+        """Non-interactive check on whatever VicEX page is open (or the trade page)."""
+        driver = self.driver()
+        try:
+            if not (driver.current_url or "").startswith(self.vic_url):
+                driver.get(f"{self.vic_url}/trade")
+            return check_login_success(driver)
+        except Exception:
+            return False
+
+    def acquire(self, mode: int):
+        """
+        Driver ready for `mode`: alive and logged in (asks for a manual login
+        once). None when that login fails; the caller must not start the mode.
+        """
+        self._wait_prelaunch()
+        driver = self.driver()
+        if self.is_logged_in():
+            return driver
+
+        if not (driver.current_url or "").startswith(self._login_url()):
+            driver.get(self._login_url())
+        if not validate_login_or_exit(driver=driver, mode=mode, quit_on_failure=False):
+            return None
+        return driver
+
+    def close(self):
+        """Quit Chrome, unless we attached to a browser someone else started."""
+        self._wait_prelaunch()
+        self._discard()
+
+    def _discard(self):
+        driver, self._driver = self._driver, None
+        if driver is None:
+            return
+        try:
+            if self.attached:
+                # ends the chromedriver session but leaves the browser running
+                driver.service.stop()
+            else:
+                driver.quit()
+        except Exception as e:
+            print(f"[WARNING] Error during driver cleanup: {e}")
@@ -1,24 +1,103 @@
 # driver_utils.py
-import os
+import platform
+import subprocess
+from typing import Optional
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-
-CHROME_DRIVER_PATH = os.getenv("CHROME_DRIVER_PATH")
+from config import (
+    CHROME_DRIVER_PATH,
+    DRIVER_PROFILE,
+    DRIVER_LEAN_WINDOW_SIZE,
+    DRIVER_LEAN_BLOCKED_URLS,
+    FLAG_VIC_NETWORK_CAPTURE_ENABLE,
+)
 
 if not CHROME_DRIVER_PATH:
     raise RuntimeError("[ERROR] CHROME_DRIVER_PATH is not set in .env file.")
 
 
-def init_driver():
+def _detached_popen_kw() -> dict:
+    # own process group, so Ctrl+C in the menu does not kill chromedriver/Chrome
+    if platform.system() == "Windows":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def _add_lean_options(options: Options):
+    options.add_argument("--headless=new")
+    options.add_argument(f"--window-size={DRIVER_LEAN_WINDOW_SIZE}")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--mute-audio")
+    options.add_argument("--disable-extensions")
+    # keep timers and rendering at full speed even when nothing is visible
+    options.add_argument("--disable-background-timer-throttling")
+    options.add_argument("--disable-backgrounding-occluded-windows")
+    options.add_argument("--disable-renderer-backgrounding")
+    options.add_experimental_option(
+        "prefs",
+        {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        },
+    )
+
+
+def _block_urls(driver):
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd(
+            "Network.setBlockedURLs", {"urls": list(DRIVER_LEAN_BLOCKED_URLS)}
+        )
+    except Exception as e:
+        print(f"[WARN] Could not set blocked URLs: {e}")
+
+
+def init_driver(
+    debugger_address: Optional[str] = None,
+    user_data_dir: Optional[str] = None,
+    survive_ctrl_c: bool = False,
+    profile: str = DRIVER_PROFILE,
+):
+    """
+    Start Chrome, or attach to a running one via `debugger_address`
+    (Chrome started with --remote-debugging-port). `user_data_dir` keeps the
+    profile (and the VicEX login) between launches.
+
+    profile "FULL" is a normal maximized window. "LEAN" is headless with a
+    small viewport, no images/fonts/media, charts and trackers blocked and
+    no background throttling; log in once with FULL on the same
+    `user_data_dir`, since a headless window cannot take a manual login.
+    """
+    lean = profile.upper() == "LEAN"
+
     options = Options()
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_experimental_option("useAutomationExtension", False)
-    options.add_argument("--start-maximized")
-
-    service = Service(CHROME_DRIVER_PATH)
+    if debugger_address:
+        # launch flags and automation switches are fixed by the running browser
+        options.add_experimental_option("debuggerAddress", debugger_address)
+    else:
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option("useAutomationExtension", False)
+        if lean:
+            _add_lean_options(options)
+        else:
+            options.add_argument("--start-maximized")
+        if user_data_dir:
+            options.add_argument(f"--user-data-dir={user_data_dir}")
+
+    if FLAG_VIC_NETWORK_CAPTURE_ENABLE:
+        # DevTools Network events (WebSocket frames included) → driver.get_log
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    if survive_ctrl_c:
+        service = Service(CHROME_DRIVER_PATH, popen_kw=_detached_popen_kw())
+    else:
+        service = Service(CHROME_DRIVER_PATH)
     driver = webdriver.Chrome(service=service, options=options)
+
+    if lean:
+        _block_urls(driver)
     return driver
@@ -34,12 +34,13 @@ def wait_for_manual_login(mode: int):
     print(f"\n[Mode {mode}] {title}\n\n")
 
 
-def validate_login_or_exit(driver, mode: int) -> bool:
+def validate_login_or_exit(driver, mode: int, quit_on_failure: bool = True) -> bool:
     wait_for_manual_login(mode)
 
     if not check_login_success(driver):
         print("❌ Login failed. Please check your credentials.")
-        driver.quit()
+        if quit_on_failure:
+            driver.quit()
         return False
 
     return True
@@ -0,0 +1,190 @@
+# utils_wait.py
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+# Poll interval per call site (seconds). Selenium's default is 0.5s, which
+# adds ~250ms on average to every wait. Sites not listed use "default".
+WAIT_POLL_SEC: Dict[str, float] = {
+    "default": 0.05,
+    "page.load": 0.2,  # one-off waits after driver.get()
+    "orders.tbody": 0.05,
+    "balance": 0.05,
+    "orderbook.container": 0.05,
+}
+
+
+def poll_interval(site: str) -> float:
+    head = site.split(".")[0]
+    return WAIT_POLL_SEC.get(site, WAIT_POLL_SEC.get(head, WAIT_POLL_SEC["default"]))
+
+
+class WaitBudget:
+    """
+    Shared deadline for a chain of waits (e.g. all waits of one order), so a
+    slow first step leaves less time to the later ones instead of each step
+    getting the full timeout.
+    """
+
+    def __init__(self, total_sec: float):
+        self.total_sec = total_sec
+        self.deadline = time.monotonic() + total_sec
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def cap(self, timeout: float) -> float:
+        return min(timeout, self.remaining())
+
+
+@dataclass
+class WaitStat:
+    count: int = 0
+    timeouts: int = 0
+    total_sec: float = 0.0
+    max_sec: float = 0.0
+
+
+WAIT_STATS: Dict[str, WaitStat] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(site: str, seconds: float, ok: bool):
+    with _stats_lock:
+        stat = WAIT_STATS.get(site)
+        if stat is None:
+            stat = WAIT_STATS[site] = WaitStat()
+        stat.count += 1
+        stat.total_sec += seconds
+        stat.max_sec = max(stat.max_sec, seconds)
+        if not ok:
+            stat.timeouts += 1
+
+
+def format_wait_report() -> str:
+    """Wait time per call site, largest total first."""
+    with _stats_lock:
+        items = sorted(WAIT_STATS.items(), key=lambda kv: kv[1].total_sec, reverse=True)
+        if not items:
+            return "no waits recorded"
+        lines = [
+            f"{'site':<24} {'n':>6} {'timeouts':>8} {'total':>9} {'avg':>9} {'max':>9}"
+        ]
+        for site, s in items:
+            lines.append(
+                f"{site:<24} {s.count:>6} {s.timeouts:>8} {s.total_sec:>8.2f}s "
+                f"{s.total_sec / s.count * 1000:>7.1f}ms {s.max_sec * 1000:>7.1f}ms"
+            )
+        return "\n".join(lines)
+
+
+def wait_until(
+    driver,
+    condition: Callable,
+    timeout: float,
+    site: str,
+    poll: Optional[float] = None,
+    budget: Optional[WaitBudget] = None,
+):
+    """
+    WebDriverWait(...).until(condition) with a per-site poll interval, an
+    optional shared budget and per-site wait accounting. Raises
+    TimeoutException like WebDriverWait.
+    """
+    if budget is not None:
+        timeout = budget.cap(timeout)
+    poll = poll_interval(site) if poll is None else poll
+
+    start = time.perf_counter()
+    ok = False
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=poll).until(condition)
+        ok = True
+        return result
+    finally:
+        _record(site, time.perf_counter() - start, ok)
+
+
+# In-page wait: re-checks the predicate on every DOM mutation and animation
+# frame (plus a slow timer in case rAF is throttled) and resolves the moment
+# it returns something truthy. `args` are the caller's script arguments.
+_WAIT_JS_TEMPLATE = """
+const args = Array.prototype.slice.call(arguments, 0, arguments.length - 2);
+const timeoutMs = arguments[arguments.length - 2];
+const done = arguments[arguments.length - 1];
+const check = () => { %s };
+let finished = false, observer = null, timer = null;
+const finish = (value) => {
+    if (finished) { return; }
+    finished = true;
+    if (observer) { observer.disconnect(); }
+    clearInterval(timer);
+    done(value);
+};
+const tick = () => {
+    if (finished) { return; }
+    let value = null;
+    try { value = check(); } catch (e) { value = null; }
+    if (value) { finish(value); }
+};
+tick();
+if (finished) { return; }
+observer = new MutationObserver(tick);
+observer.observe(document.documentElement, {
+    subtree: true, childList: true, characterData: true, attributes: true,
+});
+const frame = () => { if (!finished) { tick(); requestAnimationFrame(frame); } };
+requestAnimationFrame(frame);
+timer = setInterval(tick, 100);
+setTimeout(() => finish(null), timeoutMs);
+"""
+
+# Async script timeout already set per driver (WebDriver default is 30s)
+_script_timeouts: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def ensure_script_timeout(driver, timeout: float):
+    """Raise the async script timeout so a `timeout`-second script can finish."""
+    needed = timeout + 2.0
+    if needed <= _script_timeouts.get(driver, 30.0):
+        return
+    driver.set_script_timeout(needed)
+    _script_timeouts[driver] = needed
+
+
+def wait_js(
+    driver,
+    predicate_js: str,
+    *args,
+    timeout: float,
+    site: str,
+    budget: Optional[WaitBudget] = None,
+):
+    """
+    Resolve inside the page as soon as `predicate_js` (a function body that
+    can read `args`) returns a truthy value, and return that value. Raises
+    TimeoutException when it never does.
+    """
+    if budget is not None:
+        timeout = budget.cap(timeout)
+    ensure_script_timeout(driver, timeout)
+
+    start = time.perf_counter()
+    ok = False
+    try:
+        result = driver.execute_async_script(
+            _WAIT_JS_TEMPLATE % predicate_js, *args, int(timeout * 1000)
+        )
+        ok = bool(result)
+        if not ok:
+            raise TimeoutException(f"{site}: condition not met within {timeout:.1f}s")
+        return result
+    finally:
+        _record(site, time.perf_counter() - start, ok)
@@ -0,0 +1,331 @@
+# service.py
+"""
+Non-interactive launcher for running one bot under a process supervisor
+(systemd, supervisord, docker restart policies, ...).
+
+No password prompt, no manual login and no input(): the browser profile in
+CHROME_USER_DATA_DIR (or --user-data-dir) must already be logged in (log
+in once through main.py, or with a FULL profile on the same directory).
+
+    python service.py --config bots/btc_dual.json
+    python service.py --mode dual --ticker BTC --bid-amount 500 --ask-amount 500
+
+Config file (JSON, CLI flags override it):
+
+    {"mode": "dual", "ticker": "BTC", "bid_amount": 500, "ask_amount": 500,
+     "profile": "LEAN", "user_data_dir": "/srv/vic/btc-profile"}
+
+Dual mode with "ask_user_data_dir" (a second logged-in profile) runs the
+ASK side in its own browser, in parallel with BID.
+
+Several markets from one process (one tab per market, shared price feed;
+see modes/mm/supervisor.py). Each extra profile directory adds a browser:
+
+    {"bots": [{"mode": "dual", "ticker": "BTC", "bid_amount": 500, "ask_amount": 500},
+              {"mode": "follow-bid", "ticker": "ETH", "fixed_amount": 200}],
+     "profile": "LEAN", "user_data_dirs": ["/srv/vic/p1", "/srv/vic/p2"],
+     "tabs_per_driver": 8}
+
+On any stop (SIGTERM, Ctrl+C or a crash) the kill switch cancels every open
+order within KILL_SWITCH_DEADLINE_SEC and reports what is still open.
+
+Exit codes: 0 stopped (SIGTERM / Ctrl+C), 1 engine crashed or could not
+start safely, 2 bad config or the profile is not logged in.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import traceback
+
+EXIT_STOPPED = 0
+EXIT_CRASHED = 1
+EXIT_CONFIG = 2
+
+MODES = ("follow-bid", "follow-ask", "dual")
+
+# keys accepted in the config file; CLI flags use the same names with dashes
+_KEYS = (
+    "mode",
+    "ticker",
+    "fixed_amount",
+    "bid_amount",
+    "ask_amount",
+    "profile",
+    "user_data_dir",
+    "debugger_address",
+    "ask_user_data_dir",
+)
+
+
+# extra keys of a multi-market config file ("bots" entries take _BOT_KEYS)
+_FLEET_KEYS = ("bots", "profile", "user_data_dirs", "debugger_address", "tabs_per_driver")
+_BOT_KEYS = ("mode", "ticker", "fixed_amount", "bid_amount", "ask_amount")
+
+
+class ConfigError(ValueError):
+    pass
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Run a VicEX MM bot without prompts")
+    ap.add_argument("--config", help="JSON file with the keys below")
+    ap.add_argument("--mode", choices=MODES)
+    ap.add_argument("--ticker", help="coin ticker, e.g. BTC")
+    ap.add_argument("--fixed-amount", type=float, help="follow modes: fixed USDT amount")
+    ap.add_argument("--bid-amount", type=float, help="dual mode: BID USDT budget")
+    ap.add_argument("--ask-amount", type=float, help="dual mode: ASK coin value in USDT")
+    ap.add_argument("--profile", choices=("FULL", "LEAN"), type=str.upper)
+    ap.add_argument("--user-data-dir", help="logged-in Chrome profile directory")
+    ap.add_argument("--debugger-address", help="attach to a running Chrome instead")
+    ap.add_argument(
+        "--ask-user-data-dir", help="dual mode: second profile → ASK runs in parallel"
+    )
+    return ap.parse_args(argv)
+
+
+def load_service_config(args: argparse.Namespace) -> dict:
+    """Merge the JSON config file and CLI flags (flags win) and validate."""
+    cfg = {}
+    if args.config:
+        try:
+            with open(args.config, encoding="utf-8") as f:
+                cfg = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ConfigError(f"cannot read config {args.config}: {e}") from e
+        if "bots" in cfg:
+            return _load_fleet_config(cfg, args)
+        unknown = set(cfg) - set(_KEYS)
+        if unknown:
+            raise ConfigError(f"unknown config keys: {sorted(unknown)}")
+
+    for key in _KEYS:
+        value = getattr(args, key)
+        if value is not None:
+            cfg[key] = value
+
+    return _validate_bot(cfg)
+
+
+def _load_fleet_config(cfg: dict, args: argparse.Namespace) -> dict:
+    unknown = set(cfg) - set(_FLEET_KEYS)
+    if unknown:
+        raise ConfigError(f"unknown config keys: {sorted(unknown)}")
+    if not isinstance(cfg["bots"], list) or not cfg["bots"]:
+        raise ConfigError("bots must be a non-empty list")
+
+    bots = []
+    for i, bot in enumerate(cfg["bots"]):
+        if not isinstance(bot, dict):
+            raise ConfigError(f"bots[{i}] must be an object")
+        unknown = set(bot) - set(_BOT_KEYS)
+        if unknown:
+            raise ConfigError(f"unknown keys in bots[{i}]: {sorted(unknown)}")
+        try:
+            bots.append(_validate_bot(dict(bot)))
+        except ConfigError as e:
+            raise ConfigError(f"bots[{i}]: {e}") from e
+    cfg["bots"] = bots
+
+    for key in ("profile", "debugger_address"):
+        value = getattr(args, key)
+        if value is not None:
+            cfg[key] = value
+    if args.user_data_dir is not None:
+        cfg["user_data_dirs"] = [args.user_data_dir]
+
+    dirs = cfg.get("user_data_dirs")
+    if dirs is not None and (
+        not isinstance(dirs, list) or not all(isinstance(d, str) and d for d in dirs)
+    ):
+        raise ConfigError("user_data_dirs must be a list of directories")
+
+    tabs = cfg.get("tabs_per_driver")
+    if tabs is not None and (not isinstance(tabs, int) or tabs < 1):
+        raise ConfigError("tabs_per_driver must be an integer >= 1")
+    return cfg
+
+
+def _validate_bot(cfg: dict) -> dict:
+    mode = cfg.get("mode")
+    if mode not in MODES:
+        raise ConfigError(f"mode must be one of {MODES}, got {mode!r}")
+
+    ticker = str(cfg.get("ticker") or "").strip().upper()
+    if ticker.endswith("USDT"):
+        ticker = ticker[:-4]
+    if not ticker:
+        raise ConfigError("ticker is required")
+    cfg["ticker"] = ticker
+
+    for key in ("fixed_amount", "bid_amount", "ask_amount"):
+        if cfg.get(key) is None:
+            continue
+        try:
+            cfg[key] = float(cfg[key])
+        except (TypeError, ValueError):
+            raise ConfigError(f"{key} must be a number, got {cfg[key]!r}")
+        if cfg[key] <= 0:
+            raise ConfigError(f"{key} must be > 0")
+
+    if mode == "dual" and (cfg.get("bid_amount") is None or cfg.get("ask_amount") is None):
+        raise ConfigError("dual mode needs bid_amount and ask_amount")
+    if cfg.get("ask_user_data_dir"):
+        if mode != "dual":
+            raise ConfigError("ask_user_data_dir is only used in dual mode")
+        if cfg["ask_user_data_dir"] == cfg.get("user_data_dir"):
+            raise ConfigError("ask_user_data_dir must differ from user_data_dir")
+
+    return cfg
+
+
+def _market_spec(cfg: dict):
+    from modes.mm.supervisor import MarketSpec
+
+    return MarketSpec(**{k: cfg[k] for k in _BOT_KEYS if cfg.get(k) is not None})
+
+
+def run_service(cfg: dict) -> int:
+    from config import FLAG_KILL_SWITCH_ENABLE, VIC_URL
+    from modes.session import BrowserSession
+    from modes.mm.kill_switch import flatten_engine
+    from modes.mm.supervisor import build_engine
+
+    session = BrowserSession(
+        VIC_URL,
+        **{
+            k: cfg[k]
+            for k in ("debugger_address", "user_data_dir", "profile")
+            if cfg.get(k)
+        },
+    )
+    sessions = [session]
+    ask_session = None
+    if cfg.get("ask_user_data_dir"):
+        ask_session = BrowserSession(
+            VIC_URL,
+            debugger_address=None,
+            user_data_dir=cfg["ask_user_data_dir"],
+            **({"profile": cfg["profile"]} if cfg.get("profile") else {}),
+        )
+        sessions.append(ask_session)
+
+    engine = None
+    try:
+        for s in sessions:
+            s.driver()
+            if not s.is_logged_in():
+                print(
+                    f"[SERVICE ERROR] Browser profile {s.user_data_dir or ''} is not "
+                    "logged in to VicEX. Log in once interactively with it."
+                )
+                return EXIT_CONFIG
+
+        engine = build_engine(
+            session.driver(),
+            VIC_URL,
+            _market_spec(cfg),
+            ask_driver=ask_session.driver() if ask_session else None,
+        )
+        if not engine.start():
+            print(
+                f"[SERVICE ERROR] {cfg['mode']} {cfg['ticker']} could not start "
+                "safely (see the log above)"
+            )
+            return EXIT_CRASHED
+        print(f"[SERVICE] {cfg['mode']} {cfg['ticker']} started")
+        while True:
+            engine.tick()
+            time.sleep(0.5)
+
+    except KeyboardInterrupt:
+        print(f"[SERVICE] {cfg['mode']} {cfg['ticker']} stopped")
+        return EXIT_STOPPED
+    except Exception as e:
+        print(
+            f"[SERVICE ERROR] {cfg['mode']} {cfg['ticker']} crashed: "
+            f"{type(e).__name__} - {e}"
+        )
+        traceback.print_exc()
+        return EXIT_CRASHED
+    finally:
+        if engine is not None:
+            engine.close()
+            if FLAG_KILL_SWITCH_ENABLE:
+                flatten_engine(engine)
+            engine.log_latency_report()
+        for s in sessions:
+            s.close()
+
+
+def run_fleet(cfg: dict) -> int:
+    from config import CHROME_USER_DATA_DIR, VIC_URL
+    from modes.session import BrowserSession
+    from modes.mm.supervisor import SUPERVISOR_TABS_PER_DRIVER, MarketSupervisor
+
+    if cfg.get("debugger_address"):
+        dirs = [None]  # one attached browser
+    else:
+        dirs = cfg.get("user_data_dirs") or [CHROME_USER_DATA_DIR]
+    sessions = [
+        BrowserSession(
+            VIC_URL,
+            debugger_address=cfg.get("debugger_address"),
+            user_data_dir=d,
+            **({"profile": cfg["profile"]} if cfg.get("profile") else {}),
+        )
+        for d in dirs
+    ]
+
+    try:
+        for session in sessions:
+            session.driver()
+            if not session.is_logged_in():
+                print(
+                    f"[SERVICE ERROR] Browser profile {session.user_data_dir} is not "
+                    "logged in to VicEX. Log in once interactively with it."
+                )
+                return EXIT_CONFIG
+
+        try:
+            supervisor = MarketSupervisor(
+                VIC_URL,
+                [_market_spec(bot) for bot in cfg["bots"]],
+                sessions,
+                tabs_per_driver=cfg.get("tabs_per_driver") or SUPERVISOR_TABS_PER_DRIVER,
+            )
+        except ValueError as e:
+            print(f"[SERVICE ERROR] {e}")
+            return EXIT_CONFIG
+
+        supervisor.run()  # returns when every market has failed
+        return EXIT_CRASHED
+
+    except KeyboardInterrupt:
+        print(f"[SERVICE] {len(cfg['bots'])} markets stopped")
+        return EXIT_STOPPED
+    finally:
+        for session in sessions:
+            session.close()
+
+
+def main(argv=None) -> int:
+    try:
+        cfg = load_service_config(_parse_args(argv))
+    except ConfigError as e:
+        print(f"[SERVICE ERROR] {e}")
+        return EXIT_CONFIG
+
+    from modes.mm.kill_switch import install_signal_handlers
+
+    # a supervisor stops us with SIGTERM; take the same path as Ctrl+C
+    install_signal_handlers()
+    if "bots" in cfg:
+        return run_fleet(cfg)
+    return run_service(cfg)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+# bench_driver.py
+"""
+Compare driver profiles: startup time, browser RSS and DOM-query latency.
+
+Uses the local simulator unless --url points at a real trade page
+(log in first with the same CHROME_USER_DATA_DIR). Run from bot/:
+
+    python -m sim.bench_driver --profiles FULL LEAN --reads 50
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Optional
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from sim.vic_sim_server import SimConfig, start_sim_server
+from modes.utils_driver import init_driver
+from modes.utils_wait import wait_until
+from modes.mm.vic_orderbook import read_orderbook_js
+from modes.mm.vic_orders import read_open_orders
+
+
+def _browser_rss_mb(driver) -> Optional[float]:
+    """RSS of chromedriver + every Chrome process under it (needs psutil)."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        procs = [root] + root.children(recursive=True)
+    except Exception:
+        return None
+
+    total = 0
+    for p in procs:
+        try:
+            total += p.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / (1024 * 1024)
+
+
+def _ms(samples) -> str:
+    if not samples:
+        return "n/a"
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(0.95 * (len(samples) - 1)))]
+    return f"avg={statistics.mean(samples) * 1000:6.1f}ms p95={p95 * 1000:6.1f}ms"
+
+
+def bench_profile(profile: str, url: str, reads: int) -> dict:
+    t0 = time.perf_counter()
+    driver = init_driver(profile=profile)
+    startup = time.perf_counter() - t0
+
+    try:
+        t0 = time.perf_counter()
+        driver.get(url)
+        wait_until(
+            driver,
+            EC.presence_of_element_located((By.ID, "user_base_trans")),
+            30,
+            "page.load",
+        )
+        page_load = time.perf_counter() - t0
+        time.sleep(2)  # let the page settle before measuring memory
+
+        book = []
+        orders = []
+        for _ in range(reads):
+            t0 = time.perf_counter()
+            read_orderbook_js(driver, "ask")
+            book.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            read_open_orders(driver)
+            orders.append(time.perf_counter() - t0)
+
+        return {
+            "profile": profile,
+            "startup": startup,
+            "page_load": page_load,
+            "rss_mb": _browser_rss_mb(driver),
+            "book": book,
+            "orders": orders,
+        }
+    finally:
+        driver.quit()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Driver profile benchmark")
+    ap.add_argument("--profiles", nargs="+", default=["FULL", "LEAN"])
+    ap.add_argument("--reads", type=int, default=50)
+    ap.add_argument("--url", default=None, help="trade page URL (default: simulator)")
+    args = ap.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        server, _, base_url = start_sim_server(SimConfig())
+        url = f"{base_url}/trade?code=USDT-BTC"
+
+    try:
+        results = [bench_profile(p, url, args.reads) for p in args.profiles]
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    print("\n" + "=" * 70)
+    print(f"Driver profile benchmark  url={url}")
+    print("=" * 70)
+    for r in results:
+        rss = "n/a (pip install psutil)" if r["rss_mb"] is None else f"{r['rss_mb']:.0f}MB"
+        print(f"[{r['profile']}]")
+        print(f"  startup            {r['startup']:6.2f}s")
+        print(f"  page load          {r['page_load']:6.2f}s")
+        print(f"  browser RSS        {rss}")
+        print(f"  read_orderbook_js  {_ms(r['book'])}")
+        print(f"  read_open_orders   {_ms(r['orders'])}")
+    print("=" * 70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# bench_sim.py
+"""
+End-to-end latency benchmark against the local VicEX simulator.
+
+Runs the real order/cancel/read paths and a full dual-side rebalance
+against sim/vic_sim_server.py. Run from the bot/ directory:
+
+    python -m sim.bench_sim --orders 10 --anim-ms 300 --server-delay-ms 100
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from sim.vic_sim_server import SimConfig, start_sim_server
+from modes.utils_driver import init_driver
+from modes.utils_wait import format_wait_report, wait_until
+from modes.market_data import PricePrefetcher
+from modes.mm.latency import LATENCY
+from modes.mm.vic_orderbook import OrderbookMirror
+from modes.mm.vic_trade import place_limit_order, place_limit_orders_batch
+from modes.mm.vic_orders import read_open_orders, cancel_all_open_orders
+from modes.mm.mode_binance_dual import (
+    DualSideMMEngine,
+    _build_dual_cfg,
+    read_orderbook,
+)
+
+
+def _timed(fn: Callable, repeat: int) -> List[float]:
+    out = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        out.append(time.perf_counter() - t0)
+    return out
+
+
+def _fmt(samples: List[float]) -> str:
+    if not samples:
+        return "n/a"
+    return (
+        f"avg={statistics.mean(samples) * 1000:8.1f}ms  "
+        f"min={min(samples) * 1000:8.1f}ms  max={max(samples) * 1000:8.1f}ms"
+    )
+
+
+def run_bench(args):
+    cfg = SimConfig(
+        anim_ms=args.anim_ms,
+        server_delay_ms=args.server_delay_ms,
+        mid_price=args.mid,
+    )
+    server, state, base_url = start_sim_server(cfg)
+    ticker = "BTC"
+    driver = init_driver()
+
+    try:
+        driver.get(f"{base_url}/trade?code=USDT-{ticker}")
+        wait_until(
+            driver,
+            EC.presence_of_element_located((By.ID, "user_base_trans")),
+            20,
+            "page.load",
+        )
+        time.sleep(cfg.refresh_ms / 1000.0 * 2)
+
+        # 1) reads
+        book = _timed(lambda: read_orderbook(driver, "ask"), args.reads)
+        mirror = OrderbookMirror(driver)
+        mirror.sync()  # install + first snapshot
+        mirrored = _timed(lambda: read_orderbook(driver, "ask", mirror=mirror), args.reads)
+        rows = _timed(lambda: read_open_orders(driver), args.reads)
+
+        # 2) single orders, far from the touch so nothing fills
+        place = []
+        for i in range(args.orders):
+            side = "bid" if i % 2 == 0 else "ask"
+            k = i // 2 + 1
+            if side == "bid":
+                price = args.mid * (0.9 - 0.001 * k)
+            else:
+                price = args.mid * (1.1 + 0.001 * k)
+            t0 = time.perf_counter()
+            ok = place_limit_order(driver, side, round(price, 4), 0.1)
+            place.append(time.perf_counter() - t0)
+            if not ok:
+                print(f"[BENCH WARN] order {i} ({side}) failed")
+
+        # 3) the same number of orders in one in-page batch
+        batch = []
+        for i in range(args.orders):
+            side = "bid" if i % 2 == 0 else "ask"
+            k = i // 2 + 1 + args.orders
+            if side == "bid":
+                price = args.mid * (0.9 - 0.001 * k)
+            else:
+                price = args.mid * (1.1 + 0.001 * k)
+            batch.append((side, round(price, 4), 0.1))
+        t0 = time.perf_counter()
+        batch_ok = place_limit_orders_batch(driver, batch)
+        batch_sec = time.perf_counter() - t0
+
+        # 4) mass cancel
+        t0 = time.perf_counter()
+        cancelled, total = cancel_all_open_orders(driver)
+        cancel_all_sec = time.perf_counter() - t0
+
+        # 5) full dual-side rebalance through the real engine
+        # (fixed reference price instead of Binance)
+        prices = PricePrefetcher(fetch_price=lambda symbol: args.mid)
+        prices.wait_ready(f"{ticker}USDT", timeout=5)
+        engine = DualSideMMEngine(
+            driver=driver,
+            cfg=_build_dual_cfg(args.bid_amount, args.ask_amount),
+            ticker=ticker,
+            prices=prices,
+        )
+        t0 = time.perf_counter()
+        engine.full_rebalance_both_sides()
+        rebalance_sec = time.perf_counter() - t0
+        prices.stop()
+
+        print("\n" + "=" * 70)
+        print(
+            f"VicEX sim benchmark  anim={cfg.anim_ms}ms  server_delay={cfg.server_delay_ms}ms"
+        )
+        print("=" * 70)
+        print(f"read_orderbook       {_fmt(book)}")
+        print(
+            f"  mirrored           {_fmt(mirrored)}  "
+            f"({mirror.changes} changes, {mirror.snapshots} snapshots)"
+        )
+        print(f"read_open_orders     {_fmt(rows)}")
+        print(f"place_limit_order    {_fmt(place)}")
+        if place:
+            print(f"  → orders/min       {60.0 / statistics.mean(place):8.1f}")
+        if batch:
+            print(
+                f"batch place ({sum(batch_ok)}/{len(batch)})  {batch_sec:8.2f}s  "
+                f"→ orders/min {60.0 * len(batch) / batch_sec:8.1f}"
+            )
+        print(f"cancel_all ({cancelled}/{total})  {cancel_all_sec:8.2f}s")
+        print(f"full rebalance       {rebalance_sec:8.2f}s")
+        print(f"server stats         {state.stats}")
+        print("-" * 70)
+        print(LATENCY.format_report())
+        print("-" * 70)
+        print(format_wait_report())
+        print("=" * 70 + "\n")
+
+    finally:
+        try:
+            driver.quit()
+        finally:
+            server.shutdown()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="VicEX simulator latency benchmark")
+    ap.add_argument("--orders", type=int, default=10)
+    ap.add_argument("--reads", type=int, default=20)
+    ap.add_argument("--anim-ms", type=int, default=300)
+    ap.add_argument("--server-delay-ms", type=int, default=100)
+    ap.add_argument("--mid", type=float, default=100.0)
+    ap.add_argument("--bid-amount", type=float, default=1000.0)
+    ap.add_argument("--ask-amount", type=float, default=1000.0)
+    run_bench(ap.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# bench_startup.py
+"""
+Time-to-menu benchmark: how long `import main` (plus the first settings
+parse) takes, and which imports dominate, using `python -X importtime`.
+Run from bot/:
+
+    python -m sim.bench_startup --runs 5 --top 15
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+_STARTUP_SNIPPET = "import main, config; config.get_settings()"
+
+
+def _run_once(top: int) -> Tuple[float, float, List[Tuple[int, str]]]:
+    """(wall seconds, main cumulative import seconds, [(self_us, module)])"""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _STARTUP_SNIPPET],
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"startup failed:\n{proc.stderr[-2000:]}")
+
+    main_cumulative_us = 0
+    self_times: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if len(parts) != 3 or not parts[0].isdigit():
+            continue
+        self_us, cumulative_us, name = int(parts[0]), int(parts[1]), parts[2]
+        self_times[name.strip()] = self_us
+        if name.strip() == "main":
+            main_cumulative_us = cumulative_us
+
+    slowest = sorted(((us, name) for name, us in self_times.items()), reverse=True)
+    return wall, main_cumulative_us / 1e6, slowest[:top]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Startup (time-to-menu) benchmark")
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--top", type=int, default=15)
+    args = ap.parse_args()
+
+    walls, imports = [], []
+    slowest: List[Tuple[int, str]] = []
+    for _ in range(args.runs):
+        wall, main_import, slowest = _run_once(args.top)
+        walls.append(wall)
+        imports.append(main_import)
+
+    print("\n" + "=" * 70)
+    print(f"Startup benchmark  ({args.runs} runs, `{_STARTUP_SNIPPET}`)")
+    print("=" * 70)
+    print(f"process wall time    median={statistics.median(walls) * 1000:7.1f}ms")
+    print(f"import main          median={statistics.median(imports) * 1000:7.1f}ms")
+    print("\nslowest modules (self time, last run):")
+    for us, name in slowest:
+        print(f"  {us / 1000:8.1f}ms  {name}")
+    print("=" * 70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# replay_frames.py
+"""
+Run a frame recording (VIC_NETWORK_RECORD_PATH, JSONL) through the frame
+decoder and print what it understood: frames per URL, update counts per
+type and the resulting book / open orders / balances. Run from bot/:
+
+    python -m sim.replay_frames logs/frames.jsonl --show 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from collections import Counter
+
+from modes.mm.vic_network import get_frame_decoder, replay_frames
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Decode recorded exchange frames")
+    ap.add_argument("path", help="JSONL written by the network capture")
+    ap.add_argument("--show", type=int, default=5, help="levels / orders to print")
+    args = ap.parse_args()
+
+    decoder = get_frame_decoder()
+    per_url = Counter()
+    per_type = Counter()
+    undecoded = 0
+    with open(args.path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                frame = json.loads(line)
+            except ValueError:
+                continue
+            per_url[f"{frame.get('kind', 'ws')} {frame.get('url', '')}"] += 1
+            updates = decoder.decode(
+                frame.get("kind", "ws"), frame.get("url", ""), frame.get("payload", "")
+            )
+            if not updates:
+                undecoded += 1
+            for update in updates:
+                per_type[type(update).__name__] += 1
+
+    state, count = replay_frames(args.path, decoder)
+
+    print("\n" + "=" * 70)
+    print(f"Frames: {sum(per_url.values())}  updates: {count}  undecoded frames: {undecoded}")
+    print("=" * 70)
+    for url, n in per_url.most_common():
+        print(f"  {n:6d}  {url}")
+    print("")
+    for name, n in per_type.most_common():
+        print(f"  {n:6d}  {name}")
+
+    for side in ("ask", "bid"):
+        levels = state.orderbook(side)
+        shown = "no snapshot" if levels is None else levels[: args.show]
+        print(f"\n{side.upper()} book: {shown}")
+    orders = state.open_orders()
+    if orders is None:
+        print("\nOpen orders: no snapshot")
+    else:
+        print(f"\nOpen orders: {len(orders)}")
+        for row in orders[: args.show]:
+            print(f"  {row.side:<3} {row.price:>14,.8f} {row.pending_qty:>14,.8f} {row.order_id}")
+    print("\nBalances:", state.balances() or "none")
+    print("=" * 70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
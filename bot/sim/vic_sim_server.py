@@ -0,0 +1,436 @@
+# vic_sim_server.py
+"""
+Local stand-in for the VicEX trade page.
+
+Reproduces the DOM the bot relies on (order forms, orderbook boxes, open
+orders table, SweetAlert-style popups, balances) on top of a small
+in-memory matching book, with configurable popup animation and server
+delays. Run from the bot/ directory:
+
+    python sim/vic_sim_server.py --port 8765 --anim-ms 300 --server-delay-ms 100
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+@dataclass
+class SimConfig:
+    anim_ms: int = 300  # popup open animation
+    server_delay_ms: int = 100  # added to every order/cancel API call
+    refresh_ms: int = 300  # page polling interval for book/orders/balances
+    mid_price: float = 100.0
+    seed_levels: int = 15  # background liquidity per side
+    seed_step_percent: float = 0.2
+    seed_qty: float = 5.0
+    usdt_balance: float = 100_000.0
+    coin_balance: float = 1_000.0
+
+
+@dataclass
+class SimOrder:
+    order_id: str
+    side: str  # "bid" / "ask"
+    price: float
+    qty: float
+    remaining: float
+    owner: str  # "user" or "house"
+    ts: float = field(default_factory=time.time)
+
+
+class SimMarket:
+    """Price-time priority book for one pair, plus the user's balances."""
+
+    def __init__(self, code: str, cfg: SimConfig):
+        self.code = code
+        self.cfg = cfg
+        self.orders: Dict[str, SimOrder] = {}
+        self.last_price = cfg.mid_price
+        self.usdt = cfg.usdt_balance
+        self.coin = cfg.coin_balance
+        self._ids = itertools.count(1000)
+        self._lock = threading.Lock()
+        self._seed()
+
+    def _seed(self):
+        step = self.cfg.seed_step_percent / 100.0
+        for k in range(1, self.cfg.seed_levels + 1):
+            for side, price in (
+                ("bid", self.cfg.mid_price * (1 - step) ** k),
+                ("ask", self.cfg.mid_price * (1 + step) ** k),
+            ):
+                oid = str(next(self._ids))
+                self.orders[oid] = SimOrder(
+                    oid, side, round(price, 6), self.cfg.seed_qty, self.cfg.seed_qty, "house"
+                )
+
+    # balances available to the user (open user orders are reserved)
+    def _reserved(self) -> Tuple[float, float]:
+        usdt = sum(
+            o.price * o.remaining
+            for o in self.orders.values()
+            if o.owner == "user" and o.side == "bid"
+        )
+        coin = sum(
+            o.remaining
+            for o in self.orders.values()
+            if o.owner == "user" and o.side == "ask"
+        )
+        return usdt, coin
+
+    def _settle(self, taker: SimOrder, maker: SimOrder, qty: float):
+        price = maker.price
+        for order in (taker, maker):
+            if order.owner != "user":
+                continue
+            if order.side == "bid":
+                self.usdt -= price * qty
+                self.coin += qty
+            else:
+                self.usdt += price * qty
+                self.coin -= qty
+        self.last_price = price
+
+    def place(self, side: str, price: float, qty: float, owner: str = "user"):
+        with self._lock:
+            if side not in ("bid", "ask") or price <= 0 or qty <= 0:
+                return False, "invalid order", None
+
+            if owner == "user":
+                r_usdt, r_coin = self._reserved()
+                if side == "bid" and price * qty > self.usdt - r_usdt + 1e-9:
+                    return False, "insufficient USDT", None
+                if side == "ask" and qty > self.coin - r_coin + 1e-9:
+                    return False, "insufficient coin", None
+
+            order = SimOrder(str(next(self._ids)), side, price, qty, qty, owner)
+
+            opp = "ask" if side == "bid" else "bid"
+            makers = [
+                o
+                for o in self.orders.values()
+                if o.side == opp
+                and (o.price <= price if side == "bid" else o.price >= price)
+            ]
+            makers.sort(key=lambda o: (o.price if side == "bid" else -o.price, o.ts))
+
+            for maker in makers:
+                if order.remaining <= 1e-12:
+                    break
+                fill = min(order.remaining, maker.remaining)
+                self._settle(order, maker, fill)
+                order.remaining -= fill
+                maker.remaining -= fill
+                if maker.remaining <= 1e-12:
+                    del self.orders[maker.order_id]
+
+            if order.remaining > 1e-12:
+                self.orders[order.order_id] = order
+            return True, "ok", order
+
+    def cancel(self, order_id: str) -> bool:
+        with self._lock:
+            order = self.orders.get(order_id)
+            if order is None or order.owner != "user":
+                return False
+            del self.orders[order_id]
+            return True
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            bids: Dict[float, float] = {}
+            asks: Dict[float, float] = {}
+            for o in self.orders.values():
+                book = bids if o.side == "bid" else asks
+                book[o.price] = book.get(o.price, 0.0) + o.remaining
+
+            r_usdt, r_coin = self._reserved()
+            mine = sorted(
+                (o for o in self.orders.values() if o.owner == "user"),
+                key=lambda o: o.ts,
+                reverse=True,
+            )
+            return {
+                "code": self.code,
+                "last": self.last_price,
+                "asks": sorted(asks.items(), reverse=True),
+                "bids": sorted(bids.items(), reverse=True),
+                "balances": {"usdt": self.usdt - r_usdt, "coin": self.coin - r_coin},
+                "open": [
+                    {
+                        "id": o.order_id,
+                        "side": o.side,
+                        "price": o.price,
+                        "qty": o.qty,
+                        "pending": o.remaining,
+                        "ts": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(o.ts)),
+                    }
+                    for o in mine
+                ],
+            }
+
+
+_LOGIN_HTML = """<!doctype html>
+<html><head><meta charset="utf-8"><title>VicEX Sim - Login</title></head>
+<body>
+<ul><li class="nav-item" data-access="login"><button class="dropdown-toggle">sim-user</button></li></ul>
+<p>Simulator: already logged in. <a href="/trade">Go to trade</a></p>
+</body></html>
+"""
+
+_TRADE_HTML = """<!doctype html>
+<html><head><meta charset="utf-8"><title>VicEX Sim - Trade</title>
+<meta name="csrf-token" content="sim-csrf-token">
+<style>
+body { font-family: sans-serif; font-size: 13px; }
+.swal-overlay { position: fixed; inset: 0; background: rgba(0,0,0,.4); display: none;
+  align-items: center; justify-content: center; z-index: 1000; }
+.swal-overlay--show-modal { display: flex; }
+.swal-overlay--show-modal .swal-modal { animation: swalIn var(--anim) ease-out; }
+@keyframes swalIn { from { transform: scale(.6); opacity: 0; } to { transform: scale(1); opacity: 1; } }
+.swal-modal { background: #fff; padding: 20px; min-width: 280px; }
+a.bidding-table-rows { display: flex; gap: 12px; }
+</style></head>
+<body>
+<ul><li class="nav-item" data-access="login"><button class="dropdown-toggle">sim-user</button></li></ul>
+<b class="pair-title">Sim Coin</b> <span class="unit" id="unit"></span>
+<div class="overturn-cell col-price"><span class="contrast" id="last-price">0</span></div>
+<div>USDT <span id="user_base_trans">0</span> | COIN <span id="user_base_coin">0</span></div>
+<div><input id="bid_price"> <input id="bid_coin"> <button id="btnBuying">Buy</button></div>
+<div><input id="ask_price"> <input id="ask_coin"> <button id="btnSelling">Sell</button></div>
+<div id="order-box-ask"><div id="mCSB_2_container"></div></div>
+<hr>
+<div id="order-box-bid"><div id="mCSB_3_container"></div></div>
+<table><tbody id="out-standing-list"></tbody></table>
+<div class="swal-overlay"><div class="swal-modal"><div class="swal-text"></div>
+<div class="swal-footer"><button class="swal-button swal-button--confirm">OK</button></div></div></div>
+<script>
+const CFG = __CONFIG__;
+document.documentElement.style.setProperty("--anim", CFG.animMs + "ms");
+const CODE = new URLSearchParams(location.search).get("code") || "USDT-BTC";
+const COIN = CODE.split("-")[1];
+document.getElementById("unit").textContent = COIN + "/USDT";
+
+const fmt = (v, d) => Number(v).toLocaleString("en-US", { maximumFractionDigits: d });
+
+function swal(text) {
+  return new Promise((resolve) => {
+    const ov = document.querySelector(".swal-overlay");
+    ov.querySelector(".swal-text").textContent = text;
+    ov.querySelector(".swal-button--confirm").onclick = () => {
+      ov.classList.remove("swal-overlay--show-modal");
+      resolve(true);
+    };
+    ov.classList.add("swal-overlay--show-modal");
+  });
+}
+
+async function post(url, data) {
+  const r = await fetch(url, {
+    method: "POST",
+    headers: { "Content-Type": "application/json", "X-CSRF-TOKEN": "sim-csrf-token" },
+    body: JSON.stringify(data),
+  });
+  return r.json();
+}
+
+async function submitOrder(side) {
+  const price = document.getElementById(side + "_price").value;
+  const qty = document.getElementById(side + "_coin").value;
+  await swal((side === "bid" ? "Buy " : "Sell ") + qty + " @ " + price + " ?");
+  const res = await post("/api/order", { code: CODE, type: side, price: price, qty: qty });
+  await swal(res.result === "success" ? "Order placed." : "Order failed: " + res.message);
+  refresh();
+}
+
+async function cancelOrder(orderId) {
+  await swal("Cancel order " + orderId + " ?");
+  const res = await post("/api/cancel", { code: CODE, orderid: orderId });
+  await swal(res.result === "success" ? "Order cancelled." : "Cancel failed.");
+  refresh();
+}
+
+document.getElementById("btnBuying").addEventListener("click", () => submitOrder("bid"));
+document.getElementById("btnSelling").addEventListener("click", () => submitOrder("ask"));
+document.getElementById("out-standing-list").addEventListener("click", (ev) => {
+  const btn = ev.target.closest("button.order-cancel");
+  if (btn) { cancelOrder(btn.getAttribute("data-orderid")); }
+});
+
+const bookRows = (levels) => levels.map(([p, q]) =>
+  '<a class="bidding-table-rows"><div class="col-price">' + fmt(p, 8) +
+  '</div><div class="col-amount">' + fmt(q, 8) +
+  '</div><div class="col-cost">' + fmt(q, 8) + "</div></a>").join("");
+
+let lastJson = "";
+async function refresh() {
+  const r = await fetch("/api/state?code=" + encodeURIComponent(CODE));
+  const text = await r.text();
+  if (text === lastJson) { return; }
+  lastJson = text;
+  const st = JSON.parse(text);
+
+  document.getElementById("last-price").textContent = fmt(st.last, 8);
+  document.getElementById("user_base_trans").textContent = fmt(st.balances.usdt, 2);
+  document.getElementById("user_base_coin").textContent = fmt(st.balances.coin, 8);
+  document.getElementById("mCSB_2_container").innerHTML = bookRows(st.asks);
+  document.getElementById("mCSB_3_container").innerHTML = bookRows(st.bids);
+  document.getElementById("out-standing-list").innerHTML = st.open.map((o) =>
+    "<tr><td>" + o.ts + "</td><td>" + COIN + "/USDT</td><td>" + (o.side === "bid" ? "buy" : "sell") +
+    "</td><td>" + fmt(o.price, 8) + "<br>USDT</td><td>" + fmt(o.qty, 8) + "</td><td>" + fmt(o.pending, 8) +
+    '</td><td><button class="order-cancel" data-orderid="' + o.id + '" data-tradetype="' + o.side +
+    '">Cancel</button></td></tr>').join("");
+}
+refresh();
+setInterval(refresh, CFG.refreshMs);
+</script>
+</body></html>
+"""
+
+
+class SimState:
+    def __init__(self, cfg: SimConfig):
+        self.cfg = cfg
+        self.markets: Dict[str, SimMarket] = {}
+        self._lock = threading.Lock()
+        self.stats = {"orders": 0, "cancels": 0, "rejects": 0}
+
+    def market(self, code: str) -> SimMarket:
+        code = (code or "USDT-BTC").upper()
+        with self._lock:
+            if code not in self.markets:
+                self.markets[code] = SimMarket(code, self.cfg)
+            return self.markets[code]
+
+
+def _make_handler(state: SimState):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, fmt, *args):
+            pass
+
+        def _send(self, code: int, body: str, content_type: str):
+            data = body.encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _json(self, obj, code: int = 200):
+            self._send(code, json.dumps(obj), "application/json")
+
+        def _body(self) -> dict:
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length).decode("utf-8") if length else ""
+            if "json" in (self.headers.get("Content-Type") or ""):
+                try:
+                    return json.loads(raw or "{}")
+                except ValueError:
+                    return {}
+            return {k: v[0] for k, v in parse_qs(raw).items()}
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+            if url.path in ("/", "/account/login"):
+                self._send(200, _LOGIN_HTML, "text/html; charset=utf-8")
+            elif url.path == "/trade":
+                page_cfg = {"animMs": state.cfg.anim_ms, "refreshMs": state.cfg.refresh_ms}
+                html = _TRADE_HTML.replace("__CONFIG__", json.dumps(page_cfg))
+                self._send(200, html, "text/html; charset=utf-8")
+            elif url.path == "/api/state":
+                self._json(state.market(query.get("code")).snapshot())
+            elif url.path == "/api/stats":
+                self._json(state.stats)
+            else:
+                self._send(404, "not found", "text/plain")
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            body = self._body()
+            time.sleep(state.cfg.server_delay_ms / 1000.0)
+
+            if url.path == "/api/order":
+                try:
+                    price = float(str(body.get("price", "")).replace(",", ""))
+                    qty = float(str(body.get("qty", "")).replace(",", ""))
+                except ValueError:
+                    state.stats["rejects"] += 1
+                    self._json({"result": "fail", "message": "bad number"})
+                    return
+                ok, msg, order = state.market(body.get("code")).place(
+                    str(body.get("type", "")).lower(), price, qty
+                )
+                if ok:
+                    state.stats["orders"] += 1
+                    self._json({"result": "success", "orderid": order.order_id})
+                else:
+                    state.stats["rejects"] += 1
+                    self._json({"result": "fail", "message": msg})
+            elif url.path == "/api/cancel":
+                ok = state.market(body.get("code")).cancel(str(body.get("orderid", "")))
+                if ok:
+                    state.stats["cancels"] += 1
+                self._json({"result": "success" if ok else "fail"})
+            else:
+                self._send(404, "not found", "text/plain")
+
+    return Handler
+
+
+def start_sim_server(
+    cfg: Optional[SimConfig] = None, host: str = "127.0.0.1", port: int = 0
+) -> Tuple[ThreadingHTTPServer, SimState, str]:
+    """Start the simulator in a background thread. Returns (server, state, base_url)."""
+    state = SimState(cfg or SimConfig())
+    server = ThreadingHTTPServer((host, port), _make_handler(state))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="vic-sim", daemon=True)
+    thread.start()
+    base_url = f"http://{host}:{server.server_address[1]}"
+    return server, state, base_url
+
+
+def _parse_args(argv: Optional[List[str]] = None):
+    d = SimConfig()
+    ap = argparse.ArgumentParser(description="Local VicEX trade page simulator")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--anim-ms", type=int, default=d.anim_ms)
+    ap.add_argument("--server-delay-ms", type=int, default=d.server_delay_ms)
+    ap.add_argument("--refresh-ms", type=int, default=d.refresh_ms)
+    ap.add_argument("--mid", type=float, default=d.mid_price)
+    return ap.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = _parse_args(argv)
+    cfg = SimConfig(
+        anim_ms=args.anim_ms,
+        server_delay_ms=args.server_delay_ms,
+        refresh_ms=args.refresh_ms,
+        mid_price=args.mid,
+    )
+    server, _, base_url = start_sim_server(cfg, args.host, args.port)
+    print(f"VicEX simulator running at {base_url}/trade?code=USDT-BTC (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+# conftest.py
+"""
+Tests run from bot/ (`python -m pytest -q`) without a .env: the settings the
+modules read at import time get harmless defaults here.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_TEST_ENV = {
+    "CHROME_DRIVER_PATH": "/nonexistent/chromedriver",
+    "VIC_URL": "http://127.0.0.1:1",
+    "ORDERBOOK_REFRESH_INTERVAL": "1",
+    "ADJUSTMENT_MIN": "0",
+    "ADJUSTMENT_MAX": "0",
+    "FOLLOW_UPDATE_SEC": "1",
+    "MM_LEVELS": "3",
+    "MM_REBALANCE_INTERVAL_SEC": "10",
+    "MM_REFILL_INTERVAL_SEC": "5",
+    "MM_STEP_PERCENT": "0.5",
+    "MM_CANCEL_ROW_TIMEOUT_SEC": "5",
+    "MM_MAX_CANCEL_OPS_PER_CYCLE": "5",
+    "MM_BUY_BUDGET_RATIO": "0.9",
+    "MM_SELL_QTY_RATIO": "0.9",
+    "MM_TOAST_WAIT_SEC": "0.1",
+    "ANCHOR_ORDER_BUDGET_RATIO": "0.3",
+    "MIN_ORDER_USDT": "5",
+}
+for _key, _value in _TEST_ENV.items():
+    os.environ.setdefault(_key, _value)
@@ -0,0 +1,154 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from modes.mm import kill_switch, supervisor
+from modes.mm.kill_switch import flatten_engine, flatten_orders
+from modes.mm.order_state import OrderBookState
+from modes.mm.supervisor import DriverLane, EngineSlot, MarketSpec, MarketSupervisor
+from modes.mm.vic_orders import OrderRow
+
+
+class FakeTable:
+    """The account's open-orders table, shared by every page (driver)."""
+
+    def __init__(self, rows):
+        self.rows = {r.order_id: r for r in rows}
+        self.cancelled = []
+        self._lock = threading.Lock()
+
+    def read(self, driver, timeout=10):
+        with self._lock:
+            return list(self.rows.values()), time.time()
+
+    def cancel(self, driver, order_ids, **kwargs):
+        with self._lock:
+            for oid in order_ids:
+                if self.rows.pop(oid, None) is not None:
+                    self.cancelled.append(oid)
+        return {oid: True for oid in order_ids}
+
+
+def _row(side, price, order_id, qty=1.0):
+    return OrderRow(side=side, price=price, order_id=order_id, row_el=None, qty=qty)
+
+
+@pytest.fixture
+def table(monkeypatch):
+    table = FakeTable(
+        [_row("bid", 99.0, "B1"), _row("bid", 98.0, "B2"), _row("ask", 101.0, "A1")]
+    )
+    monkeypatch.setattr(kill_switch, "read_open_orders_at", table.read)
+    monkeypatch.setattr(kill_switch, "cancel_orders_by_id", table.cancel)
+    return table
+
+
+def test_flatten_only_touches_its_own_side(table):
+    report = flatten_orders(object(), deadline_sec=5, label="BTC BID", sides=("bid",))
+
+    assert sorted(table.cancelled) == ["B1", "B2"]
+    assert report.found == 2 and report.flat
+    assert list(table.rows) == ["A1"]
+
+
+def test_own_only_flatten_spares_orders_the_engine_did_not_place(table):
+    orders = OrderBookState(30.0)
+    orders.record_placed("bid", 99.0, 1.0, "ladder")
+
+    flatten_orders(object(), deadline_sec=5, sides=("bid",), orders=orders)
+
+    assert table.cancelled == ["B1"]
+    assert set(table.rows) == {"B2", "A1"}
+
+
+class FakeEngine:
+    def __init__(self, targets, start_result=True, start_error=None):
+        self.orders = OrderBookState(30.0)
+        self._targets = targets
+        self._start_result = start_result
+        self._start_error = start_error
+        self.closed = False
+
+    def kill_switch_targets(self):
+        return self._targets
+
+    def start(self):
+        # the first rebalance got one order out before it failed or gave up
+        self.orders.record_placed("bid", 99.0, 1.0, "anchor")
+        if self._start_error is not None:
+            raise self._start_error
+        return self._start_result
+
+    def close(self):
+        self.closed = True
+
+
+def test_two_lanes_flatten_their_own_side_in_parallel(table):
+    engine = FakeEngine(
+        [("BTC BID", object(), None, ("bid",)), ("BTC ASK", object(), None, ("ask",))]
+    )
+
+    reports = flatten_engine(engine, deadline_sec=5)
+
+    assert sorted(table.cancelled) == ["A1", "B1", "B2"]
+    assert [r.found for r in reports] == [2, 1]
+
+
+class FakeSession:
+    def driver(self):
+        return self
+
+    current_window_handle = "tab-0"
+
+
+def _lane(monkeypatch, engine):
+    monkeypatch.setattr(supervisor, "build_engine", lambda *a, **kw: engine)
+    sup = SimpleNamespace(vic_url="http://vic.test", prices=None, max_consecutive_errors=1)
+    lane = DriverLane("0", FakeSession(), sup)
+    slot = EngineSlot(MarketSpec("follow-bid", "BTC"))
+    slot.handle = lane._current_handle = "tab-0"
+    lane.slots.append(slot)
+    return lane, slot
+
+
+@pytest.mark.parametrize(
+    "engine_kwargs", [{"start_error": RuntimeError("boom")}, {"start_result": False}]
+)
+def test_supervisor_flattens_an_engine_whose_start_failed(
+    monkeypatch, table, engine_kwargs
+):
+    engine = FakeEngine([("BTC BID", object(), None, ("bid",))], **engine_kwargs)
+    lane, slot = _lane(monkeypatch, engine)
+
+    lane._step(slot)
+
+    assert slot.engine is engine and not slot.started
+    assert slot.health.state == "failed"
+    assert table.cancelled == ["B1"]  # its own order only, B2 is someone else's
+
+
+def test_stop_does_not_flatten_a_browser_whose_worker_is_still_busy(monkeypatch, table):
+    monkeypatch.setattr(supervisor, "FLAG_KILL_SWITCH_ENABLE", True)
+    idle = FakeEngine([("BTC ASK", object(), None, ("ask",))])
+    busy = FakeEngine([("BTC BID", object(), None, ("bid",))])
+    lanes = [_lane(monkeypatch, engine)[0] for engine in (idle, busy)]
+    for lane, engine in zip(lanes, (idle, busy)):
+        lane.slots[0].engine = engine
+    release = threading.Event()
+    lanes[1]._thread = threading.Thread(target=release.wait, daemon=True)
+    lanes[1]._thread.start()  # stuck in a tick on its driver
+    sup = SimpleNamespace(
+        stop_event=threading.Event(),
+        lanes=lanes,
+        slots=[lane.slots[0] for lane in lanes],
+    )
+
+    try:
+        MarketSupervisor.stop(sup, timeout=0.1)
+    finally:
+        release.set()
+
+    assert table.cancelled == ["A1"]
+    assert idle.closed and not busy.closed
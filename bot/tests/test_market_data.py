@@ -0,0 +1,235 @@
+# test_market_data.py
+import base64
+import hashlib
+import json
+import socket
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from modes import market_data
+from modes.market_data import BinancePriceStream, get_binance_prices
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def _aggtrade(symbol, price):
+    return json.dumps({"e": "aggTrade", "s": symbol, "p": str(price), "q": "1"})
+
+
+def _bookticker(symbol, bid, ask):
+    return json.dumps(
+        {"u": 1, "s": symbol, "b": str(bid), "B": "1", "a": str(ask), "A": "1"}
+    )
+
+
+class StandInStream:
+    """Minimal WebSocket server: records client frames, sends text frames."""
+
+    def __init__(self):
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(1)
+        self.url = f"ws://127.0.0.1:{self.sock.getsockname()[1]}"
+        self.received = []
+        self.conn = None
+        self.connected = threading.Event()
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        conn, _ = self.sock.accept()
+        request = b""
+        while b"\r\n\r\n" not in request:
+            request += conn.recv(4096)
+        key = [
+            line.split(":", 1)[1].strip()
+            for line in request.decode().split("\r\n")
+            if line.lower().startswith("sec-websocket-key")
+        ][0]
+        accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode()).digest())
+        conn.sendall(
+            b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+            b"Connection: Upgrade\r\nSec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+        )
+        self.conn = conn
+        self.connected.set()
+        while True:
+            opcode, frame = self._read_frame(conn)
+            if opcode is None or opcode == 0x8:
+                if opcode == 0x8:
+                    conn.sendall(bytes([0x88, 0]))  # answer the close handshake
+                return
+            if opcode == 0x1:
+                self.received.append(frame)
+
+    @staticmethod
+    def _read_frame(conn):
+        head = conn.recv(2)
+        if len(head) < 2:
+            return None, None
+        length = head[1] & 0x7F
+        if length == 126:
+            length = struct.unpack(">H", conn.recv(2))[0]
+        elif length == 127:
+            length = struct.unpack(">Q", conn.recv(8))[0]
+        mask = conn.recv(4)
+        data = b""
+        while len(data) < length:
+            data += conn.recv(length - len(data))
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+        return head[0] & 0x0F, payload.decode(errors="replace")
+
+    def send(self, text: str):
+        data = text.encode()
+        header = bytes([0x81])
+        if len(data) < 126:
+            header += bytes([len(data)])
+        else:
+            header += bytes([126]) + struct.pack(">H", len(data))
+        self.conn.sendall(header + data)
+
+    def close(self):
+        try:
+            if self.conn is not None:
+                self.conn.close()
+        finally:
+            self.sock.close()
+
+
+def _wait(cond, timeout=5.0):
+    end = time.time() + timeout
+    while time.time() < end:
+        if cond():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.fixture
+def stand_in():
+    server = StandInStream()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def stream(stand_in):
+    s = BinancePriceStream(ws_url=stand_in.url, reconnect_delay=60)
+    s.subscribe("BTCUSDT")
+    assert s.start()
+    assert stand_in.connected.wait(5)
+    yield s
+    s.stop()
+
+
+def test_stream_subscribes_to_aggtrade_only(stand_in, stream):
+    assert _wait(lambda: stand_in.received)
+    request = json.loads(stand_in.received[0])
+    assert request["method"] == "SUBSCRIBE"
+    assert request["params"] == ["btcusdt@aggTrade"]
+
+
+def test_stream_keeps_last_trade_and_ignores_book_ticker(stand_in, stream):
+    assert _wait(lambda: stand_in.received)
+    stand_in.send(_aggtrade("BTCUSDT", 100.5))
+    assert _wait(lambda: stream.get_price("BTCUSDT", max_age=5) == 100.5)
+
+    # a bookTicker mid (101.0) must not replace the last-trade price
+    stand_in.send(_bookticker("BTCUSDT", 100.0, 102.0))
+    trade = json.loads(_aggtrade("BTCUSDT", 99.0))
+    stand_in.send(json.dumps({"stream": "btcusdt@aggTrade", "data": trade}))
+    assert _wait(lambda: stream.get_price("BTCUSDT", max_age=5) == 99.0)
+    assert stream.get_price("BTCUSDT", max_age=5) == 99.0
+
+
+def test_stream_price_expires():
+    s = BinancePriceStream(ws_url="ws://127.0.0.1:1")
+    s._on_message(None, _aggtrade("ETHUSDT", 10))
+    assert s.get_price("ETHUSDT", max_age=5) == 10.0
+    s._prices["ETHUSDT"] = (10.0, time.time() - 10)
+    assert s.get_price("ETHUSDT", max_age=5) is None
+
+
+def test_stream_ignores_bad_messages():
+    s = BinancePriceStream(ws_url="ws://127.0.0.1:1")
+    messages = (
+        "not json",
+        "[]",
+        json.dumps({"e": "aggTrade", "s": "X", "p": "abc"}),
+        json.dumps({"e": "aggTrade", "s": "X", "p": "-1"}),
+        _bookticker("X", 1, 2),
+    )
+    for message in messages:
+        s._on_message(None, message)
+    assert s.last_update("X") is None
+
+
+class _TickerHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        from urllib.parse import parse_qs, urlparse
+
+        query = parse_qs(urlparse(self.path).query)
+        type(self).requests_seen.append(query)
+        table = {"ETHUSDT": "2000.5", "SOLUSDT": "150.25"}
+        if "symbols" in query:
+            body = [
+                {"symbol": s, "price": table[s]}
+                for s in json.loads(query["symbols"][0])
+                if s in table
+            ]
+        else:
+            body = {"symbol": query["symbol"][0], "price": table[query["symbol"][0]]}
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def rest_stand_in(monkeypatch):
+    _TickerHandler.requests_seen = []
+    server = HTTPServer(("127.0.0.1", 0), _TickerHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(
+        market_data,
+        "BINANCE_PRICE_API_URL",
+        f"http://127.0.0.1:{server.server_address[1]}/api/v3/ticker/price",
+    )
+    yield _TickerHandler
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_binance_prices_stream_first_then_one_batched_request(
+    stand_in, stream, rest_stand_in, monkeypatch
+):
+    monkeypatch.setattr(market_data, "get_binance_price_stream", lambda: stream)
+    assert _wait(lambda: stand_in.received)
+    stand_in.send(_aggtrade("BTCUSDT", 30000.0))
+    assert _wait(lambda: stream.get_price("BTCUSDT", max_age=5) is not None)
+
+    prices = get_binance_prices(["btcusdt", "ETHUSDT", "SOLUSDT", "NOPEUSDT"])
+
+    assert prices == {"BTCUSDT": 30000.0, "ETHUSDT": 2000.5, "SOLUSDT": 150.25}
+    assert len(rest_stand_in.requests_seen) == 1
+    assert json.loads(rest_stand_in.requests_seen[0]["symbols"][0]) == [
+        "ETHUSDT",
+        "SOLUSDT",
+        "NOPEUSDT",
+    ]
+
+
+def test_get_binance_prices_without_stream_uses_rest(rest_stand_in, monkeypatch):
+    monkeypatch.setattr(market_data, "get_binance_price_stream", lambda: None)
+    assert get_binance_prices(["ETHUSDT"]) == {"ETHUSDT": 2000.5}
+    assert rest_stand_in.requests_seen == [{"symbol": ["ETHUSDT"]}]
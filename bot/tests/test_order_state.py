@@ -0,0 +1,75 @@
+import time
+
+from modes.mm.order_state import OrderBookState
+from modes.mm.vic_orders import OrderRow
+
+
+def _row(side, price, order_id, qty=0.0):
+    return OrderRow(side=side, price=price, order_id=order_id, row_el=None, qty=qty)
+
+
+def test_pending_order_missing_from_a_later_read_is_dropped():
+    book = OrderBookState(30.0)
+    book.record_placed("ask", 100.0, 1.0, "bait")
+
+    summary = book.reconcile([], read_ts=time.time())
+
+    assert summary["dropped"] == 1
+    assert book.open_orders() == []
+
+
+def test_pending_order_placed_after_the_read_stays_live():
+    book = OrderBookState(30.0)
+    read_ts = time.time() - 1.0
+    order = book.record_placed("bid", 100.0, 1.0, "ladder")
+
+    summary = book.reconcile([], read_ts=read_ts)
+
+    assert summary["dropped"] == 0
+    assert book.get(order.order_id).status == "pending"
+
+
+def test_adoption_matches_qty_not_just_side_and_price():
+    book = OrderBookState(30.0)
+    bait = book.record_placed("ask", 100.0, 0.5, "bait")
+    anchor = book.record_placed("ask", 100.0, 20.0, "anchor")
+
+    summary = book.reconcile([_row("ask", 100.0, "X1", qty=0.5)])
+
+    assert summary == {"adopted": 1, "closed": 0, "external": 0, "dropped": 1}
+    assert book.get("X1").role == "bait"
+    assert book.get(anchor.order_id) is None
+    assert bait.order_id == "X1"
+
+
+def test_same_qty_row_goes_to_the_resting_role_first():
+    book = OrderBookState(30.0)
+    book.record_placed("bid", 100.0, 1.0, "sweep")
+    book.record_placed("bid", 100.0, 1.0, "anchor")
+
+    book.reconcile([_row("bid", 100.0, "X1", qty=1.0)])
+
+    assert book.get("X1").role == "anchor"
+    assert [o.order_id for o in book.open_orders()] == ["X1"]
+
+
+def test_row_without_qty_matches_on_price_and_unknown_rows_are_external():
+    book = OrderBookState(30.0)
+    book.record_placed("bid", 100.0, 1.0, "ladder")
+
+    summary = book.reconcile([_row("bid", 100.0, "X1"), _row("ask", 105.0, "X2", 3.0)])
+
+    assert summary["adopted"] == 1 and summary["external"] == 1
+    assert book.get("X1").role == "ladder"
+    assert book.get("X2").role == "external"
+
+
+def test_open_order_that_left_the_table_is_closed():
+    book = OrderBookState(30.0)
+    book.record_placed("bid", 100.0, 1.0, "ladder")
+    book.reconcile([_row("bid", 100.0, "X1", qty=1.0)])
+
+    summary = book.reconcile([])
+
+    assert summary["closed"] == 1
+    assert book.open_orders() == []
@@ -0,0 +1,158 @@
+import json
+
+import pytest
+
+import config
+import service
+from modes import session as session_module
+from modes.mm import kill_switch, supervisor
+from service import ConfigError, _parse_args, load_service_config
+
+
+def _load(tmp_path, cfg, *flags):
+    path = tmp_path / "bot.json"
+    path.write_text(json.dumps(cfg), encoding="utf-8")
+    return load_service_config(_parse_args(["--config", str(path), *flags]))
+
+
+def test_flags_override_the_file_and_the_ticker_is_normalised(tmp_path):
+    cfg = _load(
+        tmp_path,
+        {"mode": "follow-bid", "ticker": "btcusdt", "fixed_amount": "200"},
+        "--fixed-amount",
+        "300",
+    )
+
+    assert cfg == {"mode": "follow-bid", "ticker": "BTC", "fixed_amount": 300.0}
+
+
+@pytest.mark.parametrize(
+    "cfg, error",
+    [
+        ({"mode": "grid", "ticker": "BTC"}, "mode must be one of"),
+        ({"mode": "follow-bid", "ticker": " "}, "ticker is required"),
+        ({"mode": "follow-bid", "ticker": "BTC", "fixed_amount": "x"}, "must be a number"),
+        ({"mode": "follow-bid", "ticker": "BTC", "fixed_amount": 0}, "must be > 0"),
+        ({"mode": "dual", "ticker": "BTC", "bid_amount": 5}, "needs bid_amount and ask"),
+        (
+            {"mode": "follow-bid", "ticker": "BTC", "ask_user_data_dir": "/p2"},
+            "only used in dual mode",
+        ),
+        (
+            {
+                "mode": "dual",
+                "ticker": "BTC",
+                "bid_amount": 5,
+                "ask_amount": 5,
+                "user_data_dir": "/p1",
+                "ask_user_data_dir": "/p1",
+            },
+            "must differ from user_data_dir",
+        ),
+        ({"mode": "dual", "ticker": "BTC", "bid": 5}, "unknown config keys"),
+    ],
+)
+def test_single_bot_config_errors(tmp_path, cfg, error):
+    with pytest.raises(ConfigError, match=error):
+        _load(tmp_path, cfg)
+
+
+def test_unreadable_config_is_a_config_error(tmp_path):
+    path = tmp_path / "bot.json"
+    path.write_text("{not json", encoding="utf-8")
+
+    with pytest.raises(ConfigError, match="cannot read config"):
+        load_service_config(_parse_args(["--config", str(path)]))
+
+
+def test_fleet_config_validates_every_bot_and_takes_profile_flags(tmp_path):
+    cfg = _load(
+        tmp_path,
+        {
+            "bots": [
+                {"mode": "follow-bid", "ticker": "eth", "fixed_amount": 200},
+                {"mode": "dual", "ticker": "BTC", "bid_amount": 500, "ask_amount": 500},
+            ],
+            "user_data_dirs": ["/p1", "/p2"],
+            "tabs_per_driver": 4,
+        },
+        "--user-data-dir",
+        "/p3",
+        "--profile",
+        "lean",
+    )
+
+    assert [b["ticker"] for b in cfg["bots"]] == ["ETH", "BTC"]
+    assert cfg["user_data_dirs"] == ["/p3"] and cfg["profile"] == "LEAN"
+    assert cfg["tabs_per_driver"] == 4
+
+
+_FOLLOW = {"mode": "follow-bid", "ticker": "BTC"}
+
+
+@pytest.mark.parametrize(
+    "cfg, error",
+    [
+        ({"bots": []}, "non-empty list"),
+        ({"bots": ["BTC"]}, r"bots\[0\] must be an object"),
+        ({"bots": [{"mode": "dual", "ticker": "BTC", "profile": "LEAN"}]}, "keys in bots"),
+        ({"bots": [{"mode": "dual", "ticker": "BTC"}]}, r"bots\[0\]: dual mode needs"),
+        ({"bots": [_FOLLOW], "mode": "dual"}, "unknown config keys"),
+        ({"bots": [_FOLLOW], "user_data_dirs": "/p"}, "must be a list"),
+        ({"bots": [_FOLLOW], "tabs_per_driver": 0}, ">= 1"),
+    ],
+)
+def test_fleet_config_errors(tmp_path, cfg, error):
+    with pytest.raises(ConfigError, match=error):
+        _load(tmp_path, cfg)
+
+
+class FakeSession:
+    user_data_dir = "/p1"
+
+    def __init__(self, *args, **kwargs):
+        self.closed = False
+
+    def driver(self):
+        return self
+
+    def is_logged_in(self):
+        return True
+
+    def close(self):
+        self.closed = True
+
+
+class FailedStartEngine:
+    def __init__(self):
+        self.ticks = 0
+        self.closed = False
+
+    def start(self):
+        return False  # e.g. the clean start could not clear old orders
+
+    def tick(self):
+        self.ticks += 1
+
+    def run_mm(self):
+        if self.start():
+            self.tick()
+
+    def close(self):
+        self.closed = True
+
+    def log_latency_report(self):
+        pass
+
+
+def test_an_engine_that_cannot_start_exits_as_crashed(monkeypatch):
+    engine = FailedStartEngine()
+    monkeypatch.setattr(session_module, "BrowserSession", FakeSession)
+    monkeypatch.setattr(supervisor, "build_engine", lambda *a, **kw: engine)
+    monkeypatch.setattr(config, "FLAG_KILL_SWITCH_ENABLE", False)
+    monkeypatch.setattr(kill_switch, "flatten_engine", lambda engine: [])
+
+    code = service.run_service({"mode": "follow-bid", "ticker": "BTC", "fixed_amount": 5.0})
+
+    assert code == service.EXIT_CRASHED
+    assert engine.ticks == 0 and engine.closed
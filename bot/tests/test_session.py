@@ -0,0 +1,35 @@
+from modes import session as session_mod
+from modes.session import BrowserSession
+
+
+class FakeDriver:
+    window_handles = ["main"]
+    current_url = "http://vic.test/trade"
+
+    def get(self, url):
+        self.current_url = url
+
+
+def _session(monkeypatch, login_ok):
+    monkeypatch.setattr(session_mod, "check_login_success", lambda driver: False)
+    monkeypatch.setattr(
+        session_mod, "validate_login_or_exit", lambda driver, **kwargs: login_ok
+    )
+    session = BrowserSession("http://vic.test", debugger_address=None, user_data_dir=None)
+    session._driver = FakeDriver()
+    return session
+
+
+def test_acquire_returns_none_when_login_fails(monkeypatch):
+    session = _session(monkeypatch, login_ok=False)
+
+    assert session.acquire(3) is None
+
+
+def test_acquire_returns_the_driver_after_a_manual_login(monkeypatch):
+    session = _session(monkeypatch, login_ok=True)
+
+    driver = session.acquire(3)
+
+    assert driver is session._driver
+    assert driver.current_url == "http://vic.test/account/login"
@@ -0,0 +1,103 @@
+import pytest
+
+from modes.mm import vic_account_balance
+from modes.mm.vic_account_balance import BalanceProvider
+
+
+class FakePage:
+    """Balances the page would show; counts reads per asset."""
+
+    def __init__(self, usdt, coin):
+        self.values = {"USDT": usdt, "COIN": coin}
+        self.reads = {"USDT": 0, "COIN": 0}
+
+    def usdt(self, driver, timeout=10):
+        self.reads["USDT"] += 1
+        return self.values["USDT"]
+
+    def coin(self, driver, timeout=10, asset=None):
+        self.reads["COIN"] += 1
+        return self.values["COIN"]
+
+
+@pytest.fixture
+def page(monkeypatch):
+    page = FakePage(usdt=1000.0, coin=10.0)
+    monkeypatch.setattr(vic_account_balance, "get_available_buy_usdt", page.usdt)
+    monkeypatch.setattr(vic_account_balance, "get_available_sell_qty", page.coin)
+    return page
+
+
+def _provider(ttl_sec=60.0):
+    return BalanceProvider(object(), "BTC", ttl_sec=ttl_sec)
+
+
+def test_reads_once_within_ttl_and_updates_from_our_orders(page):
+    balances = _provider()
+    balances.refresh()
+
+    balances.on_placed("bid", 100.0, 2.0)
+    balances.on_placed("ask", 100.0, 3.0)
+
+    assert balances.usdt() == 800.0
+    assert balances.coin() == 7.0
+    assert page.reads == {"USDT": 1, "COIN": 1}
+
+
+def test_fills_credit_the_other_asset(page):
+    balances = _provider()
+    balances.refresh()
+
+    balances.on_filled("bid", 100.0, 2.0)
+    balances.on_filled("ask", 100.0, 1.0)
+
+    assert balances.coin() == 12.0
+    assert balances.usdt() == 1100.0
+
+
+def test_cancel_gives_funds_back_and_marks_the_asset_stale(page):
+    balances = _provider()
+    balances.refresh()
+    balances.on_placed("bid", 100.0, 2.0)
+    assert balances.usdt() == 800.0
+
+    balances.on_cancelled("bid", 100.0, 2.0)
+    page.values["USDT"] = 950.0  # part of it filled before the cancel
+
+    assert balances.usdt() == 950.0
+    assert page.reads["USDT"] == 2
+
+
+def test_unconfirmed_order_is_deducted_inside_the_scope_and_reread_after(page):
+    balances = _provider()
+
+    with balances.rebalance():
+        assert balances.usdt() == 1000.0
+        balances.on_placed("bid", 100.0, 3.0, confirmed=False)
+        assert balances.usdt() == 700.0
+        assert page.reads["USDT"] == 1
+
+    assert balances.usdt() == 1000.0  # it did not go through after all
+    assert page.reads["USDT"] == 2
+
+
+def test_ttl_expiry_and_invalidate_force_a_read(page):
+    balances = _provider(ttl_sec=0.0)
+    balances.coin()
+    balances.coin()
+    assert page.reads["COIN"] == 2
+
+    balances = _provider()
+    balances.coin()
+    balances.invalidate("btc")
+    balances.coin()
+    assert page.reads["COIN"] == 4
+
+
+def test_balance_never_goes_negative(page):
+    balances = _provider()
+    balances.refresh()
+
+    balances.on_placed("ask", 100.0, 50.0)
+
+    assert balances.coin() == 0.0
@@ -0,0 +1,140 @@
+# test_vic_gateway.py
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from modes.mm.vic_gateway import HttpOrderGateway
+from modes.mm.vic_orders import OrderRow
+from sim.vic_sim_server import SimConfig, start_sim_server
+
+
+class FakeDriver:
+    """Just enough of a logged-in driver for HttpOrderGateway.refresh_session()."""
+
+    def get_cookies(self):
+        return [{"name": "session", "value": "sim", "domain": "127.0.0.1", "path": "/"}]
+
+    def execute_script(self, script, *args):
+        return "sim-csrf-token" if "csrf" in script else "pytest"
+
+
+@pytest.fixture
+def sim():
+    server, state, base_url = start_sim_server(SimConfig(server_delay_ms=0))
+    yield state, base_url
+    server.shutdown()
+    server.server_close()
+
+
+def _gateway(base_url, order_path="/api/order", cancel_path="/api/cancel"):
+    return HttpOrderGateway(
+        FakeDriver(), base_url, "BTC", order_path=order_path, cancel_path=cancel_path
+    )
+
+
+def _user_orders(state):
+    return [o for o in state.market("USDT-BTC").orders.values() if o.owner == "user"]
+
+
+def test_place_and_cancel_against_sim(sim):
+    state, base_url = sim
+    gateway = _gateway(base_url)
+
+    assert gateway.place_limit_order("bid", 90.0, 1.0)
+    orders = _user_orders(state)
+    assert len(orders) == 1 and orders[0].side == "bid"
+
+    row = OrderRow(side="bid", price=90.0, order_id=orders[0].order_id, row_el=None)
+    assert gateway.cancel_order(row)
+    assert _user_orders(state) == []
+    gateway.close()
+
+
+def test_rejects_are_failures(sim):
+    state, base_url = sim
+    gateway = _gateway(base_url)
+
+    assert not gateway.place_limit_order("bid", 90.0, 10_000_000.0)  # no funds
+    assert not gateway.cancel_order(
+        OrderRow(side="bid", price=90.0, order_id="does-not-exist", row_el=None)
+    )
+    assert state.stats["rejects"] == 1
+    gateway.close()
+
+
+def test_unknown_path_is_a_failure(sim):
+    _, base_url = sim
+    gateway = _gateway(base_url, order_path="/api/nope", cancel_path="/api/nope")
+    assert not gateway.place_limit_order("bid", 90.0, 1.0)
+    assert not gateway.cancel_order(
+        OrderRow(side="bid", price=90.0, order_id="1", row_el=None)
+    )
+    gateway.close()
+
+
+class _OddResponses(BaseHTTPRequestHandler):
+    """200 responses that are not an explicit success."""
+
+    bodies = {
+        "/html": ("text/html", "<html><form action='/account/login'></form></html>"),
+        "/empty": ("application/json", "{}"),
+        "/no-field": ("application/json", json.dumps({"orderid": "1"})),
+        "/list": ("application/json", "[]"),
+        "/false": ("application/json", json.dumps({"success": False})),
+        "/ok": ("application/json", json.dumps({"status": "ok"})),
+    }
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        content_type, body = self.bodies[self.path]
+        data = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def odd_server():
+    server = HTTPServer(("127.0.0.1", 0), _OddResponses)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("/html", False),
+        ("/empty", False),
+        ("/no-field", False),
+        ("/list", False),
+        ("/false", False),
+        ("/ok", True),
+    ],
+)
+def test_only_explicit_success_counts(odd_server, path, expected):
+    gateway = _gateway(odd_server, order_path=path, cancel_path=path)
+    assert gateway.place_limit_order("ask", 110.0, 1.0) is expected
+    assert (
+        gateway.cancel_order(OrderRow(side="ask", price=110.0, order_id="1", row_el=None))
+        is expected
+    )
+    gateway.close()
+
+
+def test_each_gateway_times_into_its_own_recorder(sim):
+    _, base_url = sim
+    first, second = _gateway(base_url), _gateway(base_url)
+
+    assert first.place_limit_order("bid", 90.0, 1.0)
+
+    assert first.latency.summary()["http_place"]["bid"]["total"]["count"] == 1
+    assert second.latency.summary() == {}
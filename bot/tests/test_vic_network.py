@@ -0,0 +1,163 @@
+import json
+import os
+import time
+
+import pytest
+
+from modes.mm import vic_network
+from modes.mm.order_state import OrderBookState
+from modes.mm.vic_network import (
+    BookUpdate,
+    JsonFrameDecoder,
+    NetworkCapture,
+    NetworkState,
+    OrdersUpdate,
+    replay_frames,
+)
+from modes.mm.vic_orders import read_open_orders_at
+
+FRAMES = os.path.join(os.path.dirname(__file__), "fixtures", "frames.jsonl")
+WS_URL = "wss://vic.test/socket.io/?EIO=4&transport=websocket"
+
+
+def test_replay_builds_book_orders_and_balances_from_the_recording():
+    state, count = replay_frames(FRAMES)
+
+    assert count == 6  # two book snapshots, two book deltas, orders, balances
+    assert state.orderbook("ask") == [(102.0, 1.0), (103.0, 4.0)]
+    assert state.orderbook("bid") == [(99.0, 5.0), (98.0, 1.0)]
+    orders = {r.order_id: r for r in state.open_orders()}
+    assert set(orders) == {"A1", "A2"}
+    assert (orders["A1"].side, orders["A1"].qty, orders["A1"].pending_qty) == (
+        "bid",
+        1.0,
+        0.4,
+    )
+    assert state.balances() == {"USDT": 1000.5, "BTC": 0.25}
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        '{"data": {"orders": [{"orderid": "1", "price": "1", "qty": "1", "type": "buy"}]}}',
+        '{"buy": [], "sell": []}',
+        '{"bids": [["1", "1"]], "asks": [["2", "1"]]}',
+        '42["ticker", {"balance": {"usdt": "5"}}]',
+    ],
+)
+def test_decoder_ignores_payloads_without_a_channel(payload):
+    assert JsonFrameDecoder().decode("ws", WS_URL, payload) == []
+
+
+def test_decoder_takes_the_channel_from_url_event_or_marker():
+    decoder = JsonFrameDecoder()
+
+    by_url = decoder.decode("xhr", "https://vic.test/api/orderbook", '{"bids": [[1, 2]]}')
+    by_event = decoder.decode("ws", WS_URL, '42["depth", {"asks": [[3, 4]]}]')
+    by_marker = decoder.decode(
+        "ws", WS_URL, '{"e": "openOrdersUpdate", "orders": []}'
+    )
+
+    assert by_url == [BookUpdate("bid", [(1.0, 2.0)])]
+    assert by_event == [BookUpdate("ask", [(3.0, 4.0)])]
+    assert by_marker == [OrdersUpdate([], snapshot=False)]
+
+
+def test_delta_before_a_snapshot_is_ignored_and_qty_zero_removes_a_level():
+    state = NetworkState()
+    state.apply(BookUpdate("bid", [(99.0, 1.0)], snapshot=False))
+    assert state.orderbook("bid") is None
+
+    state.apply(BookUpdate("bid", [(99.0, 1.0), (98.0, 2.0)]))
+    state.apply(BookUpdate("bid", [(99.0, 0.0), (97.0, 3.0)], snapshot=False))
+
+    assert state.orderbook("bid") == [(98.0, 2.0), (97.0, 3.0)]
+
+
+def test_state_older_than_max_age_is_refused():
+    state = NetworkState(max_age_sec=5.0)
+    state.apply(BookUpdate("ask", [(101.0, 1.0)]))
+    state.apply(OrdersUpdate([]))
+    assert state.orderbook("ask") == [(101.0, 1.0)]
+
+    for key in state.updated_ts:
+        state.updated_ts[key] -= 6.0
+
+    assert state.orderbook("ask") is None
+    assert state.open_orders() is None
+
+
+class FakeLogDriver:
+    def __init__(self):
+        self.entries = []
+        self.window_handles = ["tab-0"]
+
+    def push(self, method, ts=None, **params):
+        entry = {"message": json.dumps({"message": {"method": method, "params": params}})}
+        if ts is not None:
+            entry["timestamp"] = ts * 1000.0  # chromedriver logs ms
+        self.entries.append(entry)
+
+    def get_log(self, name):
+        entries, self.entries = self.entries, []
+        return entries
+
+
+def test_capture_resets_state_when_the_socket_closes():
+    driver = FakeLogDriver()
+    capture = NetworkCapture(driver, record_path=None)
+    driver.push("Network.webSocketCreated", requestId="7", url=WS_URL)
+    driver.push(
+        "Network.webSocketFrameReceived",
+        requestId="7",
+        response={"opcode": 1, "payloadData": '42["orderbook", {"bids": [["99", "1"]]}]'},
+    )
+    assert capture.poll(force=True) == 1
+    assert capture.state.orderbook("bid") == [(99.0, 1.0)]
+
+    driver.push("Network.webSocketClosed", requestId="7")
+    capture.poll(force=True)
+
+    assert capture.state.orderbook("bid") is None
+
+
+def test_captured_orders_carry_the_frame_time_so_newer_placements_survive(monkeypatch):
+    driver = FakeLogDriver()
+    capture = NetworkCapture(driver, record_path=None)
+    monkeypatch.setattr(vic_network, "network_capture_for", lambda d: capture)
+    frame_ts = time.time() - 3.0  # drained from the log well after it arrived
+    driver.push("Network.webSocketCreated", requestId="7", url=WS_URL)
+    driver.push(
+        "Network.webSocketFrameReceived",
+        ts=frame_ts,
+        requestId="7",
+        response={"payloadData": '42["openOrders", {"orders": []}]'},
+    )
+    capture.poll(force=True)
+
+    book = OrderBookState(30.0)
+    placed = book.record_placed("bid", 99.0, 1.0, "ladder")
+    rows, read_ts = read_open_orders_at(driver)
+
+    assert rows == [] and read_ts == pytest.approx(frame_ts)
+    assert book.reconcile(rows, read_ts=read_ts)["dropped"] == 0
+    assert book.get(placed.order_id).status == "pending"
+
+
+def test_capture_is_refused_while_the_driver_has_several_tabs(monkeypatch):
+    monkeypatch.setattr(vic_network, "FLAG_VIC_NETWORK_CAPTURE_ENABLE", True)
+    driver = FakeLogDriver()
+    driver.push("Network.webSocketCreated", requestId="7", url=WS_URL)
+    driver.push(
+        "Network.webSocketFrameReceived",
+        requestId="7",
+        response={"payloadData": '42["orderbook", {"bids": [["99", "1"]]}]'},
+    )
+    capture = vic_network.network_capture_for(driver)
+    assert capture.state.orderbook("bid") == [(99.0, 1.0)]
+
+    driver.window_handles.append("tab-1")  # another market's tab
+    capture.poll(force=True)
+
+    assert vic_network.network_capture_for(driver) is None
+    assert capture.shared and capture.state.orderbook("bid") is None
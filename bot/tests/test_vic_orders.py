@@ -0,0 +1,72 @@
+import pytest
+
+from modes.mm import vic_orders
+from modes.mm.latency import LatencyRecorder
+from modes.mm.vic_orders import cancel_orders_by_id
+
+
+class FakeBook:
+    """Open-order ids on the page; the batch script cancels the ones it is told to."""
+
+    def __init__(self, open_ids):
+        self.open_ids = set(open_ids)
+        self.fail = set()
+        self.fills = set()  # filled by someone else right after the next batch
+        self.batches = []
+
+    def ids(self, driver, timeout=10):
+        return set(self.open_ids)
+
+    def run(self, driver, ids, popup_timeout, budget=None):
+        self.batches.append(list(ids))
+        results = []
+        for oid in ids:
+            if oid in self.fail:
+                results.append({"ok": False, "stage": "confirm", "side": "bid", "ms": 40})
+                continue
+            self.open_ids.discard(oid)
+            results.append({"ok": True, "stage": "done", "side": "bid", "ms": 25})
+        self.open_ids -= self.fills
+        return results
+
+
+@pytest.fixture
+def book(monkeypatch):
+    book = FakeBook(open_ids={"1", "2"})
+    monkeypatch.setattr(vic_orders, "_open_order_ids", book.ids)
+    monkeypatch.setattr(vic_orders, "_run_cancel_batch", book.run)
+    monkeypatch.setattr(vic_orders.time, "sleep", lambda sec: None)
+    return book
+
+
+def test_an_order_gone_from_the_table_is_not_reported_as_cancelled(book):
+    results = cancel_orders_by_id(object(), ["1", "2", "3"], latency=LatencyRecorder())
+
+    assert results == {"1": True, "2": True, "3": None}  # 3 filled before we got to it
+    assert book.batches == [["1", "2"]]
+
+
+def test_an_order_that_leaves_after_a_failed_cancel_is_gone_not_cancelled(book):
+    book.fail = book.fills = {"2"}
+
+    results = cancel_orders_by_id(object(), ["1", "2"], latency=LatencyRecorder())
+
+    assert results == {"1": True, "2": None}
+    assert book.batches == [["1", "2"]]
+
+
+def test_an_order_missing_from_the_page_leaves_no_latency_sample(book, monkeypatch):
+    def run(driver, ids, popup_timeout, budget=None):
+        book.open_ids.clear()
+        return [
+            {"ok": True, "stage": "done", "side": "bid", "ms": 25},
+            {"ok": False, "stage": "missing", "side": "bid"},
+        ]
+
+    monkeypatch.setattr(vic_orders, "_run_cancel_batch", run)
+    latency = LatencyRecorder()
+
+    cancel_orders_by_id(object(), ["1", "2"], latency=latency)
+
+    stages = latency.summary()["batch_cancel"]["bid"]
+    assert list(stages) == ["total"] and stages["total"]["count"] == 1
@@ -0,0 +1,59 @@
+import pytest
+
+from modes.mm import vic_popup
+from modes.mm.vic_popup import handle_popup, wait_for_popup_closed
+
+OPEN = {"open": True, "ready": True, "seq": 5, "openFor": 40, "text": "Order placed"}
+CLOSED = {"open": False, "ready": False, "seq": 5, "openFor": 0, "text": ""}
+
+
+class ScriptedDriver:
+    """Answers the popup scripts from queues; the last answer repeats."""
+
+    def __init__(self, statuses, clicks=(True,)):
+        self.statuses = list(statuses)
+        self.clicks = list(clicks)
+
+    @staticmethod
+    def _next(queue):
+        answer = queue.pop(0) if len(queue) > 1 else queue[0]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    def execute_script(self, script, *args):
+        if script == vic_popup._STATUS_JS:
+            return self._next(self.statuses)
+        if script == vic_popup._CLICK_OK_JS:
+            return self._next(self.clicks)
+        return False  # hook install
+
+
+@pytest.fixture(autouse=True)
+def fast_poll(monkeypatch):
+    monkeypatch.setattr(vic_popup, "_POLL_SEC", 0.001)
+
+
+def test_failed_status_read_while_clicking_does_not_break_the_timing_record():
+    driver = ScriptedDriver(
+        statuses=[OPEN, RuntimeError("script error"), CLOSED],
+        clicks=[RuntimeError("click intercepted"), True],
+    )
+
+    assert handle_popup(driver, after_seq=4, timeout=1) == 5
+    assert vic_popup.POPUP_TIMINGS[-1].text == "Order placed"
+
+
+def test_unreadable_status_is_not_taken_for_a_closed_popup():
+    driver = ScriptedDriver(statuses=[OPEN, RuntimeError("script error")])
+
+    assert not wait_for_popup_closed(driver, seq=5, timeout=0.05)
+
+
+def test_popup_that_cannot_be_clicked_or_read_is_a_failure():
+    driver = ScriptedDriver(
+        statuses=[OPEN, RuntimeError("script error")],
+        clicks=[RuntimeError("click intercepted")],
+    )
+
+    assert handle_popup(driver, after_seq=4, timeout=0.1) is None
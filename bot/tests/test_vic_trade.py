@@ -0,0 +1,34 @@
+from modes.mm import vic_trade
+from modes.mm.latency import LatencyRecorder
+from modes.mm.vic_trade import place_limit_orders_batch
+
+
+class BatchDriver:
+    """Returns one scripted batch result; the page itself is never touched."""
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_async_script(self, script, *args):
+        return self.raw
+
+
+def test_orders_the_batch_never_reached_are_left_for_the_next_refill(monkeypatch):
+    single = []
+    monkeypatch.setattr(vic_trade, "place_limit_order", lambda *a, **kw: single.append(a))
+    driver = BatchDriver(
+        [
+            {"ok": True, "stage": "done", "ms": 30},
+            {"ok": False, "stage": "popup", "error": "timeout", "ms": 900},
+            {"ok": False, "stage": "skipped", "ms": 0},
+        ]
+    )
+    orders = [("bid", 99.0, 1.0), ("bid", 98.0, 1.0), ("bid", 97.0, 1.0)]
+
+    results = place_limit_orders_batch(driver, orders, latency=LatencyRecorder())
+
+    assert results == [True, False, False]
+    assert single == []  # no retry on a page left in an unknown state